@@ -4,12 +4,16 @@
 from collections import OrderedDict
 import numpy as np
 import inspect
+import os
+import tempfile
 
 # Back-end imports
 from torch import *
 import torch
 import torch.nn as nn
 import torch.nn.functional
+import torch.distributed as dist
+import torch.multiprocessing as mp
 
 # Deeplodocus import
 from deeplodocus.core.inference.tester import Tester
@@ -20,6 +24,7 @@ from deeplodocus.core.metrics.over_watch_metric import OverWatchMetric
 from deeplodocus.core.model.model import Model
 from deeplodocus.core.optimizer.optimizer import Optimizer
 from deeplodocus.data.dataset import Dataset
+from deeplodocus.data.sharded_dataset import ShardedDataset
 from deeplodocus.data.transform_manager import TransformManager
 from deeplodocus.utils.dict_utils import check_kwargs
 from deeplodocus.utils.dict_utils import get_kwargs
@@ -29,6 +34,9 @@ from deeplodocus.utils.flags.notif import *
 from deeplodocus.utils.flags.path import *
 from deeplodocus.utils.flags.dtype import *
 from deeplodocus.utils.flags.module import *
+from deeplodocus.utils.flags import DEEP_SHARD_SHUFFLE_BUFFER
+from deeplodocus.utils.flags import DEEP_SEQUENCE_NUM_THREADS
+from deeplodocus.utils.flags import DEEP_SHUFFLE_BUCKETS
 from deeplodocus.utils.generic_utils import get_module
 from deeplodocus.utils.generic_utils import get_int_or_float
 from deeplodocus.utils.notification import Notification
@@ -115,7 +123,10 @@ class FrontalLobe(object):
         :return: None
         """
 
-        self.trainer.fit() if self.trainer is not None else Notification(DEEP_NOTIF_ERROR, DEEP_MSG_NO_TRAINER)
+        if self.__get_world_size() > 1:
+            self.__train_distributed()
+        else:
+            self.trainer.fit() if self.trainer is not None else Notification(DEEP_NOTIF_ERROR, DEEP_MSG_NO_TRAINER)
 
     def evaluate(self):
         """
@@ -169,8 +180,10 @@ class FrontalLobe(object):
         self.load_losses()
         self.load_metrics()
         self.load_tester()
-        self.load_validator()
-        self.load_trainer()
+        # The processes of a distributed training load their own validator and trainer (see train)
+        if self.__get_world_size() == 1:
+            self.load_validator()
+            self.load_trainer()
         self.load_memory()
         #self.summary()
 
@@ -270,7 +283,8 @@ class FrontalLobe(object):
             if isinstance(method, torch.nn.Module):
                 losses[str(key)] = Loss(name=str(key),
                                         weight=float(value.weight),
-                                        loss=method)
+                                        loss=method,
+                                        autocast=value.autocast if value.check("autocast") else True)
                 Notification(DEEP_NOTIF_SUCCESS, DEEP_MSG_LOSS_LOADED %(key, value.name, loss.__module__))
             else:
                 Notification(DEEP_NOTIF_FATAL, "The loss function %s is not a torch.nn.Module instance" % key)
@@ -308,31 +322,38 @@ class FrontalLobe(object):
             else:
                 method = metric
 
-            metrics[str(key)] = Metric(name=str(key), method=method)
+            metrics[str(key)] = Metric(name=str(key),
+                                       method=method,
+                                       schedule=value.schedule if value.check("schedule") else DEEP_METRIC_SCHEDULE_BATCH,
+                                       every=value.every if value.check("every") else 1)
             Notification(DEEP_NOTIF_SUCCESS, DEEP_MSG_METRIC_LOADED % (key, value.name, metric.__module__))
 
         self.metrics = metrics
 
-    def load_trainer(self):
+    def load_trainer(self, dataset=None):
         """
         Author: Alix Leroy and SW
+        :param dataset: The loaded training dataset (loaded from the config if None)
         :return: None
         """
         self.trainer = self.__load_trainer(name="Trainer",
                                            history=self.config.history,
                                            dataloader=self.config.data.dataloader,
                                            data=self.config.data.dataset.train,
-                                           transforms=self.config.transform.train)
+                                           transforms=self.config.transform.train,
+                                           dataset=dataset)
 
-    def load_validator(self):
+    def load_validator(self, dataset=None):
         """
         Author: Alix Leroy and SW
+        :param dataset: The loaded validation dataset (loaded from the config if None)
         :return: None
         """
         self.validator = self.__load_tester(name="Validator",
                                             dataloader=self.config.data.dataloader,
                                             data=self.config.data.dataset.validation,
-                                            transforms=self.config.transform.validation)
+                                            transforms=self.config.transform.validation,
+                                            dataset=dataset)
 
     def load_tester(self):
         """
@@ -411,7 +432,202 @@ class FrontalLobe(object):
                        metrics=self.metrics,
                        batch_size=self.config.data.dataloader.batch_size)
 
-    def __load_tester(self, dataloader, data, transforms, name):
+    def __get_world_size(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of processes of the training
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of processes (1 without distributed training)
+        """
+        if self.config.training.check("distributed") and self.config.training.distributed.check("world_size"):
+            return self.config.training.distributed.world_size
+        return 1
+
+    def __get_mixed_precision(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get whether the training and the validation run in mixed precision (bfloat16 on CPU) and the loss scaler
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return autocast->bool: Whether the mixed precision is enabled
+        :return grad_scaler: The loss scaler (None if the loss scaling is disabled)
+        """
+        if not self.config.training.check("mixed_precision"):
+            return False, None
+        mixed_precision = self.config.training.mixed_precision
+        autocast = mixed_precision.enabled if mixed_precision.check("enabled") else False
+        loss_scaling = mixed_precision.loss_scaling if mixed_precision.check("loss_scaling") else False
+        if not autocast or not loss_scaling:
+            return autocast, None
+        # The loss scaler of the CPU is only available since PyTorch 2.3
+        if getattr(getattr(torch, "amp", None), "GradScaler", None) is None:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_LOSS_SCALING_NOT_AVAILABLE % torch.__version__)
+        return autocast, torch.amp.GradScaler("cpu")
+
+    def __train_distributed(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Train the model with several processes (data parallelism)
+        The datasets are loaded once, here, so that their lengths are confirmed once and not by each process.
+        Each process trains a replica of the model on its part of the datasets and the gradients are averaged at each step.
+        Once the training is over, the weights of the process of rank 0 are loaded into the model
+
+        The processes are started with the start method of the config ("spawn" by default) :
+        "spawn" and "forkserver" pickle the Frontal Lobe (the model and the metrics must be importable),
+        "fork" copies the current process, which can deadlock if threads (CUDA, thread pools of the datasets) already exist
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        distributed = self.config.training.distributed
+        world_size = self.__get_world_size()
+        backend = distributed.backend if distributed.check("backend") else "gloo"
+        init_method = distributed.init_method if distributed.check("init_method") else "tcp://127.0.0.1:29500"
+        start_method = distributed.start_method if distributed.check("start_method") else "spawn"
+        train_dataset = self.__load_dataset(name="Trainer",
+                                            data=self.config.data.dataset.train,
+                                            transforms=self.config.transform.train,
+                                            record_shapes=self.config.training.shuffle == DEEP_SHUFFLE_BUCKETS)
+        validation_dataset = self.__load_dataset(name="Validator",
+                                                 data=self.config.data.dataset.validation,
+                                                 transforms=self.config.transform.validation)
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_DISTRIBUTED_START % (world_size, backend, init_method))
+        with tempfile.TemporaryDirectory() as directory:
+            weights_path = os.path.join(directory, "weights.pt")
+            mp.start_processes(self.__train_process,
+                               args=(world_size, backend, init_method, weights_path, train_dataset, validation_dataset),
+                               nprocs=world_size,
+                               start_method=start_method)
+            self.model.load_state_dict(torch.load(weights_path))
+
+    def __train_process(self,
+                        rank: int,
+                        world_size: int,
+                        backend: str,
+                        init_method: str,
+                        weights_path: str,
+                        train_dataset,
+                        validation_dataset) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Train the model in one process of a distributed training
+        The validator and the trainer are created once the process group exists so that they split the datasets
+
+        PARAMETERS:
+        -----------
+
+        :param rank->int: The rank of the process
+        :param world_size->int: The number of processes
+        :param backend->str: The backend of torch.distributed
+        :param init_method->str: The URL used by the processes to find each other
+        :param weights_path->str: The file where the process of rank 0 saves the trained weights
+        :param train_dataset: The training dataset loaded by the main process
+        :param validation_dataset: The validation dataset loaded by the main process
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        # Share the cores between the processes
+        torch.set_num_threads((os.cpu_count() or 1) // world_size or 1)
+        dist.init_process_group(backend=backend, init_method=init_method, rank=rank, world_size=world_size)
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_DISTRIBUTED_PROCESS % (rank, world_size, torch.get_num_threads()))
+        # The shards were split for a single process when the datasets were loaded
+        for dataset in (train_dataset, validation_dataset):
+            if isinstance(dataset, ShardedDataset):
+                dataset.set_rank(rank, world_size)
+        # A spawned process does not inherit the callbacks : only the process of rank 0 sends them signals
+        if rank == 0 and self.hippocampus is None:
+            self.load_memory()
+        self.load_validator(validation_dataset)
+        self.load_trainer(train_dataset)
+        self.trainer.fit()
+        if rank == 0:
+            torch.save(self.model.state_dict(), weights_path)
+        dist.destroy_process_group()
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the Frontal Lobe to send to the spawned processes of a distributed training
+        The inferers and the memory are created again by the processes (see __train_process)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the Frontal Lobe without the inferers and the memory
+        """
+        state = self.__dict__.copy()
+        state["trainer"] = None
+        state["validator"] = None
+        state["tester"] = None
+        state["hippocampus"] = None
+        return state
+
+    def __load_tester(self, dataloader, data, transforms, name, dataset=None):
         """
         AUTHORS:
         --------
@@ -430,34 +646,28 @@ class FrontalLobe(object):
         :param data:
         :param transforms:
         :param name:
+        :param dataset: The loaded dataset (loaded from data and transforms if None)
 
         RETURN:
         -------
 
         :return tester->Tester: The loaded tester
         """
-        inputs = [item for item in data.inputs]
-        labels = [item for item in data.labels]
-        additional_data = [item for item in data.additional_data]
-        transform_manager = TransformManager(transforms)
-        dataset = Dataset(list_inputs=inputs,
-                          list_labels=labels,
-                          list_additional_data=additional_data,
-                          transform_manager=transform_manager,
-                          cv_library=DEEP_LIB_PIL,
-                          name=name)
-        dataset.load()
-        dataset.set_len_dataset(data.number)
-        dataset.summary()
+        if dataset is None:
+            dataset = self.__load_dataset(data=data, transforms=transforms, name=name)
+        autocast, _ = self.__get_mixed_precision()
         tester = Tester(model=self.model,
                         dataset=dataset,
                         metrics=self.metrics,
                         losses=self.losses,
                         batch_size=dataloader.batch_size,
-                        num_workers=dataloader.num_workers)
+                        num_workers=dataloader.num_workers,
+                        dtype=dataloader.dtype if dataloader.check("dtype") else DEEP_DTYPE_FLOAT32,
+                        shared_memory=dataloader.shared_memory if dataloader.check("shared_memory") else False,
+                        autocast=autocast)
         return tester
 
-    def __load_trainer(self, history, dataloader, data, transforms, name):
+    def __load_trainer(self, history, dataloader, data, transforms, name, dataset=None):
         """
         AUTHORS:
         --------
@@ -477,26 +687,20 @@ class FrontalLobe(object):
         :param data:
         :param transforms:
         :param name:
+        :param dataset: The loaded dataset (loaded from data and transforms if None)
 
         RETURN:
         -------
 
         :return trainer->Trainer: The loaded trainer
         """
-        inputs = [item for item in data.inputs]
-        labels = [item for item in data.labels]
-        additional_data = [item for item in data.additional_data]
-        transform_manager = TransformManager(transforms)
-        dataset = Dataset(list_inputs=inputs,
-                          list_labels=labels,
-                          list_additional_data=additional_data,
-                          transform_manager=transform_manager,
-                          cv_library=DEEP_LIB_PIL,
-                          name=name)
-        dataset.load()
-        dataset.set_len_dataset(data.number)
-        dataset.summary()
+        if dataset is None:
+            dataset = self.__load_dataset(data=data,
+                                          transforms=transforms,
+                                          name=name,
+                                          record_shapes=self.config.training.shuffle == DEEP_SHUFFLE_BUCKETS)
 
+        autocast, grad_scaler = self.__get_mixed_precision()
         trainer = Trainer(model=self.model,
                           dataset=dataset,
                           metrics=self.metrics,
@@ -505,12 +709,75 @@ class FrontalLobe(object):
                           num_epochs=self.config.training.num_epochs,
                           initial_epoch=self.config.training.initial_epoch,
                           shuffle=self.config.training.shuffle,
+                          seed=self.config.training.seed if self.config.training.check("seed") else None,
+                          accumulation_steps=self.config.training.accumulation_steps
+                          if self.config.training.check("accumulation_steps") else 1,
+                          autocast=autocast,
+                          grad_scaler=grad_scaler,
                           verbose=history.verbose,
                           tester=self.validator,
                           num_workers=dataloader.num_workers,
-                          batch_size=dataloader.batch_size)
+                          batch_size=dataloader.batch_size,
+                          dtype=dataloader.dtype if dataloader.check("dtype") else DEEP_DTYPE_FLOAT32,
+                          shared_memory=dataloader.shared_memory if dataloader.check("shared_memory") else False)
         return trainer
 
+    def __load_dataset(self, data, transforms, name, record_shapes=False):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load the dataset of a tester/validator/trainer and set its length
+
+        PARAMETERS:
+        -----------
+
+        :param data: The config of the dataset
+        :param transforms: The config of the transforms
+        :param name->str: The name of the dataset
+        :param record_shapes->bool: Whether the shapes of the instances are recorded (shuffling by buckets)
+
+        RETURN:
+        -------
+
+        :return: The loaded dataset (a ShardedDataset if the instances are packed into shards)
+        """
+        inputs = [item for item in data.inputs]
+        labels = [item for item in data.labels]
+        additional_data = [item for item in data.additional_data]
+        transform_manager = TransformManager(transforms)
+        # The instances packed into shards (see 'deeplodocus pack') are read sequentially
+        if data.check("shards") and data.shards is not None:
+            dataset = ShardedDataset(directory=data.shards,
+                                     transform_manager=transform_manager,
+                                     cv_library=DEEP_LIB_PIL,
+                                     shuffle_buffer=data.shuffle_buffer if data.check("shuffle_buffer") else DEEP_SHARD_SHUFFLE_BUFFER,
+                                     name=name)
+        else:
+            dataset = Dataset(list_inputs=inputs,
+                              list_labels=labels,
+                              list_additional_data=additional_data,
+                              transform_manager=transform_manager,
+                              cv_library=DEEP_LIB_PIL,
+                              materialize=data.materialize if data.check("materialize") else False,
+                              lazy_text=data.lazy_text if data.check("lazy_text") else False,
+                              sample_cache_size=data.sample_cache_size if data.check("sample_cache_size") else 0,
+                              sample_cache_shared=data.sample_cache_shared if data.check("sample_cache_shared") else False,
+                              video=data.video.get() if data.check("video") else None,
+                              np_mmap=data.np_mmap if data.check("np_mmap") else True,
+                              sequence_threads=data.sequence_threads if data.check("sequence_threads") else DEEP_SEQUENCE_NUM_THREADS,
+                              record_shapes=record_shapes,
+                              name=name)
+        dataset.load()
+        dataset.set_len_dataset(data.number)
+        dataset.summary()
+        return dataset
+
     def __summary(self, model, input_size, losses, metrics, batch_size=-1, device="cuda"):
         """
         AUTHORS:
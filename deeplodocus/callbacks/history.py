@@ -51,10 +51,11 @@ class History(object):
         self.save_condition = save_condition
         self.overwatch_metric = overwatch_metric
 
-        # Running metrics
+        # Running metrics (and number of optimizer steps each metric was computed on)
         self.running_total_loss = 0
         self.running_losses = {}
         self.running_metrics = {}
+        self.running_metrics_counts = {}
 
         self.train_batches_history = multiprocessing.Manager().Queue()
         self.train_epochs_history = multiprocessing.Manager().Queue()
@@ -88,6 +89,7 @@ class History(object):
         Thalamus().connect(receiver=self.on_epoch_end, event=DEEP_EVENT_ON_EPOCH_END, expected_arguments=["epoch_index",
                                                                                                           "num_epochs",
                                                                                                           "num_minibatches",
+                                                                                                          "result_epoch_metrics",
                                                                                                           "total_validation_loss",
                                                                                                           "result_validation_losses",
                                                                                                           "result_validation_metrics",
@@ -159,7 +161,7 @@ class History(object):
         :param num_minibatches->int: Number of minibatches per epoch
         :param total_loss->int: The total loss
         :param result_losses->dict: List of resulting losses
-        :param result_metrics->dict: List of resulting metrics
+        :param result_metrics->dict: List of resulting metrics (the metrics not computed on this batch are missing)
 
         RETURN:
         -------
@@ -170,6 +172,7 @@ class History(object):
         self.running_total_loss = self.running_total_loss + total_loss
         self.running_losses = merge_sum_dict(self.running_losses, result_losses)
         self.running_metrics = merge_sum_dict(self.running_metrics, result_metrics)
+        self.running_metrics_counts = merge_sum_dict(self.running_metrics_counts, dict.fromkeys(result_metrics, 1))
 
         # If the user wants to print stats for each batch
         if self.verbose >= DEEP_VERBOSE_BATCH:
@@ -190,7 +193,7 @@ class History(object):
                     minibatch_index,
                     total_loss] + \
                     [value.item() for (loss_name, value) in result_losses.items()] + \
-                    [value for (metric_name, value) in result_metrics.items()]
+                    self.__get_metric_values(result_metrics)
 
             self.train_batches_history.put(data)
 
@@ -204,6 +207,7 @@ class History(object):
                      epoch_index: int,
                      num_epochs: int,
                      num_minibatches: int,
+                     result_epoch_metrics: dict,
                      total_validation_loss: int,
                      result_validation_losses: dict,
                      result_validation_metrics: dict,
@@ -226,6 +230,7 @@ class History(object):
         :param epoch_index->int: current epoch index
         :param num_epochs: int: total number of epoch
         :param num_minibatches: int: number of minibatches per epoch
+        :param result_epoch_metrics: dict: the training metrics computed once per epoch
         :param total_validation_loss:
         :param result_validation_losses:
         :param result_validation_metrics:
@@ -237,28 +242,32 @@ class History(object):
         :return: None
         """
         # MANAGE TRAINING HISTORY
+        # Each metric is averaged over the batches it was computed on, or computed once per epoch
+        training_metrics = {metric_name: value / self.running_metrics_counts[metric_name]
+                            for (metric_name, value) in self.running_metrics.items()}
+        training_metrics.update(result_epoch_metrics)
         if self.verbose >= DEEP_VERBOSE_BATCH:
 
             print_metrics = ", ".join(["%s : %f" % (TOTAL_LOSS, self.running_total_loss / num_minibatches)]
                                       + ["%s : %f" % (loss_name, value.item() / num_minibatches)
                                          for (loss_name, value) in self.running_losses.items()]
-                                      + ["%s : %f" % (metric_name, value / num_minibatches)
-                                         for (metric_name, value) in self.running_metrics.items()])
+                                      + self.__format_metrics(training_metrics))
             Notification(DEEP_NOTIF_RESULT, "%s : %s" % (TRAINING, print_metrics))
-            
-            if self.memorize >= DEEP_MEMORIZE_BATCHES:
-                data = [datetime.datetime.now().strftime(TIME_FORMAT),
-                      self.__time(),
-                      epoch_index,
-                      self.running_total_loss / num_minibatches] + \
-                     [value.item() / num_minibatches for (loss_name, value) in self.running_losses.items()] + \
-                     [value  / num_minibatches for (metric_name, value) in self.running_metrics.items()]
-                self.train_epochs_history.put(data)
 
+        # The epoch is recorded whatever the verbosity (the metrics computed once per epoch only appear here)
+        if self.memorize >= DEEP_MEMORIZE_BATCHES:
+            data = [datetime.datetime.now().strftime(TIME_FORMAT),
+                  self.__time(),
+                  epoch_index,
+                  self.running_total_loss / num_minibatches] + \
+                 [value.item() / num_minibatches for (loss_name, value) in self.running_losses.items()] + \
+                 self.__get_metric_values(training_metrics)
+            self.train_epochs_history.put(data)
 
         self.running_total_loss = 0
         self.running_losses = {}
         self.running_metrics = {}
+        self.running_metrics_counts = {}
 
 
         # MANAGE VALIDATION HISTORY
@@ -266,19 +275,18 @@ class History(object):
             if self.verbose >= DEEP_VERBOSE_BATCH:
 
                 print_metrics = ", ".join(["%s : %f" % (TOTAL_LOSS, total_validation_loss)]
-                                          + ["%s : %f" % (loss_name, value.item() / num_minibatches_validation)
+                                          + ["%s : %f" % (loss_name, value.item())
                                              for (loss_name, value) in result_validation_losses.items()]
-                                          + ["%s : %f" % (metric_name, value / num_minibatches_validation)
-                                             for (metric_name, value) in result_validation_metrics.items()])
+                                          + self.__format_metrics(result_validation_metrics))
                 Notification(DEEP_NOTIF_RESULT, "%s: %s" % (VALIDATION, print_metrics))
 
             if self.memorize >= DEEP_MEMORIZE_BATCHES:
                 data = [datetime.datetime.now().strftime(TIME_FORMAT),
                         self.__time(),
                         epoch_index,
-                        total_validation_loss / num_minibatches_validation] + \
-                       [value.item() / num_minibatches_validation for (loss_name, value) in result_validation_losses.items()] + \
-                       [value / num_minibatches_validation for (metric_name, value) in result_validation_metrics.items()]
+                        total_validation_loss] + \
+                       [value.item() for (loss_name, value) in result_validation_losses.items()] + \
+                       self.__get_metric_values(result_validation_metrics)
 
                 self.validation_history.put(data)
 
@@ -334,6 +342,60 @@ class History(object):
 
 
 
+    def __get_metric_values(self, result_metrics: dict) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the values of the metrics in the order of the history headers
+        A metric not computed (e.g. computed every N batches or only on the validation) is left empty,
+        as well as a metric computed once per epoch from a state which received no mini-batch (None)
+
+        PARAMETERS:
+        -----------
+
+        :param result_metrics->dict: The values of the computed metrics
+
+        RETURN:
+        -------
+
+        :return->list: The values of all the metrics ("" for the missing ones)
+        """
+        return [result_metrics[metric_name] if result_metrics.get(metric_name) is not None else ""
+                for metric_name in self.metrics.keys()]
+
+    @staticmethod
+    def __format_metrics(result_metrics: dict) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Format the values of the metrics to be printed
+        A metric computed once per epoch from a state which received no mini-batch (None) is printed as "n/a"
+
+        PARAMETERS:
+        -----------
+
+        :param result_metrics->dict: The values of the metrics
+
+        RETURN:
+        -------
+
+        :return->list: The "name : value" string of each metric
+        """
+        return ["%s : %f" % (metric_name, value) if value is not None else "%s : n/a" % metric_name
+                for (metric_name, value) in result_metrics.items()]
+
     def __load_histories(self):
         """
         AUTHORS:
@@ -501,7 +563,8 @@ class History(object):
         else:
             data = dict([(TOTAL_LOSS, total_validation_loss)] +
                         [(loss_name, value.item()) for (loss_name, value) in result_validation_losses.items()] +
-                        [(metric_name, value / num_minibatches_training) for (metric_name, value) in result_validation_metrics.items()])
+                        [(metric_name, value / num_minibatches_training) for (metric_name, value) in result_validation_metrics.items()
+                         if value is not None])
 
             for key, value in data.items():
                 if key == self.overwatch_metric.get_name():
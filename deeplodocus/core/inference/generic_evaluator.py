@@ -1,8 +1,8 @@
 #
 # Common imports
 #
+import contextlib
 from typing import Union
-import inspect
 
 #
 # Backend imports
@@ -39,7 +39,14 @@ class GenericEvaluator(GenericInferer):
                  losses: dict,
                  batch_size: int = 4,
                  num_workers: int = 4,
-                 verbose: int = DEEP_VERBOSE_BATCH):
+                 verbose: int = DEEP_VERBOSE_BATCH,
+                 dtype: str = DEEP_DTYPE_FLOAT32,
+                 shared_memory: bool = False,
+                 shuffle: int = None,
+                 seed: int = None,
+                 autocast: bool = False,
+                 rank: int = None,
+                 world_size: int = None):
         """
         AUTHORS:
         --------
@@ -59,7 +66,13 @@ class GenericEvaluator(GenericInferer):
         :param batch_size->int: The number of instances per batch
         :param num_workers->int: The number of processes / threads used for data loading
         :param verbose->int: How verbose the class is
-
+        :param dtype->str: The DEEP_DTYPE flag of the images in the mini-batches
+        :param shared_memory->bool: Whether the workers send the mini-batches through a ring of shared memory buffers
+        :param shuffle->int: DEEP_SHUFFLE flag, order of the training instances (None for an evaluation, in order)
+        :param seed->int: The seed of the shuffling (drawn at random if None)
+        :param autocast->bool: Whether the model and the losses are computed in mixed precision (bfloat16 on CPU)
+        :param rank->int: The rank of the current process (read from the process group if None)
+        :param world_size->int: The number of processes sharing the dataset (read from the process group if None)
 
         RETURN:
         -------
@@ -71,10 +84,79 @@ class GenericEvaluator(GenericInferer):
         super().__init__(model=model,
                          dataset=dataset,
                          batch_size=batch_size,
-                         num_workers=num_workers)
+                         num_workers=num_workers,
+                         dtype=dtype,
+                         shared_memory=shared_memory,
+                         shuffle=shuffle,
+                         seed=seed,
+                         rank=rank,
+                         world_size=world_size)
         self.verbose = verbose
         self.metrics = metrics
         self.losses = losses
+        # torch.autocast is only available since PyTorch 1.10
+        if autocast is True and not hasattr(torch, "autocast"):
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_MIXED_PRECISION_NOT_AVAILABLE % torch.__version__)
+        self.autocast = autocast
+
+    def autocast_context(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the context in which the outputs, the losses and the metrics are computed
+        In mixed precision, the operations which support it run in bfloat16 on CPU
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: The context manager (does nothing if the mixed precision is disabled)
+        """
+        # Without torch.autocast (before PyTorch 1.10) the mixed precision cannot be enabled
+        if not hasattr(torch, "autocast"):
+            return contextlib.nullcontext()
+        return torch.autocast(device_type="cpu", dtype=torch.bfloat16, enabled=self.autocast)
+
+    @staticmethod
+    def is_autocast_enabled() -> bool:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Check whether the current operations run in mixed precision on CPU
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->bool: Whether the autocast of the CPU is enabled
+        """
+        if not hasattr(torch, "autocast"):
+            return False
+        # torch.is_autocast_enabled only takes a device type since PyTorch 2.4
+        try:
+            return torch.is_autocast_enabled("cpu")
+        except TypeError:
+            return torch.is_autocast_cpu_enabled()
 
     @staticmethod
     def compute_metrics(metrics: dict,
@@ -109,49 +191,19 @@ class GenericEvaluator(GenericInferer):
         """
 
         result_metrics = {}
-
-        # Temporary variable for saving the output
-        temp_metric_result = None
+        autocast = GenericEvaluator.is_autocast_enabled()
 
         for key, metric in metrics.items():
-            metric_args = metric.get_arguments()
-            metric_method = metric.get_method()
-
-            # TODO : Check the number of arguments before compute the metric
-            #if metric.is_loss() is True:
-            #   num_required_args = len(inspect.getfullargspec(metric_method.forward)[0])
-            #   num_given_args = len(metric_args + 1)
-            #else:
-            #   num_required_args = len(inspect.getfullargspec(metric_method)[0])
-            #if num_required_args != num_given_args:
-            #    Notification(DEEP_NOTIF_FATAL, "The metric %s takes %i positional arguments but %i were given" %(metric_method, len(num_required_args), len(metric_args)))
+            # The losses which opted out of the mixed precision are computed in float32
+            if autocast is True and metric.is_loss() is True and metric.get_autocast() is False:
+                with torch.autocast(device_type="cpu", enabled=False):
+                    result_metrics[metric.get_name()] = GenericEvaluator.compute_metrics(
+                        {key: metric}, inputs, GenericEvaluator.to_float32(outputs), labels, additional_data
+                    )[metric.get_name()]
+                continue
 
-            #
-            # Select the good type of input
-            #
-
-            if DEEP_ENTRY_INPUT in metric_args:
-                if DEEP_ENTRY_LABEL in metric_args:
-                    if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
-                        temp_metric_result = metric_method(inputs, outputs, labels, additional_data)
-                    else:
-                        temp_metric_result = metric_method(inputs, outputs, labels)
-                else:
-                    if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
-                        temp_metric_result = metric_method(inputs, outputs, additional_data)
-                    else:
-                        temp_metric_result = metric_method(inputs, outputs)
-            else:
-                if DEEP_ENTRY_LABEL in metric_args:
-                    if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
-                        temp_metric_result = metric_method(outputs, labels, additional_data)
-                    else:
-                        temp_metric_result = metric_method(outputs, labels)
-                else:
-                    if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
-                        temp_metric_result = metric_method(outputs, additional_data)
-                    else:
-                        temp_metric_result = metric_method(outputs)
+            # Call the method with the entries it requires (adapter compiled with the metric)
+            temp_metric_result = metric.call(inputs, outputs, labels, additional_data)
 
             #
             # Add the metric to the dictionary
@@ -162,9 +214,186 @@ class GenericEvaluator(GenericInferer):
                 # Do not call ".item()" in order to be able to achieve back propagation on the total_loss
                 result_metrics[metric.get_name()] = temp_metric_result
             else:
-                # If it is a Loss function we detach the tensor from the graph
-                if isinstance(temp_metric_result, torch.nn.Module):
+                # If it is a Metric we detach the tensor from the graph
+                # The value stays a tensor : it is only converted to a number when required (no synchronisation)
+                if isinstance(temp_metric_result, torch.Tensor):
                     temp_metric_result = temp_metric_result.detach()
-                result_metrics[metric.get_name()] = temp_metric_result.item()
+                result_metrics[metric.get_name()] = temp_metric_result
 
         return result_metrics
+
+    @staticmethod
+    def select_metrics(metrics: dict, schedules: tuple) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Select the metrics computed with the given schedules
+
+        PARAMETERS:
+        -----------
+
+        :param metrics->dict: The metrics
+        :param schedules->tuple: The DEEP_METRIC_SCHEDULE flags to select
+
+        RETURN:
+        -------
+
+        :return->dict: The selected metrics
+        """
+        return {key: metric for key, metric in metrics.items() if metric.get_schedule() in schedules}
+
+    @staticmethod
+    def split_stateful_metrics(metrics: dict) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Separate the metrics updated with each mini-batch (update() and compute()) from the other metrics
+
+        PARAMETERS:
+        -----------
+
+        :param metrics->dict: The metrics
+
+        RETURN:
+        -------
+
+        :return stateful_metrics->dict: The metrics updated with each mini-batch
+        :return other_metrics->dict: The other metrics
+        """
+        stateful_metrics = {key: metric for key, metric in metrics.items() if metric.is_stateful() is True}
+        other_metrics = {key: metric for key, metric in metrics.items() if key not in stateful_metrics}
+        return stateful_metrics, other_metrics
+
+    @staticmethod
+    def update_metrics(metrics: dict,
+                       inputs: Union[tensor, list],
+                       outputs: Union[tensor, list],
+                       labels: Union[tensor, list],
+                       additional_data: Union[tensor, list]) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Update the state of the metrics with a mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param metrics->dict: The metrics updated with each mini-batch
+        :param inputs->Union[tensor, list]: The inputs
+        :param outputs->Union[tensor, list]: Outputs of the network
+        :param labels->Union[tensor, list]: Labels
+        :param additional_data->Union[tensor, list]: Additional data
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        for metric in metrics.values():
+            metric.update(inputs, outputs, labels, additional_data)
+
+    @staticmethod
+    def compute_stateful_metrics(metrics: dict, synchronize: bool = False) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the metrics from their state (the mini-batches of the epoch)
+
+        PARAMETERS:
+        -----------
+
+        :param metrics->dict: The metrics updated with each mini-batch
+        :param synchronize->bool: Whether the states are summed over the processes first
+
+        RETURN:
+        -------
+
+        :return->dict: The values of the metrics
+        """
+        result_metrics = {}
+        for metric in metrics.values():
+            if synchronize is True:
+                metric.synchronize()
+            value = metric.compute()
+            result_metrics[metric.get_name()] = value.detach() if isinstance(value, torch.Tensor) else value
+        return result_metrics
+
+    @staticmethod
+    def get_batch_size(outputs) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of instances of a mini-batch from the outputs of the model
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model (a tensor or a list of tensors)
+
+        RETURN:
+        -------
+
+        :return->int: The number of instances of the mini-batch
+        """
+        while isinstance(outputs, (list, tuple)):
+            outputs = outputs[0]
+        return len(outputs)
+
+    @staticmethod
+    def to_float32(data: Union[tensor, list]) -> Union[tensor, list]:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Convert the floating point tensors (e.g. bfloat16 outputs) to float32
+
+        PARAMETERS:
+        -----------
+
+        :param data->Union[tensor, list]: A tensor or a list of tensors
+
+        RETURN:
+        -------
+
+        :return->Union[tensor, list]: The data with its floating point tensors in float32
+        """
+        if isinstance(data, (list, tuple)):
+            return [GenericEvaluator.to_float32(item) for item in data]
+        if isinstance(data, torch.Tensor) and data.is_floating_point():
+            return data.float()
+        return data
@@ -1,7 +1,21 @@
+import contextlib
+
+import torch
 from torch.utils.data import DataLoader
+from torch.utils.data import BatchSampler
+from torch.utils.data import IterableDataset
 from torch.nn import Module
 
 from deeplodocus.data.dataset import Dataset
+from deeplodocus.data.collate import Collate
+from deeplodocus.data.sampler import EpochPermutationSampler
+from deeplodocus.data.sampler import BucketBatchSampler
+from deeplodocus.data.shared_memory import SharedMemoryRing
+from deeplodocus.data.shared_memory import RingBatchSampler
+from deeplodocus.data.shared_memory import SlotDataset
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.distributed import get_rank_and_world_size
+from deeplodocus.utils.flags import *
 
 class GenericInferer(object):
     """
@@ -22,7 +36,13 @@ class GenericInferer(object):
                  model: Module,
                  dataset: Dataset,
                  batch_size: int = 4,
-                 num_workers: int = 4):
+                 num_workers: int = 4,
+                 dtype: str = DEEP_DTYPE_FLOAT32,
+                 shared_memory: bool = False,
+                 shuffle: int = None,
+                 seed: int = None,
+                 rank: int = None,
+                 world_size: int = None):
 
         """
         AUTHORS:
@@ -42,18 +62,164 @@ class GenericInferer(object):
         :param dataset->Dataset: A dataset
         :param batch_size->int: The number of instances per batch
         :param num_workers->int: The number of processes / threads used for data loading
+        :param dtype->str: The DEEP_DTYPE flag of the images in the mini-batches
+        :param shared_memory->bool: Whether the workers send the mini-batches through a ring of shared memory buffers
+        :param shuffle->int: DEEP_SHUFFLE flag, order of the training instances (None for an evaluation, in order)
+        :param seed->int: The seed of the shuffling (drawn at random if None)
+        :param rank->int: The rank of the current process (read from the process group if None)
+        :param world_size->int: The number of processes sharing the dataset (read from the process group if None)
         """
 
         self.model = model
         self.batch_size = batch_size
         self.num_workers = num_workers
         self.dataset=dataset
-        self.dataloader = DataLoader(dataset=dataset,
-                                     batch_size=batch_size,
-                                     shuffle=False,
-                                     num_workers=num_workers)
-        self.num_minibatches = self.compute_num_minibatches(batch_size=batch_size,
-                                                          length_dataset=dataset.__len__())
+        self.rank, self.world_size = get_rank_and_world_size(rank, world_size)
+        self.sampler, self.batch_sampler = self.__create_samplers(shuffle=shuffle, seed=seed)
+        self.collate = Collate(data_types=dataset.data_types,
+                               sequence_types=dataset.sequence_types,
+                               dtype=dtype)
+        # The instances of a ShardedDataset are not sampled by index : no ring (and no batch sampler) for them
+        if shared_memory is True and isinstance(dataset, IterableDataset):
+            Notification(DEEP_NOTIF_WARNING, DEEP_MSG_SHARDS_NO_SHARED_MEMORY % dataset.name)
+            shared_memory = False
+        # The buffers of the ring have the shape of one mini-batch
+        if shared_memory is True and self.batch_sampler is not None:
+            Notification(DEEP_NOTIF_WARNING, DEEP_MSG_BUCKETS_NO_SHARED_MEMORY % dataset.name)
+            shared_memory = False
+        # A shared memory ring is only useful if the mini-batches are loaded in other processes
+        if shared_memory is True and num_workers > 0:
+            self.dataloader = self.__create_shared_memory_dataloader()
+        elif self.batch_sampler is not None:
+            self.dataloader = DataLoader(dataset=dataset,
+                                         batch_sampler=self.batch_sampler,
+                                         num_workers=num_workers,
+                                         collate_fn=self.collate)
+        else:
+            self.dataloader = DataLoader(dataset=dataset,
+                                         batch_size=batch_size,
+                                         shuffle=False,
+                                         sampler=self.sampler,
+                                         num_workers=num_workers,
+                                         collate_fn=self.collate)
+        if self.batch_sampler is not None:
+            self.num_minibatches = len(self.batch_sampler)
+        elif self.sampler is not None:
+            self.num_minibatches = self.compute_num_minibatches(batch_size=batch_size,
+                                                              length_dataset=len(self.sampler))
+        else:
+            # A ShardedDataset gives the same number of instances to each process
+            self.num_minibatches = self.compute_num_minibatches(batch_size=batch_size,
+                                                              length_dataset=-(-len(dataset) // self.world_size))
+
+    def __create_samplers(self, shuffle: int, seed: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Create the sampler giving the order of the instances to the current process
+        The instances are given in an order drawn from the seed and the epoch (the dataset is never reordered).
+        DEEP_SHUFFLE_BATCHES shuffles the instances as DEEP_SHUFFLE_ALL (the mini-batches are formed after the permutation).
+        A ShardedDataset splits and shuffles its own stream
+
+        PARAMETERS:
+        -----------
+
+        :param shuffle->int: DEEP_SHUFFLE flag, order of the training instances (None for an evaluation, in order)
+        :param seed->int: The seed of the shuffling
+
+        RETURN:
+        -------
+
+        :return sampler->EpochPermutationSampler: The sampler of the instances (None if the batch sampler is used)
+        :return batch_sampler->BucketBatchSampler: The sampler of the mini-batches (None if not shuffled by buckets)
+        """
+        if shuffle not in (None, DEEP_SHUFFLE_NONE, DEEP_SHUFFLE_BATCHES, DEEP_SHUFFLE_ALL, DEEP_SHUFFLE_BUCKETS):
+            Notification(DEEP_NOTIF_WARNING, DEEP_MSG_SHUFFLE_NOT_FOUND % (shuffle, self.dataset.name))
+        if isinstance(self.dataset, IterableDataset):
+            return None, None
+        if shuffle == DEEP_SHUFFLE_BUCKETS:
+            if self.dataset.buckets is None:
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_SHAPES_NOT_RECORDED % self.dataset.name)
+            return None, BucketBatchSampler(buckets=self.dataset.buckets,
+                                            length=len(self.dataset),
+                                            batch_size=self.batch_size,
+                                            seed=seed,
+                                            rank=self.rank,
+                                            world_size=self.world_size)
+        # The processes training together need the same number of mini-batches,
+        # an evaluation uses each instance once
+        return EpochPermutationSampler(length=len(self.dataset),
+                                       seed=seed,
+                                       shuffle=shuffle in (DEEP_SHUFFLE_BATCHES, DEEP_SHUFFLE_ALL),
+                                       rank=self.rank,
+                                       world_size=self.world_size,
+                                       pad=shuffle is not None), None
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Give the epoch to the samplers drawing the order of the instances
+
+        PARAMETERS:
+        -----------
+
+        :param epoch->int: The epoch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        for sampler in (self.sampler, self.batch_sampler):
+            if sampler is not None:
+                sampler.set_epoch(epoch)
+
+    def __create_shared_memory_dataloader(self) -> DataLoader:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Create a DataLoader whose workers write the mini-batches into a SharedMemoryRing
+        The buffers of the ring are allocated from a mini-batch made of the first instance of the dataset
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->DataLoader: The DataLoader
+        """
+        num_slots = self.num_workers * DEEP_DATALOADER_PREFETCH_FACTOR + DEEP_DATALOADER_EXTRA_SLOTS
+        example = self.collate([self.dataset[0]] * self.batch_size)
+        self.dataset.reset()
+        self.collate.set_ring(SharedMemoryRing(example=example, num_slots=num_slots))
+        batch_sampler = BatchSampler(self.sampler, batch_size=self.batch_size, drop_last=False)
+        return DataLoader(dataset=SlotDataset(self.dataset),
+                          batch_sampler=RingBatchSampler(batch_sampler, num_slots=num_slots),
+                          num_workers=self.num_workers,
+                          prefetch_factor=DEEP_DATALOADER_PREFETCH_FACTOR,
+                          collate_fn=self.collate)
 
     @staticmethod
     def clean_single_element_list(minibatch: list) -> list:
@@ -98,6 +264,40 @@ class GenericInferer(object):
 
         return cleaned_minibatch
 
+    @staticmethod
+    @contextlib.contextmanager
+    def inference_mode(model: Module):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Context in which the model is only inferred (validation, test and prediction)
+        The model is in eval mode (e.g. BatchNorm uses its running statistics and does not update them)
+        and no autograd graph is recorded, the previous mode of the model is restored on exit
+
+        PARAMETERS:
+        -----------
+
+        :param model->torch.nn.Module: The model to infer
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        training = model.training
+        model.eval()
+        try:
+            with torch.inference_mode():
+                yield
+        finally:
+            model.train(training)
+
     @staticmethod
     def compute_num_minibatches(length_dataset: int, batch_size: int):
         """
@@ -1,8 +1,13 @@
-from torch.nn import Module
+import torch
 from torch import Tensor
+from torch.nn import Module
+from torch.utils.data import IterableDataset
 
 from deeplodocus.data.dataset import Dataset
 from deeplodocus.core.inference.generic_inferer import GenericInferer
+from deeplodocus.core.inference.sinks import Sink
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
 
 class Predictor(GenericInferer):
     """
@@ -24,17 +29,49 @@ class Predictor(GenericInferer):
                  dataset: Dataset,
                  batch_size: int = 4,
                  num_workers: int = 4,
-                 verbose: int=2):
+                 verbose: int=2,
+                 dtype: str = DEEP_DTYPE_FLOAT32,
+                 shared_memory: bool = False,
+                 sinks: list = None):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a Predictor instance
+
+        PARAMETERS:
+        -----------
+
+        :param model->torch.nn.Module: The model to infer
+        :param dataset->Dataset: The dataset to predict
+        :param batch_size->int: The number of instances per batch
+        :param num_workers->int: The number of processes / threads used for data loading
+        :param verbose->int: How verbose the class is
+        :param dtype->str: The DEEP_DTYPE flag of the images in the mini-batches
+        :param shared_memory->bool: Whether the workers send the mini-batches through a ring of shared memory buffers
+        :param sinks->list: The Sink instances the outputs are written to while predicting (e.g. NpySink, CsvSink)
 
+        RETURN:
+        -------
+
+        :return: None
+        """
         super().__init__(model=model,
                          dataset=dataset,
                          batch_size=batch_size,
-                         num_workers=num_workers)
+                         num_workers=num_workers,
+                         dtype=dtype,
+                         shared_memory=shared_memory)
 
         self.verbose = verbose
+        self.sinks = [] if sinks is None else sinks
 
-
-    def predict(self):
+    def predict(self, out: Tensor = None):
         """
         AUTHORS:
         --------
@@ -46,6 +83,51 @@ class Predictor(GenericInferer):
         ------------
 
         Inference of the model
+        Without sinks, the outputs are written into a tensor preallocated for all the instances
+        (concatenated at the end if the number of instances is unknown)
+        With sinks, the outputs are only written to the sinks, the memory used does not depend on the dataset size
+
+        PARAMETERS:
+        -----------
+
+        :param out->Tensor: The tensor to write the outputs into (allocated with the first outputs if None)
+
+        RETURN:
+        -------
+
+        :return outputs->Tensor: The outputs of the model over the dataset (None if the outputs go to sinks)
+        """
+        if self.sinks:
+            for _ in self.predict_batches():
+                pass
+            return None
+        num_instances = self.get_num_instances() if out is None else len(out)
+        # The number of instances is unknown : the outputs are concatenated at the end
+        if num_instances is None:
+            return torch.cat(list(self.predict_batches()))
+        index = 0
+        for minibatch_output in self.predict_batches():
+            if out is None:
+                out = minibatch_output.new_empty((num_instances,) + minibatch_output.shape[1:])
+            if index + len(minibatch_output) > len(out):
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_PREDICTION_BUFFER_TOO_SMALL % len(out))
+            out[index:index + len(minibatch_output)] = minibatch_output
+            index += len(minibatch_output)
+        return out
+
+    def predict_batches(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Infer the model mini-batch by mini-batch, in eval mode and without autograd graph
+        The outputs of each mini-batch are written to the sinks before being yielded
+        (the outputs are inference tensors, they cannot be saved for backward)
 
         PARAMETERS:
         -----------
@@ -55,15 +137,57 @@ class Predictor(GenericInferer):
         RETURN:
         -------
 
-        :return outputs->dict: the total losses and total metrics for the model over the test data set
+        :return->Generator[Tensor]: The outputs of each mini-batch
+        """
+        for sink in self.sinks:
+            sink.open(num_instances=self.get_num_instances())
+        training = self.model.training
+        # The sinks only report a success once every mini-batch has been written
+        complete = False
+        try:
+            for minibatch_index, minibatch in enumerate(self.dataloader, 0):
+                # Only the forward pass and the writes are in inference mode : the code of the caller
+                # between two mini-batches runs with autograd and with the model in its previous mode
+                with self.inference_mode(self.model):
+                    inputs, labels, additional_data = self.clean_single_element_list(self.collate.convert(minibatch))
+                    # Infer the outputs from the model over the given mini batch
+                    minibatch_output = self.model(*inputs)
+                    if self.sinks:
+                        array = Sink.to_numpy(minibatch_output)
+                        for sink in self.sinks:
+                            sink.write(array)
+                yield minibatch_output
+            complete = True
+        finally:
+            # Also restored when the caller stops before the last mini-batch
+            self.model.train(training)
+            for sink in self.sinks:
+                sink.close(complete=complete)
+
+    def get_num_instances(self):
         """
-        # Initialise an empty tensor to store outputs
-        outputs = Tensor()
-        for minibatch_index, minibatch in enumerate(self.dataloader, 0):
-            inputs, labels, additional_data = self.clean_single_element_list(minibatch)
-            # Infer the outputs from the model over the given mini batch
-            minibatch_output = self.model(*inputs)
-            # Append mini_batch output to the output tensor
-            outputs.cat(minibatch_output.detach())
-        return outputs
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
 
+        DESCRIPTION:
+        ------------
+
+        Get the number of instances predicted
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of instances (None if unknown, e.g. for a stream of shards)
+        """
+        if self.sampler is not None:
+            return len(self.sampler)
+        if isinstance(self.dataset, IterableDataset):
+            return None
+        return len(self.dataset)
@@ -0,0 +1,501 @@
+import numpy as np
+import torch
+
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class Sink(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A destination of the outputs of a Predictor, written mini-batch by mini-batch while predicting
+    """
+
+    def __init__(self, path: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a Sink instance
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the file to write
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.path = path
+        self.num_instances = None
+
+    def open(self, num_instances: int = None) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Prepare the sink before the first mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param num_instances->int: The number of instances which will be predicted (None if unknown)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.num_instances = num_instances
+
+    def write(self, outputs: np.ndarray) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Write the outputs of a mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param outputs->np.ndarray: The outputs of the mini-batch (one row per instance)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        raise NotImplementedError
+
+    def close(self, complete: bool = True) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Flush and close the sink after the last mini-batch (or after an error or an early stop of the prediction)
+
+        PARAMETERS:
+        -----------
+
+        :param complete->bool: Whether all the mini-batches have been written
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if complete is True:
+            Notification(DEEP_NOTIF_SUCCESS, DEEP_MSG_PREDICTION_SAVED % self.path)
+        else:
+            Notification(DEEP_NOTIF_WARNING, DEEP_MSG_PREDICTION_INCOMPLETE % self.path)
+
+    @staticmethod
+    def to_numpy(outputs: torch.Tensor) -> np.ndarray:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Convert the outputs of a mini-batch to a numpy array (bfloat16 has no numpy equivalent, it is written in float32)
+
+        PARAMETERS:
+        -----------
+
+        :param outputs->torch.Tensor: The outputs of the mini-batch
+
+        RETURN:
+        -------
+
+        :return->np.ndarray: The outputs
+        """
+        if outputs.dtype == torch.bfloat16:
+            outputs = outputs.float()
+        return outputs.detach().cpu().numpy()
+
+
+class NpySink(Sink):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Write the outputs into a memory-mapped .npy file preallocated for all the instances
+    """
+
+    def __init__(self, path: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a NpySink instance
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the .npy file
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__(path=path)
+        self.array = None
+        self.index = 0
+
+    def write(self, outputs: np.ndarray) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Write the outputs of a mini-batch after the outputs already written
+        The .npy file is memory-mapped and preallocated for num_instances rows with the shape and the type of the first outputs
+        (the number of instances must be known)
+
+        PARAMETERS:
+        -----------
+
+        :param outputs->np.ndarray: The outputs of the mini-batch (one row per instance)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        # The file is created with the shape and the type of the first outputs
+        if self.array is None:
+            if self.num_instances is None:
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_PREDICTION_SIZE_UNKNOWN % "NPY")
+            self.array = np.lib.format.open_memmap(self.path,
+                                                   mode="w+",
+                                                   dtype=outputs.dtype,
+                                                   shape=(self.num_instances,) + outputs.shape[1:])
+        self.array[self.index:self.index + len(outputs)] = outputs
+        self.index += len(outputs)
+
+    def close(self, complete: bool = True) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Flush the memory-mapped .npy file to the disk and release it
+
+        PARAMETERS:
+        -----------
+
+        :param complete->bool: Whether all the mini-batches have been written
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.array is not None:
+            self.array.flush()
+            self.array = None
+        # The rows of the preallocated file which have not been written are zeros
+        if complete is True and self.num_instances is not None and self.index != self.num_instances:
+            Notification(DEEP_NOTIF_WARNING, DEEP_MSG_PREDICTION_ROWS_MISSING % (self.index, self.num_instances, self.path))
+            complete = False
+        super().close(complete=complete)
+
+
+class CsvSink(Sink):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Write the outputs into a .csv file, one row per instance (the outputs of an instance are flattened)
+    """
+
+    def __init__(self, path: str, fmt: str = "%.8g"):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a CsvSink instance
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the .csv file
+        :param fmt->str: The format of the values (see numpy.savetxt)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__(path=path)
+        self.fmt = fmt
+        self.file = None
+
+    def open(self, num_instances: int = None) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Create the .csv file (nothing is preallocated, the number of instances may be unknown)
+
+        PARAMETERS:
+        -----------
+
+        :param num_instances->int: The number of instances which will be predicted (None if unknown)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().open(num_instances=num_instances)
+        self.file = open(self.path, "w")
+
+    def write(self, outputs: np.ndarray) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Append one row of comma-separated values per instance, the outputs of each instance being flattened
+
+        PARAMETERS:
+        -----------
+
+        :param outputs->np.ndarray: The outputs of the mini-batch (one row per instance)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        np.savetxt(self.file, outputs.reshape(len(outputs), -1), fmt=self.fmt, delimiter=",")
+
+    def close(self, complete: bool = True) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Close the .csv file
+
+        PARAMETERS:
+        -----------
+
+        :param complete->bool: Whether all the mini-batches have been written
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        super().close(complete=complete)
+
+
+class ParquetSink(Sink):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Write the outputs into a .parquet file, one row group per mini-batch and one column per output value
+    (requires pyarrow)
+    """
+
+    def __init__(self, path: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a ParquetSink instance
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the .parquet file
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__(path=path)
+        self.writer = None
+        # The pyarrow modules, imported when the sink is opened
+        self.pa = None
+        self.pq = None
+
+    def open(self, num_instances: int = None) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Import pyarrow (nothing is preallocated, the number of instances may be unknown)
+        The file is created with the schema of the first outputs
+
+        PARAMETERS:
+        -----------
+
+        :param num_instances->int: The number of instances which will be predicted (None if unknown)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().open(num_instances=num_instances)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_PREDICTION_PARQUET % str(e))
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+
+    def write(self, outputs: np.ndarray) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Append the outputs of a mini-batch as a row group, one column "output_i" per flattened output value
+
+        PARAMETERS:
+        -----------
+
+        :param outputs->np.ndarray: The outputs of the mini-batch (one row per instance)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        outputs = outputs.reshape(len(outputs), -1)
+        table = self.pa.Table.from_arrays([self.pa.array(outputs[:, i]) for i in range(outputs.shape[1])],
+                                          names=["output_%i" % i for i in range(outputs.shape[1])])
+        # The schema is the one of the first outputs
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self, complete: bool = True) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Write the footer of the .parquet file and close it
+
+        PARAMETERS:
+        -----------
+
+        :param complete->bool: Whether all the mini-batches have been written
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        super().close(complete=complete)
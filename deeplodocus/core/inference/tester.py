@@ -9,6 +9,7 @@
 #
 
 from torch.nn import Module
+from torch import Tensor
 
 
 #
@@ -17,6 +18,10 @@ from torch.nn import Module
 
 from deeplodocus.data.dataset import Dataset
 from deeplodocus.utils import dict_utils
+from deeplodocus.core.metrics.running_accumulator import RunningAccumulator
+from deeplodocus.core.metrics.running_accumulator import PredictionAccumulator
+from deeplodocus.utils.distributed import reduce_dict
+from deeplodocus.utils.notification import Notification
 from deeplodocus.utils.flags import *
 from deeplodocus.core.inference.generic_evaluator import GenericEvaluator
 
@@ -42,7 +47,12 @@ class Tester(GenericEvaluator):
                  losses: dict,
                  batch_size: int = 4,
                  num_workers: int = 4,
-                 verbose: int = DEEP_VERBOSE_BATCH):
+                 verbose: int = DEEP_VERBOSE_BATCH,
+                 dtype: str = DEEP_DTYPE_FLOAT32,
+                 shared_memory: bool = False,
+                 autocast: bool = False,
+                 rank: int = None,
+                 world_size: int = None):
 
         """
         AUTHORS:
@@ -65,7 +75,11 @@ class Tester(GenericEvaluator):
         :param batch_size->int: Size a mini-batch
         :param num_workers->int: Number of processes / threads to use for data loading
         :param verbose->int: DEEP_VERBOSE flag, How verbose the Trainer is
-
+        :param dtype->str: The DEEP_DTYPE flag of the images in the mini-batches
+        :param shared_memory->bool: Whether the workers send the mini-batches through a ring of shared memory buffers
+        :param autocast->bool: Whether the model and the losses are computed in mixed precision (bfloat16 on CPU)
+        :param rank->int: The rank of the current process (read from the process group if None)
+        :param world_size->int: The number of processes sharing the dataset (read from the process group if None)
 
         RETURN:
         -------
@@ -79,7 +93,12 @@ class Tester(GenericEvaluator):
                          losses=losses,
                          batch_size=batch_size,
                          num_workers=num_workers,
-                         verbose=verbose)
+                         verbose=verbose,
+                         dtype=dtype,
+                         shared_memory=shared_memory,
+                         autocast=autocast,
+                         rank=rank,
+                         world_size=world_size)
 
 
     def evaluate(self, model):
@@ -115,36 +134,82 @@ class Tester(GenericEvaluator):
         :return total_metrics->dict: Total metrics for the model over the test data set
         """
 
-        # Make dictionaries like losses and metrics but initialised with lists
-        total_losses = dict_utils.like(self.losses, [])
-        total_metrics = dict_utils.like(self.metrics, [])
-
-        # Loop through each mini batch
-        for minibatch_index, minibatch in enumerate(self.dataloader, 0):
-
-            # Get the data
-            inputs, labels, additional_data = self.clean_single_element_list(minibatch)
-
-            # Infer the outputs from the model over the given mini batch
-            outputs = model(*inputs)
-
-            # Detach the tensor from the graph (avoid leaking memory)
-            outputs = outputs.detach()
-
-            # Compute the losses and metrics
-            batch_losses = self.compute_metrics(self.losses, inputs, outputs, labels, additional_data)
-            batch_metrics = self.compute_metrics(self.metrics, inputs, outputs, labels, additional_data)
-
-            # Apply weights to the losses
-            batch_losses = dict_utils.apply_weight(batch_losses, self.losses)
-
-            # Append the losses and metrics for this batch to the total losses and metrics
-            total_losses = dict_utils.apply(total_losses, batch_losses, "append")
-            total_metrics = dict_utils.apply(total_metrics, batch_metrics, "append")
+        # Sums of the losses and metrics over the instances
+        losses_accumulator = RunningAccumulator()
+        metrics_accumulator = RunningAccumulator()
+
+        # The metrics computed once per epoch are either updated with each mini-batch (update() and compute())
+        # or computed on the predictions of all the mini-batches
+        batch_metrics = self.select_metrics(self.metrics, (DEEP_METRIC_SCHEDULE_BATCH,
+                                                           DEEP_METRIC_SCHEDULE_EVERY_N,
+                                                           DEEP_METRIC_SCHEDULE_VALIDATION))
+        stateful_metrics, epoch_metrics = self.split_stateful_metrics(
+            self.select_metrics(self.metrics, (DEEP_METRIC_SCHEDULE_EPOCH,))
+        )
+        predictions = PredictionAccumulator(epoch_metrics) if epoch_metrics else None
+        for metric in stateful_metrics.values():
+            metric.reset()
+
+        # Loop through each mini batch (eval mode, without autograd graph)
+        with self.inference_mode(model):
+            for minibatch_index, minibatch in enumerate(self.dataloader, 0):
+
+                # Get the data
+                inputs, labels, additional_data = self.clean_single_element_list(self.collate.convert(minibatch))
+
+                with self.autocast_context():
+
+                    # Infer the outputs from the model over the given mini batch
+                    outputs = model(*inputs)
+
+                    # Compute the losses and metrics
+                    batch_losses = self.compute_metrics(self.losses, inputs, outputs, labels, additional_data)
+                    result_metrics = self.compute_metrics(batch_metrics, inputs, outputs, labels, additional_data)
+
+                # Apply weights to the losses
+                batch_losses = dict_utils.apply_weight(batch_losses, self.losses)
+
+                # Add the losses and metrics for this batch, weighted by its number of instances
+                batch_size = self.get_batch_size(outputs)
+                losses_accumulator.update(batch_losses, batch_size=batch_size)
+                metrics_accumulator.update(result_metrics, batch_size=batch_size)
+
+                # Update the metrics computed once per epoch, or keep the predictions they require
+                self.update_metrics(stateful_metrics, inputs, outputs, labels, additional_data)
+                if predictions is not None:
+                    predictions.update(inputs, outputs, labels, additional_data)
+
+            # Calculate the metrics computed once per epoch
+            # (the states of the stateful metrics are summed over the processes first)
+            epoch_results = self.compute_stateful_metrics(stateful_metrics, synchronize=self.world_size > 1)
+            if predictions is not None and losses_accumulator.get_count() > 0:
+                with self.autocast_context():
+                    epoch_results.update(self.compute_metrics(epoch_metrics, *predictions.get()))
 
         # Calculate the mean for each loss and metric
-        total_losses = dict_utils.mean(total_losses)
-        total_metrics = dict_utils.mean(total_metrics)
+        total_losses = losses_accumulator.compute(as_tensors=True)
+        total_metrics = metrics_accumulator.compute()
+        total_metrics.update({key: value.item() if isinstance(value, Tensor) else value
+                              for key, value in epoch_results.items()})
+
+        # Average over the processes, in proportion to their number of instances
+        # (the metrics computed on the predictions of each process once per epoch are averaged as well)
+        # A process without any mini-batch has no value : the keys are taken from the losses and the metrics
+        if self.world_size > 1:
+            total_losses = reduce_dict({loss.get_name(): total_losses.get(loss.get_name())
+                                        for loss in self.losses.values()},
+                                       weight=losses_accumulator.get_count())
+            total_metrics = reduce_dict({metric.get_name(): total_metrics.get(metric.get_name())
+                                         for metric in self.metrics.values()},
+                                        weight=metrics_accumulator.get_count())
+
+        # No mini-batch was evaluated (by any process) : the losses have no value to sum
+        if self.world_size > 1:
+            empty = any(value is None for value in total_losses.values())
+        else:
+            empty = losses_accumulator.get_count() == 0
+        if empty:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_EVALUATION_EMPTY % self.dataset.name)
 
         # Calculate the sum of the losses
         sum_losses = dict_utils.sum_dict(total_losses)
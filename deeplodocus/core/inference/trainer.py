@@ -1,11 +1,15 @@
 #
 # COMMON IMPORTS
 #
+import contextlib
+import math
 
 #
 # BACKEND IMPORTS
 #
+import torch.distributed as dist
 from torch.nn import Module
+from torch.nn.parallel import DistributedDataParallel
 from torch import Tensor
 #
 # DEEPLODOCUS IMPORTS
@@ -17,6 +21,9 @@ from deeplodocus.core.inference.tester import Tester
 from deeplodocus.utils.notification import Notification
 from deeplodocus.utils.dict_utils import apply_weight
 from deeplodocus.utils.dict_utils import sum_dict
+from deeplodocus.utils.dict_utils import merge_sum_dict
+from deeplodocus.utils.distributed import reduce_dict
+from deeplodocus.core.metrics.running_accumulator import PredictionAccumulator
 from deeplodocus.utils.flags import *
 from deeplodocus.core.inference.generic_evaluator import GenericEvaluator
 from deeplodocus.brain.thalamus import Thalamus
@@ -46,7 +53,15 @@ class Trainer(GenericEvaluator):
                  shuffle: int = DEEP_SHUFFLE_ALL,
                  num_workers: int = 4,
                  verbose: int=DEEP_VERBOSE_BATCH,
-                 tester: Tester=None):
+                 tester: Tester=None,
+                 dtype: str = DEEP_DTYPE_FLOAT32,
+                 shared_memory: bool = False,
+                 seed: int = None,
+                 accumulation_steps: int = 1,
+                 autocast: bool = False,
+                 grad_scaler=None,
+                 rank: int = None,
+                 world_size: int = None):
         """
         AUTHORS:
         --------
@@ -77,6 +92,14 @@ class Trainer(GenericEvaluator):
         :param stopping_parameters:
         :param tester->Tester: The tester to use for validation
         :param model_name->str: The name of the model
+        :param dtype->str: The DEEP_DTYPE flag of the images in the mini-batches
+        :param shared_memory->bool: Whether the workers send the mini-batches through a ring of shared memory buffers
+        :param seed->int: The seed of the shuffling (drawn at random if None)
+        :param accumulation_steps->int: Number of mini-batches whose gradients are accumulated per optimizer step
+        :param autocast->bool: Whether the model and the losses are computed in mixed precision (bfloat16 on CPU)
+        :param grad_scaler: The loss scaler (scale, step and update methods, e.g. torch.amp.GradScaler), None to disable
+        :param rank->int: The rank of the current process (read from the process group if None)
+        :param world_size->int: The number of processes sharing the dataset (read from the process group if None)
 
         RETURN:
         -------
@@ -90,11 +113,30 @@ class Trainer(GenericEvaluator):
                          losses=losses,
                          batch_size=batch_size,
                          num_workers=num_workers,
-                         verbose=verbose)
-
-
+                         verbose=verbose,
+                         dtype=dtype,
+                         shared_memory=shared_memory,
+                         shuffle=shuffle,
+                         seed=seed,
+                         autocast=autocast,
+                         rank=rank,
+                         world_size=world_size)
+
+
+        # With several processes, the gradients are averaged over the processes by DistributedDataParallel
+        if self.world_size > 1:
+            self.model = DistributedDataParallel(model)
         self.shuffle = shuffle
         self.optimizer = optimizer
+        if not isinstance(accumulation_steps, int) or accumulation_steps < 1:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_ACCUMULATION_STEPS_INVALID % str(accumulation_steps))
+        self.accumulation_steps = accumulation_steps
+        self.grad_scaler = grad_scaler
+        # The mini-batches and instances of the current epoch used by an optimizer step (to resume the sampler)
+        self.num_trained_minibatches = 0
+        self.num_trained_instances = 0
+        # The callbacks computing time (paused between two trainings), none by default
+        self.callbacks = None
         self.initial_epoch = initial_epoch
         self.num_epochs = num_epochs
 
@@ -135,8 +177,9 @@ class Trainer(GenericEvaluator):
         """
         self.__train(first_training=first_training)
         Notification(DEEP_NOTIF_SUCCESS, FINISHED_TRAINING)
-        # Prompt if the user want to continue the training
-        self.__continue_training()
+        # Prompt if the user want to continue the training (the processes of a distributed training cannot all prompt)
+        if self.world_size == 1:
+            self.__continue_training()
 
     def __train(self, first_training=True)->None:
         """
@@ -162,60 +205,125 @@ class Trainer(GenericEvaluator):
         """
 
         if first_training is True:
-            Thalamus().add_signal(signal=Signal(event=DEEP_EVENT_ON_TRAINING_START, args={}))
-        else:
+            self.__add_signal(Signal(event=DEEP_EVENT_ON_TRAINING_START, args={}))
+        elif self.callbacks is not None:
             self.callbacks.unpause()
 
         for epoch in range(self.initial_epoch+1, self.num_epochs+1):  # loop over the dataset multiple times
 
-            Thalamus().add_signal(signal=Signal(event=DEEP_EVENT_ON_EPOCH_START, args={"epoch_index": epoch,
-                                                                                       "num_epochs": self.num_epochs}))
+            self.__add_signal(Signal(event=DEEP_EVENT_ON_EPOCH_START, args={"epoch_index": epoch,
+                                                                            "num_epochs": self.num_epochs}))
+
+            # Draw the order of the instances for this epoch
+            self.set_epoch(epoch)
+            self.num_trained_minibatches, self.num_trained_instances = 0, 0
+
+            # The metrics computed once per epoch are either updated with each mini-batch (update() and compute())
+            # or computed on the predictions of all the mini-batches
+            stateful_metrics, epoch_metrics = self.split_stateful_metrics(
+                self.select_metrics(self.metrics, (DEEP_METRIC_SCHEDULE_EPOCH,))
+            )
+            predictions = PredictionAccumulator(epoch_metrics) if epoch_metrics else None
+            for metric in stateful_metrics.values():
+                metric.reset()
+
+            # Index of the optimizer step and position of the mini-batch in this step
+            step_index, accumulation_index = 0, 0
 
             for minibatch_index, minibatch in enumerate(self.dataloader, 0):
 
+                # Number of mini-batches of the optimizer step, fixed on its first mini-batch
+                # (at least one : the loader may yield more mini-batches than expected,
+                # e.g. when the length of a stream of shards is an estimate)
+                first_accumulation = accumulation_index == 0
+                if first_accumulation is True:
+                    num_accumulated = max(1, min(self.accumulation_steps, self.num_minibatches - minibatch_index))
+                last_accumulation = accumulation_index == num_accumulated - 1
+                accumulation_index = 0 if last_accumulation else accumulation_index + 1
+
+                # zero the parameter gradients at the beginning of each optimizer step
+                if first_accumulation is True:
+                    self.optimizer.zero_grad()
+                    accumulated_total_loss, accumulated_losses, accumulated_metrics = 0, {}, {}
+                    accumulated_instances = 0
+                    # The metrics computed on the mini-batches of this optimizer step
+                    step_metrics = {key: metric for key, metric in self.metrics.items()
+                                    if metric.is_scheduled(step_index)}
+
                 # Clean the given data
-                inputs, labels, additional_data = self.clean_single_element_list(minibatch)
+                inputs, labels, additional_data = self.clean_single_element_list(self.collate.convert(minibatch))
 
-                # zero the parameter gradients
-                self.optimizer.zero_grad()
+                # Only synchronise the gradients of the processes on the last mini-batch of the optimizer step
+                with self.__no_sync(last_accumulation):
 
-                # Infer the output of the batch
-                outputs = self.model(*inputs)
+                    # The forward pass and the losses run in mixed precision if required
+                    with self.autocast_context():
 
-                # Compute losses and metrics
-                result_losses = self.compute_metrics(self.losses, inputs, outputs, labels, additional_data)
-                result_metrics = self.compute_metrics(self.metrics, inputs, outputs, labels, additional_data)
+                        # Infer the output of the batch
+                        outputs = self.model(*inputs)
 
-                # Add weights to losses
-                result_losses = apply_weight(result_losses, self.losses)
+                        # Compute losses and metrics
+                        result_losses = self.compute_metrics(self.losses, inputs, outputs, labels, additional_data)
+                        result_metrics = self.compute_metrics(step_metrics, inputs, outputs, labels, additional_data)
 
-                # Sum all the result of the losses
-                total_loss = sum_dict(result_losses)
+                        # Add weights to losses
+                        result_losses = apply_weight(result_losses, self.losses)
 
-                # Accumulates the gradient (by addition) for each parameter
-                total_loss.backward()
+                        # Sum all the result of the losses
+                        total_loss = sum_dict(result_losses)
 
-                # Performs a parameter update based on the current gradient (stored in .grad attribute of a parameter)
-                # and the update rule
-                self.optimizer.step()
+                    # Accumulates the gradient (by addition) for each parameter
+                    # The loss is scaled so that the gradient of the step is the mean over its mini-batches
+                    loss = total_loss / num_accumulated if num_accumulated > 1 else total_loss
+                    if self.grad_scaler is not None:
+                        loss = self.grad_scaler.scale(loss)
+                    loss.backward()
 
                 outputs, total_loss, result_losses, result_metrics = self.detach(outputs=outputs,
                                                                                  total_loss=total_loss,
                                                                                  result_losses=result_losses,
                                                                                  result_metrics=result_metrics)
 
-                # Send signal batch end
-                Thalamus().add_signal(Signal(event= DEEP_EVENT_ON_BATCH_END,
-                                             args={"minibatch_index": minibatch_index+1,
-                                                   "num_minibatches": self.num_minibatches,
-                                                   "epoch_index": epoch,
-                                                   "total_loss": total_loss.item(),
-                                                   "result_losses": result_losses,
-                                                   "result_metrics": result_metrics
-                                                   }))
-
-            # Shuffle the data if required
-            if self.shuffle is not None:
+                # Sum the losses and the metrics of the mini-batches of the step
+                accumulated_total_loss = accumulated_total_loss + total_loss
+                accumulated_losses = merge_sum_dict(accumulated_losses, result_losses)
+                accumulated_metrics = merge_sum_dict(accumulated_metrics, result_metrics)
+                accumulated_instances += self.get_batch_size(outputs)
+
+                # Update the metrics computed once per epoch, or keep the predictions they require
+                self.update_metrics(stateful_metrics, inputs, outputs, labels, additional_data)
+                if predictions is not None:
+                    predictions.update(inputs, outputs, labels, additional_data)
+
+                if not last_accumulation:
+                    continue
+
+                self.__step(epoch=epoch,
+                            step_index=step_index,
+                            num_accumulated=num_accumulated,
+                            num_instances=accumulated_instances,
+                            total_loss=accumulated_total_loss,
+                            result_losses=accumulated_losses,
+                            result_metrics=accumulated_metrics)
+                step_index += 1
+
+            # The loader yielded fewer mini-batches than expected (e.g. the estimated length of a stream of shards) :
+            # step with the mini-batches accumulated, their gradients being scaled for the expected number
+            if accumulation_index > 0:
+                self.__rescale_gradients(scale=num_accumulated / accumulation_index)
+                self.__step(epoch=epoch,
+                            step_index=step_index,
+                            num_accumulated=accumulation_index,
+                            num_instances=accumulated_instances,
+                            total_loss=accumulated_total_loss,
+                            result_losses=accumulated_losses,
+                            result_metrics=accumulated_metrics)
+
+            # Compute the metrics once per epoch
+            result_epoch_metrics = self.__compute_epoch_metrics(epoch_metrics, predictions, stateful_metrics)
+
+            # Shuffle the data if required (not done by the sampler)
+            if self.shuffle is not None and self.sampler is None and self.batch_sampler is None:
                 self.dataset.shuffle(self.shuffle)
 
             # Reset the dataset (transforms cache)
@@ -225,24 +333,26 @@ class Trainer(GenericEvaluator):
             total_validation_loss, result_validation_losses, result_validation_metrics = self.__evaluate_epoch()
 
             # Send signal epoch end
-            Thalamus().add_signal(Signal(event=DEEP_EVENT_ON_EPOCH_END,
-                                         args={"epoch_index": epoch,
-                                                "num_epochs" : self.num_epochs,
-                                                "model" : self.model,
-                                                "num_minibatches" : self.num_minibatches,
-                                                "total_validation_loss" : total_validation_loss.item(),
-                                                "result_validation_losses" : result_validation_losses,
-                                                "result_validation_metrics" : result_validation_metrics,
-                                                "num_minibatches_validation" : self.tester.get_num_minibatches()
-                                               }))
+            self.__add_signal(Signal(event=DEEP_EVENT_ON_EPOCH_END,
+                                     args={"epoch_index": epoch,
+                                            "num_epochs" : self.num_epochs,
+                                            "model" : self.get_model(),
+                                            "num_minibatches" : self.get_num_steps(),
+                                            "result_epoch_metrics" : result_epoch_metrics,
+                                            "total_validation_loss" : total_validation_loss.item(),
+                                            "result_validation_losses" : result_validation_losses,
+                                            "result_validation_metrics" : result_validation_metrics,
+                                            "num_minibatches_validation" : self.tester.get_num_minibatches()
+                                           }))
 
 
         # Send signal end training
-        Thalamus().add_signal(Signal(event=DEEP_EVENT_ON_TRAINING_END,
-                                     args={"model" : self.model}))
+        self.__add_signal(Signal(event=DEEP_EVENT_ON_TRAINING_END,
+                                 args={"model" : self.get_model()}))
 
         # Pause callbacks which compute time
-        self.callbacks.pause()
+        if self.callbacks is not None:
+            self.callbacks.pause()
 
 
     def detach(self, outputs, total_loss, result_losses, result_metrics):
@@ -288,6 +398,317 @@ class Trainer(GenericEvaluator):
         return outputs, total_loss, result_losses, result_metrics
 
 
+    def reduce(self, total_loss, result_losses, result_metrics):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Average the losses and the metrics of a mini-batch over all the processes
+
+        PARAMETERS:
+        -----------
+
+        :param total_loss: The total loss of the current process
+        :param result_losses: The losses of the current process
+        :param result_metrics: The metrics of the current process
+
+        RETURN:
+        -------
+
+        :return total_loss: The averaged total loss
+        :return result_losses: The averaged losses
+        :return result_metrics: The averaged metrics
+        """
+        values = {("loss", key): value for key, value in result_losses.items()}
+        values.update({("metric", key): value for key, value in result_metrics.items()})
+        values[TOTAL_LOSS] = total_loss
+        values = reduce_dict(values)
+        total_loss = values.pop(TOTAL_LOSS)
+        result_losses = {key: values[("loss", key)] for key in result_losses}
+        result_metrics = {key: values[("metric", key)] for key in result_metrics}
+        return total_loss, result_losses, result_metrics
+
+    def get_num_steps(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of optimizer steps per epoch (one per group of accumulated mini-batches)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of optimizer steps per epoch
+        """
+        return math.ceil(self.num_minibatches / self.accumulation_steps)
+
+    def get_sampler_state(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the sampler at the last optimizer step, to resume the training in the middle of an epoch
+        The mini-batches prefetched by the DataLoader, or accumulated without an optimizer step yet, are given again
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the sampler (None if the instances are not given by a sampler)
+        """
+        if self.batch_sampler is not None:
+            return self.batch_sampler.state_dict(index=self.batch_sampler.offset + self.num_trained_minibatches)
+        if self.sampler is not None:
+            return self.sampler.state_dict(index=self.sampler.offset + self.num_trained_instances)
+        return None
+
+    def get_model(self) -> Module:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the model trained (without its DistributedDataParallel wrapper)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->torch.nn.Module: The model
+        """
+        if isinstance(self.model, DistributedDataParallel):
+            return self.model.module
+        return self.model
+
+    def __compute_epoch_metrics(self,
+                                epoch_metrics: dict,
+                                predictions: PredictionAccumulator,
+                                stateful_metrics: dict) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the metrics computed once per epoch, from their state or on the predictions of the epoch
+        With several processes, the states of the stateful metrics are summed over the processes
+        and the metrics computed on the predictions of each process are averaged in proportion to its number of instances
+
+        PARAMETERS:
+        -----------
+
+        :param epoch_metrics->dict: The metrics computed once per epoch on the predictions
+        :param predictions->PredictionAccumulator: The predictions of the epoch (None without epoch metrics)
+        :param stateful_metrics->dict: The metrics computed once per epoch from their state
+
+        RETURN:
+        -------
+
+        :return->dict: The values of the metrics
+        """
+        result_metrics = {}
+        if predictions is not None:
+            inputs, outputs, labels, additional_data = predictions.get()
+            with self.autocast_context():
+                result_metrics = self.compute_metrics(epoch_metrics, inputs, outputs, labels, additional_data)
+            if self.world_size > 1:
+                result_metrics = reduce_dict(result_metrics, weight=self.get_batch_size(outputs))
+        result_metrics.update(self.compute_stateful_metrics(stateful_metrics, synchronize=self.world_size > 1))
+        return {key: value.item() if isinstance(value, Tensor) else value for key, value in result_metrics.items()}
+
+    def __step(self,
+               epoch: int,
+               step_index: int,
+               num_accumulated: int,
+               num_instances: int,
+               total_loss,
+               result_losses: dict,
+               result_metrics: dict) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Update the parameters from the gradients of the mini-batches of an optimizer step
+        and send the losses and the metrics of the step
+
+        PARAMETERS:
+        -----------
+
+        :param epoch->int: The index of the epoch
+        :param step_index->int: The index of the optimizer step in the epoch
+        :param num_accumulated->int: The number of mini-batches of the step
+        :param num_instances->int: The number of instances of the step
+        :param total_loss: The sum of the total losses of the mini-batches
+        :param result_losses->dict: The sums of the losses of the mini-batches
+        :param result_metrics->dict: The sums of the metrics of the mini-batches
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        # Performs a parameter update based on the current gradient (stored in .grad attribute of a parameter)
+        # and the update rule (the loss scaler unscales the gradients and skips the steps with infinite values)
+        if self.grad_scaler is not None:
+            self.grad_scaler.step(self.optimizer)
+            self.grad_scaler.update()
+        else:
+            self.optimizer.step()
+        self.num_trained_minibatches += num_accumulated
+        self.num_trained_instances += num_instances
+
+        # Average the losses and the metrics over the mini-batches of the step
+        if num_accumulated > 1:
+            total_loss = total_loss / num_accumulated
+            result_losses = {key: value / num_accumulated for key, value in result_losses.items()}
+            result_metrics = {key: value / num_accumulated for key, value in result_metrics.items()}
+
+        # Average the losses and the metrics over the processes
+        if self.world_size > 1:
+            total_loss, result_losses, result_metrics = self.reduce(total_loss=total_loss,
+                                                                    result_losses=result_losses,
+                                                                    result_metrics=result_metrics)
+
+        # The history records numbers
+        result_metrics = {key: value.item() if isinstance(value, Tensor) else value
+                          for key, value in result_metrics.items()}
+
+        # Send signal batch end (once per optimizer step)
+        self.__add_signal(Signal(event=DEEP_EVENT_ON_BATCH_END,
+                                 args={"minibatch_index": step_index+1,
+                                       "num_minibatches": self.get_num_steps(),
+                                       "epoch_index": epoch,
+                                       "total_loss": total_loss.item(),
+                                       "result_losses": result_losses,
+                                       "result_metrics": result_metrics
+                                       }))
+
+    def __rescale_gradients(self, scale: float) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Scale the accumulated gradients of the parameters
+        With several processes, the gradients accumulated without synchronization are averaged over the processes
+        (all the processes have the same number of mini-batches, they all rescale the same step)
+
+        PARAMETERS:
+        -----------
+
+        :param scale->float: The factor applied to the gradients
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.world_size > 1:
+            scale = scale / self.world_size
+        for parameter in self.model.parameters():
+            if parameter.grad is None:
+                continue
+            if self.world_size > 1:
+                dist.all_reduce(parameter.grad, op=dist.ReduceOp.SUM)
+            parameter.grad.mul_(scale)
+
+    def __no_sync(self, synchronize: bool):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the context in which the gradients of a mini-batch are computed
+        With several processes, the gradients are only averaged over the processes when they have to be synchronized
+
+        PARAMETERS:
+        -----------
+
+        :param synchronize->bool: Whether the gradients have to be synchronized between the processes
+
+        RETURN:
+        -------
+
+        :return: The context manager
+        """
+        if synchronize is False and isinstance(self.model, DistributedDataParallel):
+            return self.model.no_sync()
+        return contextlib.nullcontext()
+
+    def __add_signal(self, signal: Signal) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Send a signal of the training to the callbacks
+        With several processes, only the process of rank 0 keeps the history and saves the model
+
+        PARAMETERS:
+        -----------
+
+        :param signal->Signal: The signal
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.rank == 0:
+            Thalamus().add_signal(signal=signal)
+
     def __continue_training(self):
         """
         AUTHORS:
@@ -357,7 +778,7 @@ class Trainer(GenericEvaluator):
         result_losses = None
         result_metrics = None
         if self.tester is not None:
-            total_validation_loss, result_losses, result_metrics = self.tester.evaluate(model=self.model)
+            total_validation_loss, result_losses, result_metrics = self.tester.evaluate(model=self.get_model())
         return total_validation_loss, result_losses, result_metrics
 
 
@@ -370,4 +791,4 @@ class Trainer(GenericEvaluator):
         """
 
         if saving_required is True:
-            Thalamus().add_signal(signal= Signal(event=DEEP_EVENT_SAVE_MODEL, args={"model": self.model}))
+            Thalamus().add_signal(signal= Signal(event=DEEP_EVENT_SAVE_MODEL, args={"model": self.get_model()}))
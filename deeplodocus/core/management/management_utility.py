@@ -9,6 +9,9 @@ import sys
 from deeplodocus.utils.notification import Notification
 from deeplodocus.utils.flags import *
 from deeplodocus.core.project.project_utility import ProjectUtility
+from deeplodocus.data.dataset import Dataset
+from deeplodocus.data.shard_writer import ShardWriter
+from deeplodocus.utils.namespace import Namespace
 from deeplodocus import __version__
 
 class ManagementUtility(object):
@@ -17,7 +20,8 @@ class ManagementUtility(object):
 
         self.commands = {"help" : "List the commands available",
                          "version" : "Display the version of Deeplodocus installed",
-                         "startproject" : "Generate a deeplodocus to use Deeplodocus"}
+                         "startproject" : "Generate a deeplodocus to use Deeplodocus",
+                         "pack" : "Pack a dataset into shards : pack <data config> <train/validation/test> <output directory> [instances per shard]"}
 
         self.argv = argv or sys.argv[:]
 
@@ -40,6 +44,9 @@ class ManagementUtility(object):
                 self.__version()
 
 
+            elif str(self.argv[1]) == "pack":
+                self.__pack()
+
             elif str(self.argv[1]) == "help":
 
                 self.__help()
@@ -80,3 +87,35 @@ class ManagementUtility(object):
 
         p = ProjectUtility(project_name=name, main_path =main_path)
         p.generate_structure()
+
+    def __pack(self):
+        """
+        Pack a split of the dataset described in a data config file into shards read sequentially
+        (set the output directory as 'shards' in the data config to use them)
+        The directories are only scanned once : no manifest of their files is written into the cache directory
+        :return: None
+        """
+
+        if len(self.argv) < 5:
+            Notification(DEEP_NOTIF_ERROR, "Usage : deeplodocus " + self.commands["pack"].split(" : ")[1], log=False)
+            return
+
+        datasets = Namespace(self.argv[2]).dataset
+        data = datasets.get(self.argv[3]) if datasets.check(self.argv[3]) else {}
+        samples_per_shard = int(self.argv[5]) if len(self.argv) > 5 else DEEP_SHARD_SIZE
+
+        # The labels and the additional data are optional : a missing or Null entry is [Null] (as in the config files)
+        inputs = data.get("inputs", None)
+        labels = data.get("labels", None) or [None]
+        additional_data = data.get("additional_data", None) or [None]
+        if not inputs:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_SHARDS_NO_INPUTS % (self.argv[3], self.argv[2]), log=False)
+
+        dataset = Dataset(list_inputs=[item for item in inputs],
+                          list_labels=[item for item in labels],
+                          list_additional_data=[item for item in additional_data],
+                          lazy_text=data["lazy_text"] if "lazy_text" in data else False,
+                          cache_dir=None,
+                          name=self.argv[3])
+        dataset.load()
+        ShardWriter(directory=self.argv[4], samples_per_shard=samples_per_shard).write(dataset)
@@ -0,0 +1,268 @@
+# Import back-end modules
+import torch
+import torch.distributed as dist
+
+
+class AccumulatingMetric(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A metric computed from sufficient statistics (counts, sums, confusion matrices)
+    The statistics of a mini-batch are tensors on the device of the outputs, they can be summed over the mini-batches
+    to compute the metric of several mini-batches without converting anything to numbers
+
+    Calling the metric computes the value of a mini-batch,
+    update() adds the statistics of a mini-batch to the state and compute() computes the value of the state
+    """
+
+    def __init__(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize an AccumulatingMetric instance with an empty state
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.state = None
+
+    def __call__(self, outputs, labels) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the value of the metric on a mini-batch (the state is not modified)
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The value of the metric
+        """
+        with torch.no_grad():
+            return self.value(self.statistics(outputs, labels))
+
+    def update(self, outputs, labels) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Add the statistics of a mini-batch to the state
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        with torch.no_grad():
+            statistics = self.statistics(outputs, labels)
+        if self.state is None:
+            self.state = statistics
+        else:
+            self.state = tuple(total + statistic for total, statistic in zip(self.state, statistics))
+
+    def compute(self) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the value of the metric on all the mini-batches added since the last reset
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The value of the metric (None if no mini-batch was added)
+        """
+        if self.state is None:
+            return None
+        return self.value(self.state)
+
+    def reset(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Empty the state
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.state = None
+
+    def synchronize(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Sum the states of all the processes, so that compute() gives the value of the whole dataset in each process
+        The processes which did not add any mini-batch take part in the sum with zero statistics
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if not dist.is_available() or not dist.is_initialized():
+            return
+        # Every process must call the same collectives : share the layout of the statistics first
+        layout = None if self.state is None else [(statistic.shape, statistic.dtype, statistic.device.type)
+                                                  for statistic in self.state]
+        layouts = [None] * dist.get_world_size()
+        dist.all_gather_object(layouts, layout)
+        layout = next((other for other in layouts if other is not None), None)
+        # No process added any mini-batch
+        if layout is None:
+            return
+        if self.state is None:
+            self.state = tuple(torch.zeros(shape, dtype=dtype, device=self.__get_device(device_type))
+                               for shape, dtype, device_type in layout)
+        for statistic in self.state:
+            dist.all_reduce(statistic, op=dist.ReduceOp.SUM)
+
+    @staticmethod
+    def __get_device(device_type: str) -> torch.device:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the device of the current process for a type of device (the current CUDA device for "cuda")
+
+        PARAMETERS:
+        -----------
+
+        :param device_type->str: The type of device
+
+        RETURN:
+        -------
+
+        :return->torch.device: The device
+        """
+        if device_type == "cuda":
+            return torch.device(device_type, torch.cuda.current_device())
+        return torch.device(device_type)
+
+    def statistics(self, outputs, labels) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the sufficient statistics of a mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return->tuple: The statistics (tensors which can be summed over the mini-batches)
+        """
+        raise NotImplementedError
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the value of the metric from statistics
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The statistics of one or several mini-batches
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The value of the metric
+        """
+        raise NotImplementedError
@@ -0,0 +1,602 @@
+# Import back-end modules
+import torch
+
+# Import Deeplodocus modules
+from deeplodocus.core.metrics.accumulating_metric import AccumulatingMetric
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class ClassificationMetric(AccumulatingMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A metric comparing the classes predicted with the labels
+    The outputs are either the scores of each class along the dimension 1 (N, C, ...)
+    or the probability of the positive class of a binary problem (N,) or (N, 1, ...)
+    """
+
+    def __init__(self, threshold: float = 0.5, ignore_index: int = None):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a ClassificationMetric instance
+
+        PARAMETERS:
+        -----------
+
+        :param threshold->float: The probability above which a binary output is positive
+        :param ignore_index->int: A label not taken into account (None to take all the labels into account)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__()
+        self.threshold = threshold
+        self.ignore_index = ignore_index
+
+    def predict(self, outputs: torch.Tensor) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the class predicted for each output
+
+        PARAMETERS:
+        -----------
+
+        :param outputs->torch.Tensor: The outputs of the model
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The classes predicted (N, ...)
+        """
+        if outputs.dim() > 1 and outputs.shape[1] > 1:
+            return outputs.argmax(dim=1)
+        if outputs.dim() > 1:
+            outputs = outputs.squeeze(1)
+        return (outputs > self.threshold).long()
+
+    def get_mask(self, labels: torch.Tensor) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the labels taken into account
+
+        PARAMETERS:
+        -----------
+
+        :param labels->torch.Tensor: The labels
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: A boolean tensor, True for the labels taken into account
+        """
+        if self.ignore_index is None:
+            return torch.ones_like(labels, dtype=torch.bool)
+        return labels != self.ignore_index
+
+
+class Accuracy(ClassificationMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The proportion of the outputs whose predicted class is the label
+    """
+
+    def statistics(self, outputs, labels) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Count the outputs whose predicted class is the label, among the labels taken into account
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return correct->torch.Tensor: The number of right predictions
+        :return total->torch.Tensor: The number of labels taken into account
+        """
+        predictions = self.predict(outputs)
+        labels = labels.reshape(predictions.shape).long()
+        mask = self.get_mask(labels)
+        return ((predictions == labels) & mask).sum(), mask.sum()
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the proportion of right predictions
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The numbers of right predictions and of labels
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The accuracy (0 without labels)
+        """
+        correct, total = statistics
+        return correct / total.clamp(min=1)
+
+
+class TopKAccuracy(ClassificationMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The proportion of the outputs whose label is one of the k classes with the highest scores
+    """
+
+    def __init__(self, k: int = 5, ignore_index: int = None):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a TopKAccuracy instance
+
+        PARAMETERS:
+        -----------
+
+        :param k->int: The number of classes with the highest scores
+        :param ignore_index->int: A label not taken into account (None to take all the labels into account)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__(ignore_index=ignore_index)
+        self.k = k
+
+    def statistics(self, outputs, labels) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Count the outputs whose label is among the k classes with the highest scores
+        (all the classes if there are less than k)
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return correct->torch.Tensor: The number of labels among the k classes
+        :return total->torch.Tensor: The number of labels taken into account
+        """
+        top_k = outputs.topk(min(self.k, outputs.shape[1]), dim=1).indices
+        labels = labels.reshape(top_k.shape[:1] + top_k.shape[2:]).long()
+        mask = self.get_mask(labels)
+        return ((top_k == labels.unsqueeze(1)).any(dim=1) & mask).sum(), mask.sum()
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the proportion of labels among the k classes with the highest scores
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The numbers of labels among the k classes and of labels
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The top-k accuracy (0 without labels)
+        """
+        correct, total = statistics
+        return correct / total.clamp(min=1)
+
+
+class ConfusionMatrix(ClassificationMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The confusion matrix (num_classes, num_classes), a row per label and a column per predicted class
+    The value is a matrix and not a number : it is meant to be used in the code (update() and compute())
+    and by the metrics computed from the confusion matrix
+    """
+
+    def __init__(self, num_classes: int = 2, threshold: float = 0.5, ignore_index: int = None):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a ConfusionMatrix instance
+
+        PARAMETERS:
+        -----------
+
+        :param num_classes->int: The number of classes
+        :param threshold->float: The probability above which a binary output is positive
+        :param ignore_index->int: A label not taken into account (None to take all the labels into account)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__(threshold=threshold, ignore_index=ignore_index)
+        self.num_classes = num_classes
+
+    def statistics(self, outputs, labels) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Count the instances of each pair (label, predicted class)
+        The matrix is filled with a scatter on the device, the entries ignored being counted in an extra bin
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return->tuple: The confusion matrix (num_classes, num_classes) of the mini-batch
+        """
+        predictions = self.predict(outputs).reshape(-1)
+        labels = labels.reshape(-1).long()
+        # The labels out of the classes are ignored as well
+        mask = self.get_mask(labels) & (labels >= 0) & (labels < self.num_classes) & (predictions < self.num_classes)
+        # The ignored entries are counted in an extra bin instead of being removed (no synchronisation with the device)
+        indices = torch.where(mask, labels * self.num_classes + predictions, self.num_classes ** 2)
+        matrix = torch.zeros(self.num_classes ** 2 + 1, dtype=torch.long, device=indices.device)
+        matrix.scatter_add_(0, indices, torch.ones_like(indices))
+        return matrix[:-1].reshape(self.num_classes, self.num_classes),
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the confusion matrix
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The confusion matrix of one or several mini-batches
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The confusion matrix
+        """
+        return statistics[0]
+
+
+class ClassScore(ConfusionMatrix):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A score computed for each class from the confusion matrix, then averaged over the classes
+    "macro" : the mean of the scores of the classes present in the labels or the predictions
+    "micro" : the score of the sums of the numerators and the denominators over the classes
+    "binary" : the score of the class 1
+    """
+
+    averages = ("macro", "micro", "binary")
+
+    def __init__(self, num_classes: int = 2, average: str = "macro", threshold: float = 0.5, ignore_index: int = None):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a ClassScore instance
+
+        PARAMETERS:
+        -----------
+
+        :param num_classes->int: The number of classes
+        :param average->str: How the scores of the classes are averaged ("macro", "micro" or "binary")
+        :param threshold->float: The probability above which a binary output is positive
+        :param ignore_index->int: A label not taken into account (None to take all the labels into account)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__(num_classes=num_classes, threshold=threshold, ignore_index=ignore_index)
+        if average not in self.averages:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_METRIC_AVERAGE_INVALID
+                         % (self.__class__.__name__, str(average), str(self.averages)))
+        self.average = average
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the score of each class from the confusion matrix and average them
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The confusion matrix of one or several mini-batches
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The averaged score (0 for the classes without instances)
+        """
+        matrix = statistics[0].to(torch.float64)
+        numerators, denominators = self.ratio(matrix.diagonal(), matrix.sum(dim=1), matrix.sum(dim=0))
+        if self.average == "binary":
+            return (numerators[1] / denominators[1].clamp(min=1)).float()
+        if self.average == "micro":
+            return (numerators.sum() / denominators.sum().clamp(min=1)).float()
+        # The mean is masked rather than indexed to keep the number of classes present on the device
+        present = (matrix.sum(dim=1) + matrix.sum(dim=0)) > 0
+        scores = numerators / denominators.clamp(min=1) * present
+        return (scores.sum() / present.sum().clamp(min=1)).float()
+
+    def ratio(self, true_positives: torch.Tensor, labelled: torch.Tensor, predicted: torch.Tensor) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the numerator and the denominator of the score of each class
+
+        PARAMETERS:
+        -----------
+
+        :param true_positives->torch.Tensor: The number of true positives of each class
+        :param labelled->torch.Tensor: The number of labels of each class
+        :param predicted->torch.Tensor: The number of predictions of each class
+
+        RETURN:
+        -------
+
+        :return numerators->torch.Tensor: The numerator of each class
+        :return denominators->torch.Tensor: The denominator of each class
+        """
+        raise NotImplementedError
+
+
+class Precision(ClassScore):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The proportion of the predictions of a class which are right
+    """
+
+    def ratio(self, true_positives: torch.Tensor, labelled: torch.Tensor, predicted: torch.Tensor) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Divide the true positives of each class by its predictions
+
+        PARAMETERS:
+        -----------
+
+        :param true_positives->torch.Tensor: The number of true positives of each class
+        :param labelled->torch.Tensor: The number of labels of each class (unused)
+        :param predicted->torch.Tensor: The number of predictions of each class
+
+        RETURN:
+        -------
+
+        :return numerators->torch.Tensor: The true positives
+        :return denominators->torch.Tensor: The predictions
+        """
+        return true_positives, predicted
+
+
+class Recall(ClassScore):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The proportion of the labels of a class which are predicted
+    """
+
+    def ratio(self, true_positives: torch.Tensor, labelled: torch.Tensor, predicted: torch.Tensor) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Divide the true positives of each class by its labels
+
+        PARAMETERS:
+        -----------
+
+        :param true_positives->torch.Tensor: The number of true positives of each class
+        :param labelled->torch.Tensor: The number of labels of each class
+        :param predicted->torch.Tensor: The number of predictions of each class (unused)
+
+        RETURN:
+        -------
+
+        :return numerators->torch.Tensor: The true positives
+        :return denominators->torch.Tensor: The labels
+        """
+        return true_positives, labelled
+
+
+class F1Score(ClassScore):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The harmonic mean of the precision and the recall of a class
+    """
+
+    def ratio(self, true_positives: torch.Tensor, labelled: torch.Tensor, predicted: torch.Tensor) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Divide twice the true positives of each class by the sum of its labels and its predictions
+        (the harmonic mean of the precision and the recall without computing them)
+
+        PARAMETERS:
+        -----------
+
+        :param true_positives->torch.Tensor: The number of true positives of each class
+        :param labelled->torch.Tensor: The number of labels of each class
+        :param predicted->torch.Tensor: The number of predictions of each class
+
+        RETURN:
+        -------
+
+        :return numerators->torch.Tensor: Twice the true positives
+        :return denominators->torch.Tensor: The labels and the predictions
+        """
+        return 2 * true_positives, labelled + predicted
@@ -1,6 +1,8 @@
 from typing import Union
 from torch.nn import Module
 
+from deeplodocus.utils.flags import *
+
 Num = Union[int, float]
 
 class GenericMetric(object):
@@ -42,6 +44,10 @@ class GenericMetric(object):
         self.name = name
         self.method = method
         self.arguments = []
+        self.call = None
+        self.update = None
+        self.schedule = DEEP_METRIC_SCHEDULE_BATCH
+        self.every = 1
 
     def get_name(self) -> str:
         """
@@ -116,6 +122,286 @@ class GenericMetric(object):
         return self.arguments
 
 
+    def get_schedule(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get when the GenericMetric is computed (the losses are computed on every mini-batch)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The DEEP_METRIC_SCHEDULE flag
+        """
+        return self.schedule
+
+    def is_scheduled(self, step_index: int) -> bool:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Check whether the GenericMetric is computed on the mini-batches of a training optimizer step
+
+        PARAMETERS:
+        -----------
+
+        :param step_index->int: The index of the optimizer step in the epoch (from 0)
+
+        RETURN:
+        -------
+
+        :return->bool: Whether the GenericMetric is computed
+        """
+        if self.schedule == DEEP_METRIC_SCHEDULE_BATCH:
+            return True
+        if self.schedule == DEEP_METRIC_SCHEDULE_EVERY_N:
+            return step_index % self.every == 0
+        return False
+
+    def set_arguments(self, arguments: list) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set the list of arguments required by the method and compile the call adapter
+        The adapter is a direct call of the method with the required entries, chosen once instead of at every batch
+
+        PARAMETERS:
+        -----------
+
+        :param arguments->list: The list of arguments (DEEP flags)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.arguments = arguments
+        self.call = self.__compile_call(self.get_method(), arguments)
+        if self.is_stateful() is True:
+            self.update = self.__compile_call(self.get_method().update, arguments)
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the GenericMetric to send to the processes of a distributed training
+        (the compiled call adapters are lambdas, they cannot be pickled)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the GenericMetric without the call adapters
+        """
+        state = self.__dict__.copy()
+        state["call"] = None
+        state["update"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Restore the state of the GenericMetric and compile its call adapters again
+
+        PARAMETERS:
+        -----------
+
+        :param state->dict: The state of the GenericMetric
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.__dict__.update(state)
+        if self.arguments:
+            self.set_arguments(self.arguments)
+
+    def is_stateful(self) -> bool:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Check whether the method follows the epoch metric protocol :
+        update() adds a mini-batch to a state and compute() computes the value of the state
+        (optionally reset() empties the state and synchronize() sums the states of the processes)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->bool: Whether the method can be updated with each mini-batch and computed once per epoch
+        """
+        method = self.get_method()
+        return callable(getattr(method, "update", None)) and callable(getattr(method, "compute", None))
+
+    def reset(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Empty the state of the method before the first mini-batch of an epoch
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if callable(getattr(self.get_method(), "reset", None)):
+            self.get_method().reset()
+
+    def synchronize(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Sum the states of the method over the processes before computing it
+        (without synchronize(), each process computes the value of its own mini-batches)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if callable(getattr(self.get_method(), "synchronize", None)):
+            self.get_method().synchronize()
+
+    def compute(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the value of the state of the method (the mini-batches given to update() since the last reset)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: The value of the metric
+        """
+        return self.get_method().compute()
+
+    @staticmethod
+    def __compile_call(method: callable, arguments: list) -> callable:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Create the function calling the method with the entries it requires
+        The outputs are always given, then the inputs, the labels and the additional data if required
+
+        PARAMETERS:
+        -----------
+
+        :param method->callable: The method to call
+        :param arguments->list: The list of arguments (DEEP flags)
+
+        RETURN:
+        -------
+
+        :return->callable: The function (inputs, outputs, labels, additional_data) -> result of the method
+        """
+        has_input = DEEP_ENTRY_INPUT in arguments
+        has_label = DEEP_ENTRY_LABEL in arguments
+        has_additional_data = DEEP_ENTRY_ADDITIONAL_DATA in arguments
+        if has_input:
+            if has_label:
+                if has_additional_data:
+                    return lambda inputs, outputs, labels, additional_data: method(inputs, outputs, labels, additional_data)
+                return lambda inputs, outputs, labels, additional_data: method(inputs, outputs, labels)
+            if has_additional_data:
+                return lambda inputs, outputs, labels, additional_data: method(inputs, outputs, additional_data)
+            return lambda inputs, outputs, labels, additional_data: method(inputs, outputs)
+        if has_label:
+            if has_additional_data:
+                return lambda inputs, outputs, labels, additional_data: method(outputs, labels, additional_data)
+            return lambda inputs, outputs, labels, additional_data: method(outputs, labels)
+        if has_additional_data:
+            return lambda inputs, outputs, labels, additional_data: method(outputs, additional_data)
+        return lambda inputs, outputs, labels, additional_data: method(outputs)
+
     @staticmethod
     def __check_method(method) -> callable:
         """
@@ -27,7 +27,7 @@ class Loss(GenericMetric):
 
     """
 
-    def __init__(self, name:str, loss: torch.nn.Module, weight: Num=1.0):
+    def __init__(self, name:str, loss: torch.nn.Module, weight: Num=1.0, autocast: bool=True):
         """
         AUTHORS:
         --------
@@ -47,6 +47,7 @@ class Loss(GenericMetric):
         :param name(str): The name of the loss function
         :param loss(torch.nn.Module): The loss callable
         :param weight(float): The weight of the loss in the total loss function
+        :param autocast(bool): Whether the loss can be computed in mixed precision (else always in float32)
 
         RETURN:
         -------
@@ -56,7 +57,8 @@ class Loss(GenericMetric):
         super().__init__(name=name, method=loss)
         self.is_custom = self.check_custom(loss)
         self.weight = weight
-        self.arguments = self.__check_arguments(loss.forward) # loss.forward will be called automatically, but keep loss as function to call
+        self.autocast = autocast
+        self.set_arguments(self.__check_arguments(loss.forward)) # loss.forward will be called automatically, but keep loss as function to call
 
     def check_custom(self, loss: torch.nn.Module):
         """
@@ -112,6 +114,31 @@ class Loss(GenericMetric):
         """
         return self.weight
 
+    def get_autocast(self)->bool:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get whether the loss function can be computed in mixed precision
+        A numerically sensitive loss function is computed in float32 even in a mixed precision training
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return(bool): self.autocast
+        """
+        return self.autocast
+
     @staticmethod
     def is_loss():
         """
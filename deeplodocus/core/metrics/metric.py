@@ -19,7 +19,11 @@ class Metric(GenericMetric):
     A class which contains any metric to be computed
 
     """
-    def __init__(self, name: str, method: Union[callable, Module]):
+    def __init__(self,
+                 name: str,
+                 method: Union[callable, Module],
+                 schedule: int = DEEP_METRIC_SCHEDULE_BATCH,
+                 every: int = 1):
         """
         AUTHORS:
         --------
@@ -36,6 +40,8 @@ class Metric(GenericMetric):
 
         :param name->str: The name of the metric
         :param method->Union[callable, torch.nn.Module]: The method to be computed
+        :param schedule->int: The DEEP_METRIC_SCHEDULE flag, when the metric is computed
+        :param every->int: The number of training optimizer steps between two computations (DEEP_METRIC_SCHEDULE_EVERY_N)
 
         RETURN:
         -------
@@ -44,7 +50,15 @@ class Metric(GenericMetric):
         """
         super().__init__(name=name, method=method)
         self.method = self.__check_method(method)
-        self.arguments = self.__check_arguments(method)
+        self.set_arguments(self.__check_arguments(method))
+        if schedule not in DEEP_METRIC_SCHEDULE_ALL:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_METRIC_SCHEDULE_INVALID % (name, str(schedule)))
+        if not isinstance(every, int) or every < 1:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_METRIC_EVERY_INVALID % (name, str(every)))
+        if not callable(method) and schedule != DEEP_METRIC_SCHEDULE_EPOCH:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_METRIC_EPOCH_ONLY % name)
+        self.schedule = schedule
+        self.every = every
 
     @staticmethod
     def __check_method(method: Union[callable, Module])->callable:
@@ -125,6 +139,9 @@ class Metric(GenericMetric):
 
         if isinstance(method, Module):
             arguments_list =  inspect.getfullargspec(method.forward)[0]
+        elif not callable(method) and callable(getattr(method, "update", None)):
+            # A metric with no call is only updated with each mini-batch
+            arguments_list = inspect.getfullargspec(method.update)[0]
         else:
             arguments_list = inspect.getfullargspec(method)[0]
 
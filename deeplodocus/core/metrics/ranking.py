@@ -0,0 +1,249 @@
+# Import back-end modules
+import torch
+import torch.nn.functional
+
+# Import Deeplodocus modules
+from deeplodocus.core.metrics.accumulating_metric import AccumulatingMetric
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class RankingMetric(AccumulatingMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A metric of the ranking of the instances by the score of each class, which cannot be averaged over mini-batches
+    The state is a fixed-size histogram of the scores of the positive and the negative instances of each class
+    (num_bins bins over [0, 1]) instead of all the outputs : the metric is exact up to the ties within a bin
+
+    The outputs are the scores (N,) of a binary problem or the scores (N, C) of each class,
+    the labels are either the classes (N,) or a binary label per class (N, C) for a multi-label problem
+    """
+
+    activations = (None, "sigmoid", "softmax")
+
+    def __init__(self, num_bins: int = 1000, activation: str = None):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize a RankingMetric instance
+
+        PARAMETERS:
+        -----------
+
+        :param num_bins->int: The number of bins of the histograms
+        :param activation->str: The function turning the outputs into scores in [0, 1] (None, "sigmoid" or "softmax")
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        super().__init__()
+        if activation not in self.activations:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_METRIC_ACTIVATION_INVALID
+                         % (self.__class__.__name__, str(activation), str(self.activations)))
+        self.num_bins = num_bins
+        self.activation = activation
+
+    def statistics(self, outputs, labels) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Turn the outputs into scores and count the positive and the negative instances of each class in each bin
+        The histograms are filled with a scatter on the device
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return positives->torch.Tensor: The histogram of the scores of the positive instances of each class (C, num_bins)
+        :return negatives->torch.Tensor: The histogram of the scores of the negative instances of each class (C, num_bins)
+        """
+        scores = outputs.float()
+        if scores.dim() == 1:
+            scores = scores.unsqueeze(1)
+        if self.activation == "sigmoid":
+            scores = scores.sigmoid()
+        elif self.activation == "softmax":
+            scores = scores.softmax(dim=1)
+        num_classes = scores.shape[1]
+        if labels.numel() == scores.numel():
+            targets = labels.reshape(scores.shape) > 0.5
+        else:
+            targets = torch.nn.functional.one_hot(labels.reshape(-1).long(), num_classes).bool()
+        # Index of the bin of each score in the flattened histograms of the classes
+        bins = (scores * self.num_bins).long().clamp(0, self.num_bins - 1)
+        indices = (bins + torch.arange(num_classes, device=bins.device) * self.num_bins).reshape(-1)
+        targets = targets.reshape(-1).long()
+        positives = torch.zeros(num_classes * self.num_bins, dtype=torch.long, device=indices.device)
+        negatives = torch.zeros_like(positives)
+        positives.scatter_add_(0, indices, targets)
+        negatives.scatter_add_(0, indices, 1 - targets)
+        return positives.reshape(num_classes, -1), negatives.reshape(num_classes, -1)
+
+    @staticmethod
+    def cumulate(statistics: tuple) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Count the positive and the negative instances above each threshold, from the highest scores to the lowest
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The histograms of the positive and the negative instances of each class
+
+        RETURN:
+        -------
+
+        :return positives->torch.Tensor: The positive instances of each bin (C, num_bins), highest scores first
+        :return true_positives->torch.Tensor: The positive instances above each threshold (C, num_bins)
+        :return false_positives->torch.Tensor: The negative instances above each threshold (C, num_bins)
+        """
+        positives, negatives = (histogram.flip(1).to(torch.float64) for histogram in statistics)
+        return positives, positives.cumsum(dim=1), negatives.cumsum(dim=1)
+
+    @staticmethod
+    def mean(scores: torch.Tensor, valid: torch.Tensor) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Average the scores of the classes for which the score is defined
+
+        PARAMETERS:
+        -----------
+
+        :param scores->torch.Tensor: The score of each class
+        :param valid->torch.Tensor: Whether the score of each class is defined
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The mean score
+        """
+        return ((scores * valid).sum() / valid.sum().clamp(min=1)).float()
+
+
+class AUC(RankingMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The area under the ROC curve of each class (one against the others), averaged over the classes
+    which have positive and negative instances
+    """
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the area under the ROC curve of each class with the trapezoidal rule and average the areas
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The histograms of the positive and the negative instances of each class
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The mean area (0 if no class has positive and negative instances)
+        """
+        _, true_positives, false_positives = self.cumulate(statistics)
+        num_positives, num_negatives = true_positives[:, -1:], false_positives[:, -1:]
+        # The curve starts from the origin, the area of the ties of a bin is a trapezoid
+        tpr = torch.nn.functional.pad(true_positives / num_positives.clamp(min=1), (1, 0))
+        fpr = torch.nn.functional.pad(false_positives / num_negatives.clamp(min=1), (1, 0))
+        areas = ((fpr[:, 1:] - fpr[:, :-1]) * (tpr[:, 1:] + tpr[:, :-1]) / 2).sum(dim=1)
+        return self.mean(areas, ((num_positives > 0) & (num_negatives > 0)).squeeze(1))
+
+
+class AveragePrecision(RankingMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The average precision of each class (the mean of the precisions at the score of each positive instance),
+    averaged over the classes which have positive instances (mAP)
+    """
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the mean of the precisions of each class weighted by its positive instances in each bin
+        and average them
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The histograms of the positive and the negative instances of each class
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The mean average precision (0 if no class has positive instances)
+        """
+        positives, true_positives, false_positives = self.cumulate(statistics)
+        num_positives = true_positives[:, -1]
+        precisions = true_positives / (true_positives + false_positives).clamp(min=1)
+        average_precisions = (precisions * positives).sum(dim=1) / num_positives.clamp(min=1)
+        return self.mean(average_precisions, num_positives > 0)
@@ -0,0 +1,172 @@
+# Import back-end modules
+import torch
+
+# Import Deeplodocus modules
+from deeplodocus.core.metrics.accumulating_metric import AccumulatingMetric
+
+
+class RegressionMetric(AccumulatingMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The mean of an error between the outputs and the labels over all their values
+    The errors are summed in float64 to accumulate many mini-batches without losing precision
+    """
+
+    def statistics(self, outputs, labels) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Sum the errors of the values of a mini-batch (the labels are reshaped as the outputs)
+
+        PARAMETERS:
+        -----------
+
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+
+        RETURN:
+        -------
+
+        :return total->torch.Tensor: The sum of the errors (float64)
+        :return count->torch.Tensor: The number of values
+        """
+        errors = self.error(outputs.float() - labels.reshape(outputs.shape).float())
+        return errors.sum(dtype=torch.float64), torch.as_tensor(errors.numel(), device=errors.device)
+
+    def value(self, statistics: tuple) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the mean error
+
+        PARAMETERS:
+        -----------
+
+        :param statistics->tuple: The sum of the errors and the number of values
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The mean error (float32)
+        """
+        total, count = statistics
+        return (total / count.clamp(min=1)).float()
+
+    def error(self, differences: torch.Tensor) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the error of each value
+
+        PARAMETERS:
+        -----------
+
+        :param differences->torch.Tensor: The differences between the outputs and the labels
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The errors
+        """
+        raise NotImplementedError
+
+
+class MeanAbsoluteError(RegressionMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The mean absolute error (MAE)
+    """
+
+    def error(self, differences: torch.Tensor) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the absolute error of each value
+
+        PARAMETERS:
+        -----------
+
+        :param differences->torch.Tensor: The differences between the outputs and the labels
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The absolute errors
+        """
+        return differences.abs()
+
+
+class MeanSquaredError(RegressionMetric):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The mean squared error (MSE)
+    """
+
+    def error(self, differences: torch.Tensor) -> torch.Tensor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the squared error of each value
+
+        PARAMETERS:
+        -----------
+
+        :param differences->torch.Tensor: The differences between the outputs and the labels
+
+        RETURN:
+        -------
+
+        :return->torch.Tensor: The squared errors
+        """
+        return differences.pow(2)
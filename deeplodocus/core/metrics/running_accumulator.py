@@ -0,0 +1,321 @@
+# Import back-end modules
+import torch
+
+# Import Deeplodocus modules
+from deeplodocus.utils.flags import *
+
+
+class RunningAccumulator(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Accumulate the losses and metrics of the mini-batches of an epoch
+    The sums stay tensors (no synchronisation per mini-batch) and each mini-batch is weighted by its number of instances
+    """
+
+    def __init__(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize an empty RunningAccumulator instance
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.sums = {}
+        self.count = 0
+
+    def reset(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Forget the accumulated values
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.sums = {}
+        self.count = 0
+
+    def update(self, values: dict, batch_size: int = 1) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Add the values of a mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param values->dict: The mean values (tensors or numbers) over the mini-batch
+        :param batch_size->int: The number of instances of the mini-batch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        for key, value in values.items():
+            if isinstance(value, torch.Tensor):
+                value = value.detach().to(torch.float64)
+            self.sums[key] = self.sums.get(key, 0) + value * batch_size
+        self.count += batch_size
+
+    def get_count(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of instances accumulated
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of instances accumulated
+        """
+        return self.count
+
+    def compute(self, as_tensors: bool = False) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the means over the instances accumulated
+        The tensors are converted to numbers all at once (a single synchronisation)
+
+        PARAMETERS:
+        -----------
+
+        :param as_tensors->bool: Whether the means are returned as float32 tensors instead of numbers
+
+        RETURN:
+        -------
+
+        :return->dict: The means of the values
+        """
+        count = max(self.count, 1)
+        if as_tensors is True:
+            return {key: torch.as_tensor(value / count, dtype=torch.float32) for key, value in self.sums.items()}
+        keys = [key for key, value in self.sums.items() if isinstance(value, torch.Tensor)]
+        means = {key: value / count for key, value in self.sums.items() if key not in keys}
+        if keys:
+            means.update(zip(keys, (torch.stack([self.sums[key] for key in keys]) / count).tolist()))
+        return means
+
+
+class PredictionAccumulator(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Keep the entries of the mini-batches of an epoch required by the metrics computed once per epoch
+    (detached from the graph, the entries no metric requires are not kept)
+    """
+
+    def __init__(self, metrics: dict):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize an empty PredictionAccumulator instance
+
+        PARAMETERS:
+        -----------
+
+        :param metrics->dict: The metrics computed once per epoch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        arguments = set(argument for metric in metrics.values() for argument in metric.get_arguments())
+        self.keep_inputs = DEEP_ENTRY_INPUT in arguments
+        self.keep_labels = DEEP_ENTRY_LABEL in arguments
+        self.keep_additional_data = DEEP_ENTRY_ADDITIONAL_DATA in arguments
+        self.inputs = []
+        self.outputs = []
+        self.labels = []
+        self.additional_data = []
+
+    def update(self, inputs, outputs, labels, additional_data) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Keep the entries of a mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param inputs: The inputs of the mini-batch
+        :param outputs: The outputs of the model
+        :param labels: The labels of the mini-batch
+        :param additional_data: The additional data of the mini-batch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.outputs.append(self.__detach(outputs))
+        if self.keep_inputs:
+            self.inputs.append(self.__detach(inputs))
+        if self.keep_labels:
+            self.labels.append(self.__detach(labels))
+        if self.keep_additional_data:
+            self.additional_data.append(self.__detach(additional_data))
+
+    def get(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the entries of the epoch, the mini-batches being concatenated (None for the entries not kept)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return inputs: The inputs of the epoch
+        :return outputs: The outputs of the epoch
+        :return labels: The labels of the epoch
+        :return additional_data: The additional data of the epoch
+        """
+        return tuple(self.__concatenate(batches) if batches else None
+                     for batches in (self.inputs, self.outputs, self.labels, self.additional_data))
+
+    def __detach(self, data):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Detach the tensors of an entry from the graph
+
+        PARAMETERS:
+        -----------
+
+        :param data: A tensor, a list of entries or any other data
+
+        RETURN:
+        -------
+
+        :return: The detached entry
+        """
+        if isinstance(data, torch.Tensor):
+            # No copy : the tensors are kept until the end of the epoch but they do not share memory with the next
+            # mini-batches (Collate.convert() returns tensors copied out of the SharedMemoryRing slots)
+            return data.detach()
+        if isinstance(data, (list, tuple)):
+            return [self.__detach(item) for item in data]
+        return data
+
+    def __concatenate(self, batches: list):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Concatenate an entry over the mini-batches (each item of a list of entries is concatenated separately)
+
+        PARAMETERS:
+        -----------
+
+        :param batches->list: The entry of each mini-batch
+
+        RETURN:
+        -------
+
+        :return: The entry of the epoch
+        """
+        if isinstance(batches[0], torch.Tensor):
+            return torch.cat(batches)
+        if isinstance(batches[0], list) and all(len(batch) == len(batches[0]) for batch in batches) \
+                and any(isinstance(item, (torch.Tensor, list)) for item in batches[0]):
+            return [self.__concatenate([batch[i] for batch in batches]) for i in range(len(batches[0]))]
+        return [item for batch in batches for item in batch]
@@ -0,0 +1,48 @@
+# Import back-end modules
+import torch
+
+# Import Deeplodocus modules
+from deeplodocus.core.metrics.classification import ClassScore
+
+
+class IoU(ClassScore):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    The intersection over union of the predictions and the labels of a class (Jaccard index)
+    The outputs of a segmentation are the scores of each class along the dimension 1 (N, C, H, W)
+    and the labels the class of each pixel (N, H, W), the pixels labelled ignore_index being ignored
+    """
+
+    def ratio(self, true_positives: torch.Tensor, labelled: torch.Tensor, predicted: torch.Tensor) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Divide the intersection of the predictions and the labels of each class by their union
+
+        PARAMETERS:
+        -----------
+
+        :param true_positives->torch.Tensor: The number of true positives of each class (the intersection)
+        :param labelled->torch.Tensor: The number of labels of each class
+        :param predicted->torch.Tensor: The number of predictions of each class
+
+        RETURN:
+        -------
+
+        :return numerators->torch.Tensor: The intersections
+        :return denominators->torch.Tensor: The unions
+        """
+        return true_positives, labelled + predicted - true_positives
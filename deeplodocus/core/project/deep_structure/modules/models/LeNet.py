@@ -16,7 +16,7 @@ class LeNet(nn.Module):
         self.fc2 = nn.Linear(50, 2)
 
     def forward(self, x):
-        x = x[0].type(torch.FloatTensor)
+        x = x[0].float()
 
         x = F.relu(F.max_pool2d(self.conv1(x), 2))
         x = F.relu(F.max_pool2d(self.conv2_drop(self.conv2(x)), 2))
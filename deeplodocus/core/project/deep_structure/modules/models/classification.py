@@ -18,7 +18,7 @@ class Net(nn.Module):
         self.flatten = Flatten()
 
     def forward(self, x, y):
-        x = x.type(torch.FloatTensor)
+        x = x.float()
 
         x = self.pool(F.relu(self.conv1(x)))
         x = self.pool(F.relu(self.conv2(x)))
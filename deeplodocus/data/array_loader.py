@@ -0,0 +1,232 @@
+import os
+import struct
+import zipfile
+from collections import OrderedDict
+import numpy as np
+
+from deeplodocus.utils.flags import *
+from deeplodocus.utils.notification import Notification
+
+
+class ArrayLoader(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Load the numpy array entries : a .npy file or a member of a .npz archive (archive.npz:member)
+
+    With memory mapping, only the pages of an array actually used are read from the disk.
+    The arrays are mapped copy-on-write (an in-place change stays in the process and is never written).
+    The members of a .npz archive stored without compression are mapped directly in the archive,
+    the compressed members are read.
+    Each process (e.g. each DataLoader worker) keeps its most recently used maps open
+    """
+
+    def __init__(self, mmap: bool = True, cache_size: int = DEEP_ARRAY_CACHE_SIZE):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the ArrayLoader
+
+        PARAMETERS:
+        -----------
+
+        :param mmap->bool: Whether to map the arrays into memory instead of reading them
+        :param cache_size->int: The number of maps kept open by each process
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.mmap = mmap
+        self.cache_size = cache_size
+        self.arrays = OrderedDict()
+        self.pid = None
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the ArrayLoader without the maps (see Dataset.__getstate__)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the ArrayLoader without the maps
+        """
+        state = self.__dict__.copy()
+        state["arrays"] = OrderedDict()
+        state["pid"] = None
+        return state
+
+    def load(self, data: str) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load a numpy array
+
+        PARAMETERS:
+        -----------
+
+        :param data->str: The path of a .npy file or archive.npz:member (first member if not given)
+
+        RETURN:
+        -------
+
+        :return->np.array: The array
+        """
+        path, member = self.split(data)
+        if self.mmap is False:
+            return self.__read(path, member)
+        # The maps inherited through a fork are not reused
+        if self.pid != os.getpid():
+            self.arrays = OrderedDict()
+            self.pid = os.getpid()
+        array = self.arrays.get(data)
+        if array is not None:
+            self.arrays.move_to_end(data)
+            return array
+        array = self.__map(path, member)
+        if isinstance(array, np.memmap):
+            self.arrays[data] = array
+            if len(self.arrays) > self.cache_size:
+                self.arrays.popitem(last=False)
+        return array
+
+    @staticmethod
+    def split(data: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Split a numpy array entry into the path of the file and the member of the archive
+
+        PARAMETERS:
+        -----------
+
+        :param data->str: The entry
+
+        RETURN:
+        -------
+
+        :return path->str: The path of the .npy or .npz file
+        :return member->str: The member of the .npz archive (None if not given)
+        """
+        position = data.rfind(DEEP_EXT_NPZ + DEEP_NPZ_MEMBER_SEPARATOR)
+        if position < 0:
+            return data, None
+        return data[:position + len(DEEP_EXT_NPZ)], data[position + len(DEEP_EXT_NPZ) + len(DEEP_NPZ_MEMBER_SEPARATOR):]
+
+    @staticmethod
+    def __read(path: str, member: str) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Read a whole array into memory
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the .npy or .npz file
+        :param member->str: The member of the .npz archive
+
+        RETURN:
+        -------
+
+        :return->np.array: The array
+        """
+        if not path.endswith(DEEP_EXT_NPZ):
+            return np.load(path)
+        with np.load(path) as archive:
+            return archive[archive.files[0] if member is None else member]
+
+    def __map(self, path: str, member: str) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Map an array into memory (read it if it cannot be mapped)
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the .npy or .npz file
+        :param member->str: The member of the .npz archive
+
+        RETURN:
+        -------
+
+        :return->np.array: The array
+        """
+        if not path.endswith(DEEP_EXT_NPZ):
+            return np.load(path, mmap_mode="c")
+        with zipfile.ZipFile(path) as archive:
+            name = archive.namelist()[0] if member is None else member + DEEP_EXT_NPY
+            info = archive.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return self.__read(path, member)
+        with open(path, "rb") as f:
+            # The member data starts after its local header (30 bytes, then the name and the extra field)
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            elif version == (3, 0):
+                # No public reader of the version 3.0 header (UTF-8 field names) : numpy reads the member
+                return self.__read(path, member)
+            else:
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_NPY_VERSION % (name, path, str(version)))
+            offset = f.tell()
+        if dtype.hasobject:
+            return self.__read(path, member)
+        return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape,
+                         order="F" if fortran_order else "C")
@@ -0,0 +1,237 @@
+import numpy as np
+import torch
+from torch.utils.data.dataloader import default_collate
+
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class Collate(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Collate the instances of a Dataset into mini-batches and convert the images to the required dtype
+
+    The Dataset returns the images in their native dtype (e.g. uint8).
+    Calling the Collate instance (in the DataLoader workers) only stacks the instances,
+    so the mini-batches are sent to the main process in the native dtype.
+    The conversion is then done once on the batched tensors with Collate.convert
+
+    If a SharedMemoryRing is set, the workers write the mini-batches into the ring and only send SlotHandles,
+    Collate.convert then reads the mini-batches from the ring before converting them :
+    the images are copied out of the ring by their conversion, the other entries are copied by the ring
+    (the mini-batches returned never share memory with the ring)
+    """
+
+    def __init__(self, data_types: dict, sequence_types: dict, dtype: str = DEEP_DTYPE_FLOAT32):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the Collate instance
+
+        PARAMETERS:
+        -----------
+
+        :param data_types->dict: The DEEP_TYPE flag of each entry of the Dataset
+        :param sequence_types->dict: The DEEP_TYPE flag of the items of each sequence entry of the Dataset
+        :param dtype->str: The DEEP_DTYPE flag of the images in the mini-batches
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if dtype not in DEEP_DTYPE_TORCH:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_DTYPE_NOT_HANDLED % (dtype, list(DEEP_DTYPE_TORCH.keys())))
+        self.dtype = DEEP_DTYPE_TORCH[dtype]
+        self.image_entries = self.__get_image_entries(data_types, sequence_types)
+        self.ring = None
+
+    def set_ring(self, ring) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set the SharedMemoryRing used to send the mini-batches to the main process
+        The instances are then expected as (slot, instance) pairs (see SlotDataset)
+
+        PARAMETERS:
+        -----------
+
+        :param ring->SharedMemoryRing: The ring of shared buffers
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.ring = ring
+
+    def __call__(self, batch: list) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Stack the instances into a mini-batch
+        If the random transforms changed the dtype of some images, the images of the entry are aligned beforehand
+
+        PARAMETERS:
+        -----------
+
+        :param batch->list: The list of instances (inputs, labels, additional_data)
+
+        RETURN:
+        -------
+
+        :return->list: The mini-batch
+        """
+        slot = None
+        if self.ring is not None:
+            slot = batch[0][0]
+            batch = [instance for _, instance in batch]
+        stacked = {}
+        for position, entry_nums in self.image_entries.items():
+            for entry_num in entry_nums:
+                images = [instance[position][entry_num] for instance in batch]
+                if not isinstance(images[0], np.ndarray):
+                    continue
+                if len({image.dtype for image in images}) > 1:
+                    dtype = np.result_type(*images)
+                    images = [image.astype(dtype) for image in images]
+                    for instance, image in zip(batch, images):
+                        instance[position][entry_num] = image
+                # The read-only images (views on a TensorCache) are stacked here, PyTorch does not wrap them into tensors
+                # (the ring stacks them directly into its buffers)
+                if slot is None and not all(image.flags.writeable for image in images):
+                    stacked[(position, entry_num)] = torch.from_numpy(np.stack(images))
+                    for instance in batch:
+                        instance[position][entry_num] = 0
+        if slot is not None:
+            return self.ring.write(slot, batch)
+        minibatch = default_collate(batch)
+        for (position, entry_num), images in stacked.items():
+            minibatch[position][entry_num] = images
+        return minibatch
+
+    def convert(self, minibatch: list) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Convert the images of a mini-batch to the required dtype (once, on the batched tensors)
+
+        PARAMETERS:
+        -----------
+
+        :param minibatch->list: The mini-batch (inputs, labels, additional_data)
+
+        RETURN:
+        -------
+
+        :return->list: The converted mini-batch
+        """
+        borrowed = ()
+        if self.ring is not None:
+            borrowed = tuple((position, entry_num)
+                             for position, entry_nums in self.image_entries.items() for entry_num in entry_nums)
+            minibatch = self.ring.read(minibatch, borrowed=borrowed)
+        for position, entry_nums in self.image_entries.items():
+            for entry_num in entry_nums:
+                minibatch[position][entry_num] = self.__convert(minibatch[position][entry_num], copy=bool(borrowed))
+        return minibatch
+
+    def __convert(self, data, copy: bool = False):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Convert a batched tensor (or a list of batched tensors for the sequences)
+
+        PARAMETERS:
+        -----------
+
+        :param data: The batched tensor or list of batched tensors
+        :param copy->bool: Whether the tensors are copied even if they already have the required dtype
+
+        RETURN:
+        -------
+
+        :return: The converted data
+        """
+        if isinstance(data, torch.Tensor):
+            return data.to(self.dtype, copy=copy)
+        elif isinstance(data, list):
+            return [self.__convert(d, copy=copy) for d in data]
+        else:
+            return data
+
+    @staticmethod
+    def __get_image_entries(data_types: dict, sequence_types: dict) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the entries containing images (or sequences of images)
+
+        PARAMETERS:
+        -----------
+
+        :param data_types->dict: The DEEP_TYPE flag of each entry of the Dataset
+        :param sequence_types->dict: The DEEP_TYPE flag of the items of each sequence entry of the Dataset
+
+        RETURN:
+        -------
+
+        :return->dict: The numbers of the image entries for each position in the instances
+        """
+        image_entries = {}
+        if data_types is None:
+            return image_entries
+        # The instances are (inputs, labels, additional_data) tuples
+        for position, entry_type in enumerate((DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA)):
+            entry_nums = []
+            for entry_num, data_type in enumerate(data_types[entry_type]):
+                if data_type == DEEP_TYPE_SEQUENCE:
+                    data_type = sequence_types[entry_type][entry_num]
+                if data_type == DEEP_TYPE_IMAGE:
+                    entry_nums.append(entry_num)
+            if entry_nums:
+                image_entries[position] = entry_nums
+        return image_entries
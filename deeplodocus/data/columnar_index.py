@@ -0,0 +1,347 @@
+import numpy as np
+import pandas as pd
+
+from deeplodocus.data.text_column import TextColumn
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class ColumnarIndex(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A compact columnar index of the raw data given to a Dataset
+
+    Each entry (input1, input2, label1, ...) is stored as its own column.
+    A column is a contiguous NumPy array of UTF-8 encoded strings so that :
+        - Getting a row is a plain array access (no pandas Series construction)
+        - The memory footprint is one byte per character instead of one Python object per cell
+        - The index is sent to the DataLoader workers as a few buffers instead of millions of objects
+
+    A column can also be given as a TextColumn : its lines stay on disk and only their byte offsets are kept in memory.
+    The permutations of the index do not move the lines of a TextColumn, they are read through the original row ids
+    """
+
+    def __init__(self, inputs: list, labels: list, additional_data: list):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the ColumnarIndex
+
+        PARAMETERS:
+        -----------
+
+        :param inputs->list: The list of input columns (one list of raw data or TextColumn per entry)
+        :param labels->list: The list of label columns (one list of raw data or TextColumn per entry)
+        :param additional_data->list: The list of additional data columns (one list of raw data or TextColumn per entry)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.columns = {DEEP_ENTRY_INPUT: [self.__to_column(c) for c in inputs],
+                        DEEP_ENTRY_LABEL: [self.__to_column(c) for c in labels],
+                        DEEP_ENTRY_ADDITIONAL_DATA: [self.__to_column(c) for c in additional_data]}
+        self.length = self.__check_length()
+        # Original position of each row (kept through the permutations)
+        self.rows = np.arange(self.length, dtype=np.int64)
+
+    def __len__(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of rows in the index
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of rows
+        """
+        return self.length
+
+    def get(self, index: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the raw data of a row
+
+        PARAMETERS:
+        -----------
+
+        :param index->int: The index of the row
+
+        RETURN:
+        -------
+
+        :return inputs->list: The raw inputs of the row
+        :return labels->list: The raw labels of the row
+        :return additional_data->list: The raw additional data of the row
+        """
+        return (self.get_entries(DEEP_ENTRY_INPUT, index),
+                self.get_entries(DEEP_ENTRY_LABEL, index),
+                self.get_entries(DEEP_ENTRY_ADDITIONAL_DATA, index))
+
+    def get_entries(self, entry_type: int, index: int) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the raw data of one type of entry (inputs, labels or additional data) for a row
+
+        PARAMETERS:
+        -----------
+
+        :param entry_type->int: The DEEP_ENTRY flag of the entries
+        :param index->int: The index of the row
+
+        RETURN:
+        -------
+
+        :return->list: The raw data of each entry of the row
+        """
+        entries = []
+        for column in self.columns[entry_type]:
+            if isinstance(column, TextColumn):
+                value = column[int(self.rows[index])]
+            else:
+                value = column[index].item()
+            # Text columns are stored encoded, numeric columns are returned as Python numbers
+            entries.append(value.decode(DEEP_ENCODE_UTF8) if isinstance(value, bytes) else value)
+        return entries
+
+    def get_row_id(self, index: int) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the original position of a row (its position before any permutation)
+
+        PARAMETERS:
+        -----------
+
+        :param index->int: The current index of the row
+
+        RETURN:
+        -------
+
+        :return->int: The original position of the row
+        """
+        return int(self.rows[index])
+
+    def get_column(self, entry_type: int, entry_num: int) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the whole column of an entry
+
+        PARAMETERS:
+        -----------
+
+        :param entry_type->int: The DEEP_ENTRY flag of the entry
+        :param entry_num->int: The number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return->np.array: The column
+        """
+        return self.columns[entry_type][entry_num]
+
+    def convert_column(self, entry_type: int, entry_num: int, dtype) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Convert a text column into a numeric column once and for all (a TextColumn is then loaded in memory)
+        Raise a ValueError if a value of the column cannot be converted (an OverflowError if an integer does not fit the data type)
+
+        PARAMETERS:
+        -----------
+
+        :param entry_type->int: The DEEP_ENTRY flag of the entry
+        :param entry_num->int: The number of the entry (input1, input2, ...)
+        :param dtype: The NumPy data type of the converted column
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        column = self.columns[entry_type][entry_num]
+        if isinstance(column, TextColumn):
+            # The numeric column follows the current order of the rows
+            self.columns[entry_type][entry_num] = column.to_array(dtype)[self.rows]
+        else:
+            self.columns[entry_type][entry_num] = column.astype(dtype)
+
+    def permute(self, permutation) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Reorder all the columns with the same permutation
+
+        PARAMETERS:
+        -----------
+
+        :param permutation->np.array: The new order of the rows
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        for entry_type, columns in self.columns.items():
+            self.columns[entry_type] = [column if isinstance(column, TextColumn) else column[permutation] for column in columns]
+        self.rows = self.rows[permutation]
+
+    def to_frame(self, max_rows: int = 10) -> pd.DataFrame:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Format the first and last rows of the index into a pandas DataFrame (for display only)
+
+        PARAMETERS:
+        -----------
+
+        :param max_rows->int: The maximum number of rows to format
+
+        RETURN:
+        -------
+
+        :return->pd.DataFrame: The formatted rows
+        """
+        if self.length <= max_rows:
+            rows = list(range(self.length))
+        else:
+            rows = list(range(max_rows // 2)) + list(range(self.length - max_rows // 2, self.length))
+        d = {}
+        for key, entry_type in (("inputs", DEEP_ENTRY_INPUT),
+                                ("labels", DEEP_ENTRY_LABEL),
+                                ("additional_data", DEEP_ENTRY_ADDITIONAL_DATA)):
+            if self.columns[entry_type]:
+                d[key] = [self.get_entries(entry_type, i) for i in rows]
+        return pd.DataFrame(d, index=rows)
+
+    @staticmethod
+    def __to_column(content: list) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Convert the content of an entry into a compact column
+
+        PARAMETERS:
+        -----------
+
+        :param content->list: The raw data of the entry (or a TextColumn, kept as it is)
+
+        RETURN:
+        -------
+
+        :return->np.array: The column of UTF-8 encoded strings
+        """
+        if isinstance(content, TextColumn):
+            return content
+        return np.array([str(item).encode(DEEP_ENCODE_UTF8) for item in content], dtype=np.bytes_)
+
+    def __check_length(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Check that all the columns have the same number of instances
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of rows in the index
+        """
+        lengths = {}
+        for name, entry_type in (("Inputs", DEEP_ENTRY_INPUT),
+                                 ("Labels", DEEP_ENTRY_LABEL),
+                                 ("Additional data", DEEP_ENTRY_ADDITIONAL_DATA)):
+            for i, column in enumerate(self.columns[entry_type]):
+                lengths["%s %i" % (name, i)] = len(column)
+        if len(set(lengths.values())) > 1:
+            text = "All your entries do not have the same number of instances : \n"
+            text += "\n".join(["%s : %i" % (key, value) for key, value in lengths.items()])
+            Notification(DEEP_NOTIF_FATAL, text)
+        return len(self.columns[DEEP_ENTRY_INPUT][0]) if self.columns[DEEP_ENTRY_INPUT] else 0
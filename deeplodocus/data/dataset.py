@@ -1,13 +1,18 @@
-import pandas as pd
 import numpy as np
 import mimetypes
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from deeplodocus.utils.generic_utils import sorted_nicely
 from deeplodocus.utils.generic_utils import get_int_or_float
 from deeplodocus.utils.generic_utils import is_np_array
 from deeplodocus.utils.notification import Notification
-from deeplodocus.utils.errors import error_entry_array_size
+from deeplodocus.data.columnar_index import ColumnarIndex
+from deeplodocus.data.tensor_cache import TensorCache
+from deeplodocus.data.file_scanner import FileScanner
+from deeplodocus.data.text_column import TextColumn
+from deeplodocus.data.sample_cache import SampleCache
+from deeplodocus.data.sample_cache import SharedSampleCache
+from deeplodocus.data.array_loader import ArrayLoader
 from deeplodocus.utils.flags import *
 
 
@@ -44,6 +49,15 @@ class Dataset(object):
                  use_raw_data=True,
                  transform_manager=None,
                  cv_library=DEEP_LIB_OPENCV,
+                 materialize=False,
+                 cache_dir=DEEP_PATH_CACHE,
+                 lazy_text=False,
+                 sample_cache_size=0,
+                 sample_cache_shared=False,
+                 video=None,
+                 np_mmap=True,
+                 sequence_threads=DEEP_SEQUENCE_NUM_THREADS,
+                 record_shapes=False,
                  name="Default"):
         """
         AUTHORS:
@@ -66,6 +80,15 @@ class Dataset(object):
         :param use_raw_data: Boolean : Whether to feed the network with raw data or always apply transforms on it
         :param transform_manager: A transform object
         :param cv_library: The computer vision library to be used for opening and modifying the images data
+        :param materialize: Boolean : Whether to cache the decoded images (mandatory transforms applied) in a memory-mapped file
+        :param cache_dir: The directory of the materialized datasets and of the cached lists of files (None to scan the directories without caching their lists)
+        :param lazy_text: Boolean : Whether to keep the lines of the list files on disk (only their byte offsets are indexed)
+        :param sample_cache_size: Integer : The byte budget of the cache of decoded raw samples (0 to disable the cache)
+        :param sample_cache_shared: Boolean : Whether the cache of decoded samples is in shared memory (one cache for all the workers)
+        :param video: Dictionary : The frames decoded from the videos (start, stop, stride, clip_length), all the frames if None
+        :param np_mmap: Boolean : Whether to map the numpy arrays into memory instead of reading them
+        :param sequence_threads: Integer : The number of threads decoding the images of a sequence (in each process)
+        :param record_shapes: Boolean : Whether to record the shape of the first input of each instance at load (to group the instances by shape)
         :param name: Name of the dataset
         """
         self.list_inputs = self.__check_null_entry(list_inputs)
@@ -73,8 +96,32 @@ class Dataset(object):
         self.list_additional_data = self.__check_null_entry(list_additional_data)
         self.list_data = list_inputs + list_labels + list_additional_data
         self.transform_manager = transform_manager
+        self.file_scanner = FileScanner(cache_dir=cache_dir)
         self.number_raw_instances = self.__compute_number_raw_instances()
         self.data = None
+        self.data_types = None
+        self.sequence_types = None
+        self.materialize = materialize
+        self.cache_dir = cache_dir
+        self.lazy_text = lazy_text
+        self.tensor_cache = None
+        self.cached_columns = {}
+        self.raw_cached_columns = set()
+        self.sample_cache_size = sample_cache_size
+        self.sample_cache_shared = sample_cache_shared
+        self.sample_cache = None
+        self.sample_cache_columns = {}
+        self.array_loader = ArrayLoader(mmap=np_mmap)
+        self.sequence_threads = sequence_threads
+        self.thread_pool = None
+        self.thread_pool_pid = None
+        self.record_shapes = record_shapes
+        self.shapes = None
+        self.buckets = None
+        self.video = {"start": 0, "stop": None, "stride": 1, "clip_length": None}
+        if video is not None:
+            self.video.update({key: value for key, value in video.items() if value is not None})
+        self.loaders = self.__get_loaders()
         self.use_raw_data = use_raw_data
         self.len_data = None
         self.name = name
@@ -108,9 +155,6 @@ class Dataset(object):
 
         :return : Loaded and possibly transformed instance to be given to the training
         """
-        inputs = []
-        labels = []
-        additional_data = []
         # Index of the raw data is used only to get the path to original data.
         # Real index is used for data transformation
         index_raw_data = index % self.number_raw_instances
@@ -122,53 +166,82 @@ class Dataset(object):
             augment = not self.use_raw_data
         if index >= self.len_data:
             Notification(DEEP_NOTIF_FATAL, "The given instance index is too high : " + str(index))
-        # Extract lists of raw data from the pandas DataFrame for the select index
-        if not self.list_labels:
-            if not self.list_additional_data:
-                inputs = self.data.iloc[index_raw_data]
-                # Keep key == 0 else the data frame  also returns the name of the column
-                # issue only on single column data frame
-                inputs = self.__load_data(data=inputs[0],
-                                          augment=augment,
-                                          index=index,
-                                          entry_type=DEEP_ENTRY_INPUT)
-            else:
-                inputs, additional_data = self.data.iloc[index_raw_data]
-                inputs = self.__load_data(data=inputs,
-                                          augment=augment,
-                                          index=index,
-                                          entry_type=DEEP_ENTRY_INPUT)
-                additional_data = self.__load_data(data=additional_data,
-                                                   augment=augment,
-                                                   index=index,
-                                                   entry_type=DEEP_ENTRY_ADDITIONAL_DATA)
-        else:
-            if not self.list_additional_data:
-                inputs, labels = self.data.iloc[index_raw_data]
-                inputs = self.__load_data(data=inputs,
-                                          augment=augment,
-                                          index=index,
-                                          entry_type=DEEP_ENTRY_INPUT)
-                labels = self.__load_data(data=labels,
-                                          augment=augment,
-                                          index=index,
-                                          entry_type=DEEP_ENTRY_LABEL)
-            else:
-                inputs, labels, additional_data = self.data.iloc[index_raw_data]
-                inputs = self.__load_data(data=inputs,
-                                          augment=augment,
-                                          index=index,
-                                          entry_type=DEEP_ENTRY_INPUT)
-                labels = self.__load_data(data=labels,
-                                          augment=augment,
-                                          index=index,
-                                          entry_type=DEEP_ENTRY_LABEL)
-                additional_data = self.__load_data(data=additional_data,
-                                                   augment=augment,
-                                                   index=index,
-                                                   entry_type=DEEP_ENTRY_ADDITIONAL_DATA)
+        # Extract lists of raw data from the columnar index for the select index
+        inputs, labels, additional_data = self.data.get(index_raw_data)
+        # Load the data (an empty entry remains an empty list)
+        inputs = self.__load_data(data=inputs,
+                                  augment=augment,
+                                  index=index,
+                                  entry_type=DEEP_ENTRY_INPUT,
+                                  data_types=self.data_types[DEEP_ENTRY_INPUT])
+        labels = self.__load_data(data=labels,
+                                  augment=augment,
+                                  index=index,
+                                  entry_type=DEEP_ENTRY_LABEL,
+                                  data_types=self.data_types[DEEP_ENTRY_LABEL])
+        additional_data = self.__load_data(data=additional_data,
+                                           augment=augment,
+                                           index=index,
+                                           entry_type=DEEP_ENTRY_ADDITIONAL_DATA,
+                                           data_types=self.data_types[DEEP_ENTRY_ADDITIONAL_DATA])
         return inputs, labels, additional_data
 
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the dataset to send to the DataLoader workers (the private loaders and the threads cannot be pickled)
+        The open files of its members (the file handles of the TextColumns, the maps of the ArrayLoader and the TensorCache)
+        are not pickled either : they are reopened by each worker on first use, as the ones inherited through a fork
+        would share their state with the parent process
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the dataset without the loaders and the thread pool
+        """
+        state = self.__dict__.copy()
+        del state["loaders"]
+        state["thread_pool"] = None
+        state["thread_pool_pid"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Restore the state of the dataset in a DataLoader worker
+
+        PARAMETERS:
+        -----------
+
+        :param state->dict: The state of the dataset
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.__dict__.update(state)
+        self.loaders = self.__get_loaders()
+
     def __len__(self) -> int:
         """
         AUTHORS:
@@ -228,7 +301,14 @@ class Dataset(object):
 
         """
 
-        Notification(DEEP_NOTIF_INFO, DEEP_MSG_DATA_SUMMARY % (self.name, self.data))
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_DATA_SUMMARY % (self.name, self.data.to_frame()))
+        if self.sample_cache is not None:
+            hits, misses, nbytes = self.sample_cache.get_statistics()
+            Notification(DEEP_NOTIF_INFO, DEEP_MSG_SAMPLE_CACHE_SUMMARY % (self.name,
+                                                                         hits,
+                                                                         misses,
+                                                                         100 * hits / max(1, hits + misses),
+                                                                         nbytes / 1e6))
 
     def set_cv_library(self, cv_library):
         """
@@ -280,23 +360,23 @@ class Dataset(object):
         labels = self.__read_data(self.list_labels)
         additional_data = self.__read_data(self.list_additional_data)
 
-        # Create a dictionary containing inputs, labels and additional data
-        if not labels:
-            if not additional_data:
-                d = {'inputs': inputs}
-            else:
-                d = {'inputs': inputs, '_additional_data': additional_data}
-        else:
-            if not additional_data:
-                d = {'inputs': inputs, 'labels': labels}
-            else:
-                d = {'inputs': inputs, 'labels': labels, 'additional_data': additional_data}
-        # Convert the dictionary of data into a panda DataFrame
-        try:
-            self.data = pd.DataFrame(d)
-        except ValueError as e:
-            error_entry_array_size(d, e)
-        # Update the number of instances in the DataFrame
+        # Build the columnar index (one compact column per entry)
+        self.data = ColumnarIndex(inputs=inputs,
+                                  labels=labels,
+                                  additional_data=additional_data)
+        # Resolve the type of each column once and for all
+        self.__resolve_data_types()
+        self.__check_data_type()
+        # Decode the images once and for all
+        if self.materialize is True:
+            self.__materialize()
+        # Keep the decoded raw samples in memory (before the random transforms)
+        if self.sample_cache_size > 0:
+            self.__create_sample_cache()
+        # Group the instances by shape
+        if self.record_shapes is True:
+            self.__record_shapes()
+        # Update the number of instances in the index
         self.len_data = self.__len__()
         # Notice the user that the Dataset has been loaded
         Notification(DEEP_NOTIF_SUCCESS, DEEP_MSG_DATA_LOADED % self.name)
@@ -311,7 +391,7 @@ class Dataset(object):
         DESCRIPTION:
         ------------
 
-        Shuffle the dataframe containing the data
+        Shuffle the columnar index containing the data
 
         PARAMETERS:
         -----------
@@ -324,11 +404,10 @@ class Dataset(object):
         """
 
         if method == DEEP_SHUFFLE_ALL:
-            try:
-                self.data = self.data.sample(frac=1).reset_index(drop=True)
-            # TODO: Please can this except a specific error(s)
-            except:
-                Notification(DEEP_NOTIF_ERROR, "Cannot shuffle the dataset")
+            permutation = np.random.permutation(len(self.data))
+            self.data.permute(permutation)
+            if self.buckets is not None:
+                self.buckets = self.buckets[permutation]
         else:
             Notification(DEEP_NOTIF_ERROR, "The shuffling method does not exist.")
 
@@ -422,13 +501,20 @@ class Dataset(object):
         RETURN:
         -------
 
-        :return final_data: The content of the files and folder given as input. The list is formatted to fit a pandas Dataframe columns
+        :return data: The content of the files and folder given as input. One list of raw data (or TextColumn) per entry (column)
         """
         data = []
         # For all the files/folder given as input
         for i, f_data in enumerate(list_f_data):
             content = []
 
+            # Index the lines of the list files instead of reading them (folders are always listed)
+            if self.lazy_text is True:
+                sources = f_data if type(f_data) is list else [f_data]
+                if all(self.__source_path_type(f) == DEEP_TYPE_FILE for f in sources):
+                    data.append(TextColumn(sources))
+                    continue
+
             # If the input given is a list of inputs to extend
             if type(f_data) is list:
 
@@ -440,19 +526,7 @@ class Dataset(object):
             else:
                 content = self.__get_content(f_data)
                 data.append(content)  # Add the new content to the list of data
-        # Format the data to the format accepted by deeplodocus where final_data[i][j] = data[j][i]
-        final_data = []
-        if len(data) > 0:
-            for i in range(len(data[0])):
-                temp_data = []
-                for j in range(len(data)):
-                    try:
-                        temp_data.append(data[j][i])
-                    except IndexError as e:
-                        # TODO : Have a more explicit notification
-                        Notification(DEEP_NOTIF_FATAL, "All your entries do not have the same number of instances : " + str(e))
-                final_data.append(temp_data)
-        return final_data
+        return data
 
     def __get_content(self, f):
         """
@@ -516,19 +590,39 @@ class Dataset(object):
         :return list of str: list of paths to every file within the given directories
 
         """
-        paths = []
-        # For each item in the directory
-        for item in os.listdir(directory):
-            sub_path = "%s/%s" % (directory, item)
-            # If the subpath of the item is a directory we apply the self function recursively
-            if os.path.isdir(sub_path):
-                paths.extend(self.__get_file_paths(sub_path))
-            # Else we add the path of the file to the list of files
-            else:
-                paths.extend([sub_path])
-        return sorted_nicely(paths)
+        # The directories are scanned in parallel and the sorted list is cached until a directory changes
+        return self.file_scanner.scan(directory)
 
-    def __load_data(self, data, augment, index, entry_type, entry_num=None):
+    def __get_loaders(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the loader of each type of data
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The loader of each DEEP_TYPE flag
+        """
+        return {DEEP_TYPE_SEQUENCE: self.__load_sequence_data,
+                DEEP_TYPE_IMAGE: self.__load_image_data,
+                DEEP_TYPE_VIDEO: self.__load_video_data,
+                DEEP_TYPE_INTEGER: self.__load_integer_data,
+                DEEP_TYPE_FLOAT: self.__load_float_data,
+                DEEP_TYPE_NP_ARRAY: self.__load_np_array_data}
+
+    def __load_data(self, data, augment, index, entry_type, data_types, entry_num=None):
         """
         AUTHORS:
         --------
@@ -539,6 +633,7 @@ class Dataset(object):
         ------------
 
         Load (and transform is needed) the requested data
+        The type of each entry has been resolved once in load(), the data are directly given to the right loader
 
         PARAMETERS:
         -----------
@@ -547,6 +642,7 @@ class Dataset(object):
         :param augment: Whether to augment or not the requested data
         :param index: The index of the data
         :param entry_type: Whether it in an input, a label or an additional_data
+        :param data_types: The DEEP_TYPE flag of each data in the list
         :param entry_num: Number of the entry (input1, input2, ...) (useful for sequences)
 
         RETURN:
@@ -557,67 +653,340 @@ class Dataset(object):
         loaded_data = []
         for i, d in enumerate(data):            # For each data given in the list (list = one instance of each file)
             if d is not None:
-                type_data = self.__data_type(d)
-                # TODO : Check how sequence behaves
-                # If data is a sequence we use the function in a recursive fashion
-                if type_data == DEEP_TYPE_SEQUENCE:
-                    if entry_num is None:
-                        entry_num = i
-                    sequence_raw_data = d.split()  # Generate a list from the sequence
-                    loaded_data.append(self.__load_data(data=sequence_raw_data,
-                                                        augment=augment,
-                                                        index=index,
-                                                        entry_type=entry_type,
-                                                        entry_num=entry_num))  # Get the content of the list
-                # Image
-                elif type_data == DEEP_TYPE_IMAGE:
-                    image = self.__load_image(d)
-                    if self.cv_library == DEEP_LIB_PIL:
-                        image = np.array(image)
-                    if entry_num is None:
-                        entry_num = i
-                    if augment is True:
-                        image = self.transform_manager.transform(data=image,
-                                                                 index=index,
-                                                                 type_data=type_data,
-                                                                 entry_type=entry_type,
-                                                                 entry_num=entry_num)
-                    image = np.swapaxes(image, 0, 2).astype(float)
-                    loaded_data.append(image)
-                # TODO : Check how video behaves
-                # Video
-                elif type_data == DEEP_TYPE_VIDEO:
-                    video = self.__load_video(d)
-                    if entry_num is None:
-                        entry_num = i
-                    if augment is True:
-                        video = self.transform_manager.transform(data=video,
-                                                                 index=index,
-                                                                 type_data=type_data,
-                                                                 entry_type=entry_type,
-                                                                 entry_num=entry_num)
-                    loaded_data.append(video)
-                # Integer
-                elif type_data == DEEP_TYPE_INTEGER:
-                    integer = int(d)
-                    loaded_data.append(integer)
-                # Float
-                elif type_data == DEEP_TYPE_FLOAT:
-                    floating = float(d)
-                    loaded_data.append(floating)
-                # Numpy array
-                elif type_data == DEEP_TYPE_NP_ARRAY:
-                    loaded_data.append(np.load(d))
-                # Data type not recognized
-                else:
-                    Notification(DEEP_NOTIF_FATAL,
-                                 "The following data could not be loaded because its type is not recognize : %s.\n"
-                                 "Please check the documentation online to see the supported types" % data)
-                entry_num = None
+                loader = self.loaders[data_types[i]]
+                loaded_data.append(loader(data=d,
+                                          augment=augment,
+                                          index=index,
+                                          entry_type=entry_type,
+                                          entry_num=i if entry_num is None else entry_num))
             # If the data is None
             else:
                 Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_IS_NONE % d)
         return loaded_data
+
+    def __load_sequence_data(self, data, augment, index, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load a sequence by using __load_data in a recursive fashion
+
+        PARAMETERS:
+        -----------
+
+        :param data: The raw sequence
+        :param augment: Whether to augment or not the requested data
+        :param index: The index of the data
+        :param entry_type: Whether it in an input, a label or an additional_data
+        :param entry_num: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return: The list of loaded items of the sequence (a single array for a sequence of images)
+        """
+        # TODO : Check how sequence behaves
+        sequence_raw_data = data.split()  # Generate a list from the sequence
+        item_type = self.sequence_types[entry_type][entry_num]
+        if item_type == DEEP_TYPE_IMAGE and sequence_raw_data:
+            return self.__load_image_sequence(sequence_raw_data, augment, index, entry_type, entry_num)
+        return self.__load_data(data=sequence_raw_data,
+                                augment=augment,
+                                index=index,
+                                entry_type=entry_type,
+                                data_types=[item_type] * len(sequence_raw_data),
+                                entry_num=entry_num)
+
+    def __load_image_sequence(self, paths, augment, index, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load (and transform if required) a sequence of images into a single preallocated (L, C, W, H) array
+
+        The images are decoded concurrently by the thread pool of the process.
+        The transforms are applied in the calling thread, in the order of the sequence
+        (so that all the images of the sequence get the same random transforms), while the next images are decoded
+
+        PARAMETERS:
+        -----------
+
+        :param paths: The paths of the images of the sequence
+        :param augment: Whether to augment or not the requested data
+        :param index: The index of the data
+        :param entry_type: Whether it in an input, a label or an additional_data
+        :param entry_num: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return: The loaded sequence
+        """
+        sequence = None
+        for i, image in enumerate(self.__get_thread_pool().map(self.__decode_image_file, paths)):
+            if augment is True:
+                image = self.transform_manager.transform(data=image,
+                                                         index=index,
+                                                         type_data=DEEP_TYPE_IMAGE,
+                                                         entry_type=entry_type,
+                                                         entry_num=entry_num)
+            image = np.swapaxes(image, 0, 2)
+            if sequence is None:
+                sequence = np.empty((len(paths),) + image.shape, dtype=image.dtype)
+            elif image.shape != sequence.shape[1:]:
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_SEQUENCE_SHAPES % (paths[i], image.shape, sequence.shape[1:]))
+            sequence[i] = image
+        return sequence
+
+    def __get_thread_pool(self) -> ThreadPoolExecutor:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the thread pool of the current process (the threads are not inherited by the DataLoader workers)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->ThreadPoolExecutor: The thread pool
+        """
+        if self.thread_pool is None or self.thread_pool_pid != os.getpid():
+            self.thread_pool = ThreadPoolExecutor(max_workers=self.sequence_threads)
+            self.thread_pool_pid = os.getpid()
+        return self.thread_pool
+
+    def __load_image_data(self, data, augment, index, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load (and transform if required) an image
+
+        PARAMETERS:
+        -----------
+
+        :param data: The path to the image
+        :param augment: Whether to augment or not the requested data
+        :param index: The index of the data
+        :param entry_type: Whether it in an input, a label or an additional_data
+        :param entry_num: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return: The loaded image
+        """
+        # If the dataset has been materialized, the image is read from the cache (mandatory transforms already applied) :
+        # mapped copy-on-write to be augmented (the transforms may modify it in place), or viewed read-only as a raw image
+        # if the entry has no mandatory transforms (the cached image is then the raw image)
+        column = self.cached_columns.get((entry_type, entry_num))
+        if column is not None and (augment is True or (entry_type, entry_num) in self.raw_cached_columns):
+            row = self.data.get_row_id(index % self.number_raw_instances)
+            image = self.tensor_cache.get(row, column, writable=augment)
+            mandatory = False
+        else:
+            image = self.__load_cached_sample(data, index, entry_type, entry_num, self.__decode_image_file)
+            mandatory = True
+        if augment is True:
+            image = self.transform_manager.transform(data=image,
+                                                     index=index,
+                                                     type_data=DEEP_TYPE_IMAGE,
+                                                     entry_type=entry_type,
+                                                     entry_num=entry_num,
+                                                     mandatory=mandatory)
+        # The image keeps its dtype, the conversion is done once on the mini-batch (see Collate)
+        return np.swapaxes(image, 0, 2)
+
+    def __load_video_data(self, data, augment, index, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load (and transform if required) a video
+
+        PARAMETERS:
+        -----------
+
+        :param data: The path to the video
+        :param augment: Whether to augment or not the requested data
+        :param index: The index of the data
+        :param entry_type: Whether it in an input, a label or an additional_data
+        :param entry_num: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return: The loaded video
+        """
+        # TODO : Check how video behaves
+        video = self.__load_video(data)
+        if augment is True:
+            video = self.transform_manager.transform(data=video,
+                                                     index=index,
+                                                     type_data=DEEP_TYPE_VIDEO,
+                                                     entry_type=entry_type,
+                                                     entry_num=entry_num)
+        return video
+
+    @staticmethod
+    def __load_integer_data(data, **kwargs):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load an integer (already converted in the columnar index)
+
+        PARAMETERS:
+        -----------
+
+        :param data: The integer
+
+        RETURN:
+        -------
+
+        :return: The integer
+        """
+        return int(data)
+
+    @staticmethod
+    def __load_float_data(data, **kwargs):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load a float (already converted in the columnar index)
+
+        PARAMETERS:
+        -----------
+
+        :param data: The float
+
+        RETURN:
+        -------
+
+        :return: The float
+        """
+        return float(data)
+
+    def __load_np_array_data(self, data, augment, index, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load a numpy array
+
+        PARAMETERS:
+        -----------
+
+        :param data: The path to the numpy array (.npy file or archive.npz:member)
+        :param augment: Whether to augment or not the requested data (unused)
+        :param index: The index of the data
+        :param entry_type: Whether it in an input, a label or an additional_data
+        :param entry_num: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return: The numpy array
+        """
+        return self.__load_cached_sample(data, index, entry_type, entry_num, self.array_loader.load)
+
+    def __resolve_data_types(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Resolve once the type of each column of the index from its first row (the other rows are checked by __check_data_type)
+        Numeric columns are converted to numeric arrays so that no string is parsed when loading an instance
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.data_types = {}
+        self.sequence_types = {}
+        for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+            self.data_types[entry_type] = []
+            self.sequence_types[entry_type] = []
+            # Nothing to resolve on an empty dataset
+            if len(self.data) == 0:
+                continue
+            for entry_num, d in enumerate(self.data.get_entries(entry_type, 0)):
+                data_type = self.__data_type(d)
+                sequence_type = None
+                # A column of numbers is entirely converted : it is an integer column only if all its values are integers
+                # (parsed directly as integers, a float64 cannot hold the integers above 2 ** 53)
+                if data_type in (DEEP_TYPE_INTEGER, DEEP_TYPE_FLOAT):
+                    try:
+                        self.data.convert_column(entry_type, entry_num, np.int64)
+                        data_type = DEEP_TYPE_INTEGER
+                    except (ValueError, OverflowError):
+                        try:
+                            self.data.convert_column(entry_type, entry_num, np.float64)
+                            data_type = DEEP_TYPE_FLOAT
+                        except ValueError as e:
+                            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_MIXED_TYPES % (entry_num, str(e)))
+                elif data_type == DEEP_TYPE_SEQUENCE:
+                    sequence_type = self.__data_type(d.split()[0])
+                self.data_types[entry_type].append(data_type)
+                self.sequence_types[entry_type].append(sequence_type)
+
     """
     "
     " DATA TYPE ANALYZERS
@@ -685,6 +1054,12 @@ class Dataset(object):
         if mime[0] != None:
             mime = mime[0].split("/")[0]
 
+        # A sequence is given as whitespace-separated items on one line
+        # (unless the line is the path of an existing image or video, which may contain spaces)
+        if isinstance(data, str) and len(data.split()) > 1 \
+                and not (mime in ("image", "video") and os.path.isfile(data)):
+            return DEEP_TYPE_SEQUENCE
+
         # Image
         if mime == "image":
             return DEEP_TYPE_IMAGE
@@ -706,6 +1081,272 @@ class Dataset(object):
         else:
             Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_NOT_HANDLED % data)
 
+    def __materialize(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Write the decoded images of the dataset (mandatory transforms applied) into a memory-mapped TensorCache
+        The cache is keyed on the image paths (with their size and modification time), the mandatory transforms and the cv library.
+        If a cache with the same key already exists it is used directly.
+        The raw images of the entries with mandatory transforms are still decoded from their files (they are never transformed)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        columns = [(entry_type, entry_num)
+                   for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA)
+                   for entry_num, data_type in enumerate(self.data_types[entry_type])
+                   if data_type == DEEP_TYPE_IMAGE]
+        if not columns or len(self.data) == 0:
+            Notification(DEEP_NOTIF_WARNING, DEEP_MSG_CACHE_NOTHING_TO_CACHE % self.name)
+            return
+        config = [self.cv_library]
+        for entry_type, entry_num in columns:
+            if self.transform_manager is not None:
+                config.append(self.transform_manager.get_mandatory_transforms_config(entry_type, entry_num))
+            else:
+                config.append(None)
+        # Without mandatory transforms, the cached images are the raw images
+        raw_columns = {c for c, transforms in zip(columns, config[1:]) if transforms is None or not transforms[1]}
+        key = TensorCache.compute_key([self.data.get_column(*c) for c in columns], config)
+        cache = TensorCache(directory=self.cache_dir, name=self.name, key=key)
+        if cache.exists():
+            Notification(DEEP_NOTIF_INFO, DEEP_MSG_CACHE_FOUND % (self.name, cache.path_raw))
+        else:
+            Notification(DEEP_NOTIF_INFO, DEEP_MSG_CACHE_WRITING % (self.name, cache.path_raw))
+            # The index has not been permuted yet : the row id is the index in the columns
+            cache.write(num_rows=len(self.data),
+                        num_columns=len(columns),
+                        get_sample=lambda row, column: self.__decode_image(row, *columns[column]))
+        cache.open()
+        self.tensor_cache = cache
+        self.cached_columns = {c: i for i, c in enumerate(columns)}
+        self.raw_cached_columns = raw_columns
+
+    def __create_sample_cache(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Create the cache of the decoded raw samples of the image and numpy array entries
+        The items of the sequences are not cached.
+        The slots of a shared cache are sized after the largest sample of the first row
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        decoders = {DEEP_TYPE_IMAGE: self.__decode_image_file, DEEP_TYPE_NP_ARRAY: self.array_loader.load}
+        columns = [(entry_type, entry_num)
+                   for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA)
+                   for entry_num, data_type in enumerate(self.data_types[entry_type])
+                   if data_type in decoders]
+        if not columns or len(self.data) == 0:
+            return
+        if self.sample_cache_shared is True:
+            slot_bytes = max(decoders[self.data_types[entry_type][entry_num]](
+                             self.data.get_entries(entry_type, 0)[entry_num]).nbytes
+                             for entry_type, entry_num in columns)
+            self.sample_cache = SharedSampleCache(max_bytes=self.sample_cache_size,
+                                                  slot_bytes=slot_bytes,
+                                                  num_keys=len(self.data) * len(columns))
+        else:
+            self.sample_cache = SampleCache(max_bytes=self.sample_cache_size)
+        self.sample_cache_columns = {c: i for i, c in enumerate(columns)}
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_SAMPLE_CACHE_CREATED % (self.name,
+                                                                     "shared" if self.sample_cache_shared else "per process",
+                                                                     self.sample_cache_size / 1e6))
+
+    def __record_shapes(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Record the shape of the first input of each instance : self.shapes lists the different shapes
+        and self.buckets gives the position of the shape of each row in self.shapes
+        Only the header of the images is read (PIL), the numpy arrays are mapped
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        data_type = self.data_types[DEEP_ENTRY_INPUT][0]
+        if data_type == DEEP_TYPE_IMAGE:
+            get_shape = self.__get_image_shape
+        elif data_type == DEEP_TYPE_NP_ARRAY:
+            get_shape = lambda data: self.array_loader.load(data).shape
+        else:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_SHAPES_NOT_HANDLED % data_type)
+        paths = (self.data.get_entries(DEEP_ENTRY_INPUT, row)[0] for row in range(len(self.data)))
+        buckets = {}
+        self.buckets = np.fromiter((buckets.setdefault(shape, len(buckets))
+                                    for shape in self.__get_thread_pool().map(get_shape, paths)),
+                                   dtype=np.int64,
+                                   count=len(self.data))
+        self.shapes = list(buckets)
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_DATA_SHAPES_RECORDED % (self.name, len(self.shapes)))
+
+    def __get_image_shape(self, image_path: str) -> tuple:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the shape (height, width, channels) of an image without decoding it
+        (the image is decoded if PIL is not available)
+
+        PARAMETERS:
+        -----------
+
+        :param image_path->str: The path of the image
+
+        RETURN:
+        -------
+
+        :return->tuple: The shape of the image
+        """
+        try:
+            from PIL import Image as PILImage
+        except ImportError:
+            image = self.__decode_image_file(image_path)
+            return image.shape[:2] + (image.shape[2] if image.ndim == 3 else 1,)
+        with PILImage.open(image_path) as image:
+            return image.height, image.width, len(image.getbands())
+
+    def __load_cached_sample(self, data, index: int, entry_type: int, entry_num: int, decode):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get a decoded raw sample from the sample cache, decode and cache it if it is not there
+
+        PARAMETERS:
+        -----------
+
+        :param data: The path to the sample
+        :param index->int: The index of the instance
+        :param entry_type->int: Whether it in an input, a label or an additional_data
+        :param entry_num->int: Number of the entry (input1, input2, ...)
+        :param decode: The function decoding the sample from its path
+
+        RETURN:
+        -------
+
+        :return->np.array: The decoded sample
+        """
+        column = self.sample_cache_columns.get((entry_type, entry_num))
+        # Not a cached entry (the entries of the sequences are never cached)
+        if column is None:
+            return decode(data)
+        # The key is the original row, which does not change when the index is shuffled
+        key = self.data.get_row_id(index % self.number_raw_instances) * len(self.sample_cache_columns) + column
+        sample = self.sample_cache.get(key)
+        if sample is None:
+            sample = decode(data)
+            self.sample_cache.put(key, sample)
+        return sample
+
+    def __decode_image_file(self, image_path: str) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load an image as a numpy array
+
+        PARAMETERS:
+        -----------
+
+        :param image_path->str: The path of the image
+
+        RETURN:
+        -------
+
+        :return->np.array: The image
+        """
+        image = self.__load_image(image_path)
+        if self.cv_library == DEEP_LIB_PIL:
+            image = np.array(image)
+        return image
+
+    def __decode_image(self, row: int, entry_type: int, entry_num: int) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Decode an image of the index and apply its mandatory transforms
+
+        PARAMETERS:
+        -----------
+
+        :param row->int: The row of the image
+        :param entry_type->int: Whether it in an input, a label or an additional_data
+        :param entry_num->int: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return->np.array: The decoded image
+        """
+        path = self.data.get_column(entry_type, entry_num)[row].decode(DEEP_ENCODE_UTF8)
+        image = self.__decode_image_file(path)
+        if self.transform_manager is not None:
+            image = self.transform_manager.apply_mandatory_transforms(image, entry_type, entry_num)
+        return image
+
     #
     # DATA LOADERS
     #
@@ -735,11 +1376,12 @@ class Dataset(object):
             image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
             # Check that the image was correctly loaded
             if image is None:
-                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_CANNOT_LOAD_IMAGE % image_path)
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_CANNOT_LOAD_IMAGE % ("OpenCV", image_path))
             # If the image is not grayscale
             if len(image.shape) > 2:
                 # Convert to RGB(a)
                 return self.__convert_bgra2rgba(image)
+            return image
         elif self.cv_library == DEEP_LIB_PIL:
             try:
                 return Image.open(image_path)
@@ -792,7 +1434,10 @@ class Dataset(object):
 
         DESCRIPTION:
         ------------
-        Load a video
+        Load the selected frames of a video (see self.video) into a single (T, H, W, C) array
+
+        The frames skipped are only grabbed (not retrieved) or, for large gaps, skipped by seeking.
+        The frames are retrieved directly into the preallocated array, converted to RGB(A) at once at the end
 
         PARAMETERS:
         -----------
@@ -802,20 +1447,56 @@ class Dataset(object):
         RETURN:
         -------
 
-        :return: a list of frame from the video
+        :return->np.array: The selected frames of the video
         """
         self.__throw_warning_video()
-        video = []
+        video = None
+        length = 0
         # If the computer vision library selected is OpenCV
         if self.cv_library == DEEP_LIB_OPENCV:
             # try to load the file
             cap = cv2.VideoCapture(video_path)
-            while True:
-                _, frame = cap.read()
-                if frame is None:
+            if not cap.isOpened():
+                Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_CANNOT_LOAD_VIDEO % video_path)
+            num_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            stop = num_frames if self.video["stop"] is None else min(self.video["stop"], num_frames)
+            frames = range(self.video["start"], stop, self.video["stride"])
+            if self.video["clip_length"] is not None:
+                frames = frames[:self.video["clip_length"]]
+            position = 0
+            for frame_index in frames:
+                # Seek when many frames are skipped, grab them (without retrieving them) otherwise
+                if frame_index - position > DEEP_VIDEO_SEEK_THRESHOLD:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+                    position = frame_index
+                while position < frame_index and cap.grab():
+                    position += 1
+                if not cap.grab():
                     break
-                video.append(self.__convert_bgra2rgba(frame))
+                position += 1
+                if video is None:
+                    ok, frame = cap.retrieve()
+                    if not ok or frame is None:
+                        break
+                    video = np.empty((len(frames),) + frame.shape, dtype=frame.dtype)
+                else:
+                    ok, frame = cap.retrieve(video[length])
+                    if not ok or frame is None:
+                        break
+                    # OpenCV reallocates the frame if it does not fit into the buffer
+                    if frame.shape != video.shape[1:]:
+                        Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_VIDEO_FRAME_SHAPE % (frame_index, video_path, frame.shape, video.shape[1:]))
+                if not np.may_share_memory(frame, video):
+                    video[length] = frame
+                length += 1
             cap.release()
+        if video is None:
+            return np.empty((0,), dtype=np.uint8)
+        # The frame count given by the container may be too high
+        video = video[:length]
+        # Convert BGR(A) to RGB(A) in place, for all the frames at once
+        if video.ndim == 4:
+            video[..., :3] = video[..., 2::-1]
         return video
 
     def __throw_warning_video(self):
@@ -922,7 +1603,7 @@ class Dataset(object):
         DESCRIPTION:
         ------------
 
-        Check the type of the entries
+        Check that every row of a column has the type resolved from the first row
 
         PARAMETERS:
         -----------
@@ -934,20 +1615,18 @@ class Dataset(object):
 
         :return: None
         """
+        Notification(DEEP_NOTIF_INFO, "Checking the type of the data ...")
+        for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+            for entry_num, data_type in enumerate(self.data_types[entry_type]):
+                # Numeric columns have already been fully converted
+                if data_type in (DEEP_TYPE_INTEGER, DEEP_TYPE_FLOAT):
+                    continue
+                for index in range(len(self.data)):
+                    d = self.data.get_entries(entry_type, index)[entry_num]
+                    if self.__data_type(d) != data_type:
+                        Notification(DEEP_NOTIF_FATAL, DEEP_MSG_DATA_TYPE_MISMATCH % (d, index, entry_num))
+        Notification(DEEP_NOTIF_SUCCESS, "Data type checked without any error.")
 
-        # TODO : Add a progress bar
-        # For each file check if we have the same number of row
-        for f in self.list_data:
-            # If the input is a file
-            if self.__source_path_type(f) == DEEP_TYPE_FILE:
-                with open(f) as file:
-                    Notification(DEEP_NOTIF_ERROR, "Check data type not implemented")
-            # If the input is a folder
-            elif self.__source_path_type(f) == DEEP_TYPE_FOLDER:
-                Notification(DEEP_NOTIF_FATAL, "Cannot currently check folders")
-            # If it is not a file neither a folder then BUG :(
-            else:
-                Notification(DEEP_NOTIF_FATAL, "The following path is neither a file nor a folder : " + str(f) + ".")
     #
     # DATA UTILS
     #
@@ -1075,7 +1754,7 @@ class Dataset(object):
                 num_instances = sum(1 for _ in f)
         # If the frame input is a folder
         elif self.__source_path_type(f) == DEEP_TYPE_FOLDER:
-            raise ValueError("Not implemented")
+            num_instances = len(self.__get_file_paths(f))
         # If it is not a file neither a folder then BUG :(
         else:
             Notification(DEEP_NOTIF_FATAL, "The following input is neither a file nor a folder :" + str(f))
@@ -0,0 +1,294 @@
+import os
+import hashlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures import FIRST_COMPLETED
+
+from deeplodocus.utils.generic_utils import sorted_nicely
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class FileScanner(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    List all the files of a directory (recursively)
+
+    The directories are scanned in parallel with os.scandir (no extra stat call per file).
+    The sorted list of files is saved into a manifest along with the modification time of every directory walked.
+    A directory changes its modification time when an entry is added, removed or renamed in it,
+    so if none of the directories changed, the manifest is used directly instead of walking the directory again.
+    The lists are also kept in memory so a directory is only scanned once per FileScanner
+    The manifests are written into the cache directory of the project (DEEP_PATH_CACHE, in the working directory) by default
+    """
+
+    def __init__(self, cache_dir: str = DEEP_PATH_CACHE, num_threads: int = DEEP_SCAN_NUM_THREADS):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the FileScanner
+
+        PARAMETERS:
+        -----------
+
+        :param cache_dir->str: The directory of the manifests (None to disable the manifests)
+        :param num_threads->int: The number of threads scanning the directories
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.cache_dir = cache_dir
+        self.num_threads = num_threads
+        self.file_lists = {}
+
+    def scan(self, directory: str) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the list of paths to every file within the given directory, sorted in natural order
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The path of the directory
+
+        RETURN:
+        -------
+
+        :return->list: The list of paths to every file within the directory
+        """
+        if directory in self.file_lists:
+            return self.file_lists[directory]
+        paths = self.__load_manifest(directory)
+        if paths is None:
+            paths, mtimes = self.__walk(directory)
+            paths = sorted_nicely(paths)
+            self.__save_manifest(directory, paths, mtimes)
+        self.file_lists[directory] = paths
+        return paths
+
+    def __walk(self, directory: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Walk the directory tree, scanning the directories in parallel
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The root directory
+
+        RETURN:
+        -------
+
+        :return paths->list: The (unsorted) paths of the files
+        :return mtimes->dict: The modification time of each directory walked
+        """
+        paths = []
+        mtimes = {}
+        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+            pending = {executor.submit(self.__scan_directory, directory)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    d, mtime, files, sub_directories = future.result()
+                    mtimes[d] = mtime
+                    paths.extend(files)
+                    for sub_directory in sub_directories:
+                        pending.add(executor.submit(self.__scan_directory, sub_directory))
+        return paths, mtimes
+
+    @staticmethod
+    def __scan_directory(directory: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        List the files and the sub-directories of a single directory
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory
+
+        RETURN:
+        -------
+
+        :return directory->str: The directory
+        :return mtime->int: The modification time of the directory (in ns), read before listing it
+        :return files->list: The paths of the files
+        :return sub_directories->list: The paths of the sub-directories
+        """
+        mtime = os.stat(directory).st_mtime_ns
+        files = []
+        sub_directories = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                path = "%s/%s" % (directory, entry.name)
+                if entry.is_dir():
+                    sub_directories.append(path)
+                else:
+                    files.append(path)
+        return directory, mtime, files, sub_directories
+
+    def __get_manifest_path(self, directory: str) -> str:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the path of the manifest of a directory
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory
+
+        RETURN:
+        -------
+
+        :return->str: The path of the manifest
+        """
+        key = hashlib.sha1(os.path.abspath(directory).encode(DEEP_ENCODE_UTF8)).hexdigest()[:16]
+        return "%s/manifest_%s%s" % (self.cache_dir, key, DEEP_EXT_NPZ)
+
+    def __load_manifest(self, directory: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load the list of files from the manifest if none of the directories walked has changed since
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory
+
+        RETURN:
+        -------
+
+        :return->list: The list of files (None if there is no valid manifest)
+        """
+        if self.cache_dir is None:
+            return None
+        path = self.__get_manifest_path(directory)
+        if not os.path.isfile(path):
+            return None
+        with np.load(path) as manifest:
+            if manifest["root"].item().decode(DEEP_ENCODE_UTF8) != directory:
+                return None
+            directories = [d.decode(DEEP_ENCODE_UTF8) for d in manifest["directories"].tolist()]
+            mtimes = manifest["mtimes"]
+            with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+                current_mtimes = list(executor.map(self.__get_mtime, directories))
+            if current_mtimes != mtimes.tolist():
+                return None
+            Notification(DEEP_NOTIF_INFO, DEEP_MSG_DATA_MANIFEST_FOUND % (directory, path))
+            return [p.decode(DEEP_ENCODE_UTF8) for p in manifest["paths"].tolist()]
+
+    def __save_manifest(self, directory: str, paths: list, mtimes: dict) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Save the sorted list of files and the modification time of the directories walked
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory
+        :param paths->list: The sorted list of files
+        :param mtimes->dict: The modification time of each directory walked
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.cache_dir is None:
+            return
+        path = self.__get_manifest_path(directory)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # np.savez appends its extension to paths without it
+        with open(path + DEEP_EXT_TMP, "wb") as f:
+            np.savez(f,
+                     root=np.array(directory.encode(DEEP_ENCODE_UTF8), dtype=np.bytes_),
+                     paths=np.array([p.encode(DEEP_ENCODE_UTF8) for p in paths], dtype=np.bytes_),
+                     directories=np.array([d.encode(DEEP_ENCODE_UTF8) for d in mtimes.keys()], dtype=np.bytes_),
+                     mtimes=np.array(list(mtimes.values()), dtype=np.int64))
+        os.replace(path + DEEP_EXT_TMP, path)
+
+    @staticmethod
+    def __get_mtime(directory: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the modification time of a directory
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory
+
+        RETURN:
+        -------
+
+        :return: The modification time (in ns), None if the directory does not exist anymore
+        """
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,423 @@
+import time
+from collections import OrderedDict
+import numpy as np
+import torch
+from torch.utils.data import get_worker_info
+
+from deeplodocus.utils.flags import *
+
+
+class SampleCache(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A least recently used cache of decoded samples with a byte budget, local to a process
+
+    The samples are identified by an integer key (row * number of cached columns + column).
+    When the budget is exceeded, the least recently used samples are evicted.
+    The samples are copied in and out so that the transforms never modify a cached sample
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the SampleCache
+
+        PARAMETERS:
+        -----------
+
+        :param max_bytes->int: The maximum number of bytes of the cached samples
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.max_bytes = max_bytes
+        self.samples = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Do not pickle the cached samples (each DataLoader worker fills its own cache)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the empty SampleCache
+        """
+        state = self.__dict__.copy()
+        state["samples"] = OrderedDict()
+        state["nbytes"] = 0
+        return state
+
+    def get(self, key: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get a copy of a cached sample
+
+        PARAMETERS:
+        -----------
+
+        :param key->int: The key of the sample
+
+        RETURN:
+        -------
+
+        :return->np.array: The sample (None if not cached)
+        """
+        sample = self.samples.get(key)
+        if sample is None:
+            self.misses += 1
+            return None
+        self.samples.move_to_end(key)
+        self.hits += 1
+        return sample.copy()
+
+    def put(self, key: int, sample: np.array) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Cache a copy of a sample, evicting the least recently used samples if needed
+
+        PARAMETERS:
+        -----------
+
+        :param key->int: The key of the sample
+        :param sample->np.array: The sample
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if sample.nbytes > self.max_bytes or key in self.samples:
+            return
+        while self.nbytes + sample.nbytes > self.max_bytes:
+            _, evicted = self.samples.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        self.samples[key] = sample.copy()
+        self.nbytes += sample.nbytes
+
+    def get_statistics(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the counters of the cache (of the current process)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return hits->int: The number of samples found in the cache
+        :return misses->int: The number of samples not found in the cache
+        :return nbytes->int: The number of bytes used
+        """
+        return self.hits, self.misses, self.nbytes
+
+
+class SharedSampleCache(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A least recently used cache of decoded samples in shared memory, used by all the DataLoader workers
+
+    The budget is divided into slots of slot_bytes bytes (a larger sample is not cached).
+    Each slot records the key of its sample, its shape, its dtype and the time it was last used,
+    and a table gives the slot of each key.
+    To avoid any lock, each process only writes into its own slots (slot % number of workers == worker id)
+    where it replaces the least recently used sample, while all the processes read all the slots.
+    A version number, odd while a slot is written, tells the readers whether the sample they copied is consistent
+    """
+
+    def __init__(self, max_bytes: int, slot_bytes: int, num_keys: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Allocate the shared memory of the cache (in the main process, before the workers are started)
+
+        PARAMETERS:
+        -----------
+
+        :param max_bytes->int: The maximum number of bytes of the cached samples
+        :param slot_bytes->int: The size of a slot (largest sample cached)
+        :param num_keys->int: The number of keys (rows * cached columns)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.slot_bytes = slot_bytes
+        self.num_slots = max(1, max_bytes // slot_bytes)
+        self.data = torch.zeros((self.num_slots, slot_bytes), dtype=torch.uint8).share_memory_()
+        self.keys = torch.full((self.num_slots,), -1, dtype=torch.int64).share_memory_()
+        self.versions = torch.zeros(self.num_slots, dtype=torch.int64).share_memory_()
+        self.stamps = torch.zeros(self.num_slots, dtype=torch.int64).share_memory_()
+        self.shapes = torch.zeros((self.num_slots, DEEP_CACHE_MAX_DIMENSIONS), dtype=torch.int64).share_memory_()
+        self.ndims = torch.zeros(self.num_slots, dtype=torch.int64).share_memory_()
+        self.dtypes = torch.zeros(self.num_slots, dtype=torch.int64).share_memory_()
+        self.locations = torch.full((num_keys,), -1, dtype=torch.int64).share_memory_()
+        # One row of counters (hits, misses) per process
+        self.counters = torch.zeros((DEEP_SAMPLE_CACHE_MAX_PROCESSES, 2), dtype=torch.int64).share_memory_()
+        self.views = None
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Do not pickle the NumPy views (each process creates its own views on the shared tensors)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the SharedSampleCache without the views
+        """
+        state = self.__dict__.copy()
+        state["views"] = None
+        return state
+
+    def get(self, key: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get a copy of a cached sample
+
+        PARAMETERS:
+        -----------
+
+        :param key->int: The key of the sample
+
+        RETURN:
+        -------
+
+        :return->np.array: The sample (None if not cached or being replaced)
+        """
+        v = self.__get_views()
+        process = self.__get_process()[0] % DEEP_SAMPLE_CACHE_MAX_PROCESSES
+        slot = v["locations"][key]
+        version = v["versions"][slot] if slot >= 0 else 1
+        if version % 2 == 1 or v["keys"][slot] != key:
+            v["counters"][process, 1] += 1
+            return None
+        shape = tuple(v["shapes"][slot, :v["ndims"][slot]])
+        dtype = np.dtype(DEEP_SAMPLE_CACHE_DTYPES[v["dtypes"][slot]])
+        size = int(np.prod(shape)) * dtype.itemsize
+        sample = v["data"][slot, :size].view(dtype).reshape(shape).copy()
+        # The slot has been replaced while being copied
+        if v["versions"][slot] != version:
+            v["counters"][process, 1] += 1
+            return None
+        v["stamps"][slot] = time.monotonic_ns()
+        v["counters"][process, 0] += 1
+        return sample
+
+    def put(self, key: int, sample: np.array) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Cache a sample into the least recently used slot of the current process
+
+        PARAMETERS:
+        -----------
+
+        :param key->int: The key of the sample
+        :param sample->np.array: The sample
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if sample.nbytes > self.slot_bytes \
+                or sample.ndim > DEEP_CACHE_MAX_DIMENSIONS \
+                or sample.dtype.str not in DEEP_SAMPLE_CACHE_DTYPES:
+            return
+        v = self.__get_views()
+        process, num_processes = self.__get_process()
+        if process >= self.num_slots:
+            return
+        own_slots = v["stamps"][process::num_processes]
+        slot = process + int(np.argmin(own_slots)) * num_processes
+        v["versions"][slot] += 1
+        evicted = v["keys"][slot]
+        if evicted >= 0 and v["locations"][evicted] == slot:
+            v["locations"][evicted] = -1
+        v["data"][slot, :sample.nbytes] = np.ascontiguousarray(sample).reshape(-1).view(np.uint8)
+        v["shapes"][slot, :sample.ndim] = sample.shape
+        v["ndims"][slot] = sample.ndim
+        v["dtypes"][slot] = DEEP_SAMPLE_CACHE_DTYPES.index(sample.dtype.str)
+        v["keys"][slot] = key
+        v["stamps"][slot] = time.monotonic_ns()
+        v["versions"][slot] += 1
+        v["locations"][key] = slot
+
+    def get_statistics(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the counters of the cache (summed over all the processes)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return hits->int: The number of samples found in the cache
+        :return misses->int: The number of samples not found in the cache
+        :return nbytes->int: The number of bytes used (full slots)
+        """
+        hits, misses = self.counters.sum(dim=0).tolist()
+        return hits, misses, int((self.keys >= 0).sum()) * self.slot_bytes
+
+    def __get_views(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the NumPy views on the shared tensors (created once per process)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The views
+        """
+        if self.views is None:
+            self.views = {name: getattr(self, name).numpy()
+                          for name in ("data", "keys", "versions", "stamps", "shapes",
+                                       "ndims", "dtypes", "locations", "counters")}
+        return self.views
+
+    @staticmethod
+    def __get_process():
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the id of the current process among the processes using the cache
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return process->int: The id of the DataLoader worker (0 in the main process)
+        :return num_processes->int: The number of DataLoader workers (1 in the main process)
+        """
+        worker = get_worker_info()
+        if worker is None:
+            return 0, 1
+        return worker.id, worker.num_workers
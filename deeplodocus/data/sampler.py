@@ -0,0 +1,468 @@
+import numpy as np
+from torch.utils.data import Sampler
+
+from deeplodocus.utils.distributed import get_shared_seed
+
+
+class EpochPermutationSampler(Sampler):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Sampler giving the indices of a Dataset in an order drawn from a seed and the epoch
+
+    The permutation of an epoch is drawn when the DataLoader starts iterating (N integers),
+    the Dataset itself is never reordered.
+    The same seed and epoch always give the same order, so that a training can be resumed,
+    also in the middle of an epoch (see state_dict / load_state_dict).
+    Resuming in the middle of an epoch is only available through this API : the Trainer and the Saver
+    do not store the state of the sampler (the Saver only saves the weights, at the end of the epochs),
+    the code driving the training has to save Trainer.get_sampler_state() and give it back to load_state_dict() before fit()
+
+    With several processes, each process takes every world_size-th index of the permutation from its rank.
+    The permutation being the same in all the processes, they use distinct instances.
+    To give all the processes the same number of instances, the permutation can be padded with its first indices
+    """
+
+    def __init__(self, length: int, seed: int = None, shuffle: bool = True,
+                 rank: int = 0, world_size: int = 1, pad: bool = True):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the EpochPermutationSampler
+
+        PARAMETERS:
+        -----------
+
+        :param length->int: The number of instances of the dataset
+        :param seed->int: The seed of the permutations (drawn at random if None, the same in all the processes)
+        :param shuffle->bool: Whether to shuffle the indices (otherwise the indices are given in order)
+        :param rank->int: The rank of the current process
+        :param world_size->int: The number of processes
+        :param pad->bool: Whether to pad the indices so that all the processes have the same number of instances
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.length = length
+        self.seed = get_shared_seed(seed)
+        self.shuffle = shuffle
+        self.rank = rank
+        self.world_size = world_size
+        self.pad = pad
+        self.epoch = 0
+        self.start = 0
+        self.offset = 0
+
+    def __iter__(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Give the indices of the current epoch (from the resumed position if any)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: A generator of indices
+        """
+        indices = self.get_indices()
+        # The resumed position only applies to the first iteration
+        self.offset = self.start
+        self.start = 0
+        yield from indices[self.offset:].tolist()
+
+    def __len__(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of indices given to the current process in an epoch
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of indices
+        """
+        if self.pad is True:
+            length = -(-self.length // self.world_size)
+        else:
+            length = len(range(self.rank, self.length, self.world_size))
+        return length - self.start
+
+    def get_indices(self) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the indices of the current process for the current epoch
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->np.array: The indices
+        """
+        if self.shuffle is True:
+            indices = np.random.default_rng([self.seed, self.epoch]).permutation(self.length)
+        else:
+            indices = np.arange(self.length)
+        if self.world_size > 1 and self.pad is True:
+            indices = np.resize(indices, -(-self.length // self.world_size) * self.world_size)
+        return indices[self.rank::self.world_size]
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set the epoch whose permutation is given by the next iteration
+
+        PARAMETERS:
+        -----------
+
+        :param epoch->int: The epoch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.epoch = epoch
+
+    def state_dict(self, index: int) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the sampler
+        (not saved with the checkpoints : it has to be saved by the code driving the training)
+
+        PARAMETERS:
+        -----------
+
+        :param index->int: The number of instances of the epoch already used by the current process
+                           (the indices given to the DataLoader include the mini-batches prefetched, see Trainer.get_sampler_state)
+
+        RETURN:
+        -------
+
+        :return->dict: The seed, the epoch and the position in the epoch
+        """
+        return {"seed": self.seed,
+                "epoch": self.epoch,
+                "index": index}
+
+    def load_state_dict(self, state: dict) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Restore the state of the sampler : the next iteration resumes the epoch at the saved position
+        (to be called before Trainer.fit(), whose initial epoch must be the saved epoch - 1)
+
+        PARAMETERS:
+        -----------
+
+        :param state->dict: The state given by state_dict
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.seed = state["seed"]
+        self.epoch = state["epoch"]
+        self.start = state["index"]
+
+
+class BucketBatchSampler(Sampler):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Batch sampler forming each mini-batch with instances of the same shape (same bucket)
+
+    At each epoch, the instances of each bucket are shuffled and cut into mini-batches,
+    then the mini-batches of all the buckets are shuffled together.
+    The instances can therefore be stacked without resizing or padding them.
+    As with the EpochPermutationSampler, the order only depends on the seed and the epoch
+    (and the position in the epoch can be saved and restored through the same API only),
+    and each process takes every world_size-th mini-batch from its rank
+    (the mini-batches are padded so that all the processes have the same number of mini-batches)
+    """
+
+    def __init__(self, buckets: np.array, length: int, batch_size: int, seed: int = None, drop_last: bool = False,
+                 rank: int = 0, world_size: int = 1):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the BucketBatchSampler
+
+        PARAMETERS:
+        -----------
+
+        :param buckets->np.array: The bucket of each raw instance of the dataset
+        :param length->int: The number of instances of the dataset (the index of an instance modulo the number of raw instances gives its bucket)
+        :param batch_size->int: The number of instances per mini-batch
+        :param seed->int: The seed of the permutations (drawn at random if None, the same in all the processes)
+        :param drop_last->bool: Whether to drop the last incomplete mini-batch of each bucket
+        :param rank->int: The rank of the current process
+        :param world_size->int: The number of processes
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.buckets = np.asarray(buckets)[np.arange(length) % len(buckets)]
+        self.batch_size = batch_size
+        self.seed = get_shared_seed(seed)
+        self.drop_last = drop_last
+        self.rank = rank
+        self.world_size = world_size
+        self.epoch = 0
+        self.start = 0
+        self.offset = 0
+
+    def __iter__(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Give the mini-batches of the current epoch (from the resumed position if any)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: A generator of lists of indices
+        """
+        batches = self.get_batches()
+        # The resumed position only applies to the first iteration
+        self.offset = self.start
+        self.start = 0
+        for batch in batches[self.offset:]:
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of mini-batches given to the current process in an epoch
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of mini-batches
+        """
+        counts = np.bincount(self.buckets)
+        if self.drop_last is True:
+            num_batches = int(np.sum(counts // self.batch_size))
+        else:
+            num_batches = int(np.sum(-(-counts // self.batch_size)))
+        return -(-num_batches // self.world_size) - self.start
+
+    def get_batches(self) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the mini-batches of the current process for the current epoch
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->list: The arrays of indices of the mini-batches
+        """
+        rng = np.random.default_rng([self.seed, self.epoch])
+        # Shuffle the instances, then group them by bucket (the sort keeps the shuffled order within a bucket)
+        indices = rng.permutation(len(self.buckets))
+        indices = indices[np.argsort(self.buckets[indices], kind="stable")]
+        bounds = np.cumsum(np.bincount(self.buckets))[:-1]
+        batches = []
+        for bucket in np.split(indices, bounds):
+            for start in range(0, len(bucket), self.batch_size):
+                batch = bucket[start:start + self.batch_size]
+                if len(batch) == self.batch_size or (len(batch) > 0 and self.drop_last is False):
+                    batches.append(batch)
+        order = rng.permutation(len(batches))
+        if self.world_size > 1:
+            order = np.resize(order, -(-len(batches) // self.world_size) * self.world_size)
+        return [batches[i] for i in order[self.rank::self.world_size]]
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set the epoch whose mini-batches are given by the next iteration
+
+        PARAMETERS:
+        -----------
+
+        :param epoch->int: The epoch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.epoch = epoch
+
+    def state_dict(self, index: int) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the sampler, to be saved by the code driving the training
+
+        PARAMETERS:
+        -----------
+
+        :param index->int: The number of mini-batches of the epoch already used by the current process
+                           (the mini-batches given to the DataLoader include the mini-batches prefetched, see Trainer.get_sampler_state)
+
+        RETURN:
+        -------
+
+        :return->dict: The seed, the epoch and the position in the epoch
+        """
+        return {"seed": self.seed,
+                "epoch": self.epoch,
+                "index": index}
+
+    def load_state_dict(self, state: dict) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Restore the state of the sampler : the next iteration resumes the epoch at the saved position
+        (to be called before Trainer.fit())
+
+        PARAMETERS:
+        -----------
+
+        :param state->dict: The state given by state_dict
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.seed = state["seed"]
+        self.epoch = state["epoch"]
+        self.start = state["index"]
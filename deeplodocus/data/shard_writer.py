@@ -0,0 +1,218 @@
+import os
+import io
+import tarfile
+import numpy as np
+
+from deeplodocus.data.array_loader import ArrayLoader
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class ShardWriter(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Pack the instances of a loaded Dataset into large shard files (uncompressed tar archives)
+
+    Each data of an instance is stored as one member named <instance>/<entry_type>/<entry_num>/<item><extension>
+    (item is the position in a sequence, 0 otherwise), the members of an instance being contiguous.
+    The files (images, numpy arrays) are stored encoded, as they are on disk, the numbers as text.
+    An index (.npz) records the name and the number of instances of each shard, the byte offset of each instance
+    in its shard and the type of each entry so that the shards can be read without the original files
+    """
+
+    def __init__(self, directory: str, samples_per_shard: int = DEEP_SHARD_SIZE):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the ShardWriter
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory of the shards
+        :param samples_per_shard->int: The number of instances per shard
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.directory = directory
+        self.samples_per_shard = samples_per_shard
+
+    def write(self, dataset) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Write the raw instances of a loaded Dataset (in the order of its index) into shards
+        The shards are written under a temporary name and renamed once complete
+
+        PARAMETERS:
+        -----------
+
+        :param dataset->Dataset: The loaded dataset
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_SHARDS_WRITING % (dataset.name, self.directory))
+        self.__check_types(dataset)
+        os.makedirs(self.directory, exist_ok=True)
+        num_instances = len(dataset.data)
+        names = []
+        lengths = []
+        offsets = np.zeros(num_instances, dtype=np.int64)
+        for start in range(0, num_instances, self.samples_per_shard):
+            name = DEEP_SHARD_NAME % len(names) + DEEP_EXT_TAR
+            path = "%s/%s" % (self.directory, name)
+            end = min(start + self.samples_per_shard, num_instances)
+            with tarfile.open(path + DEEP_EXT_TMP, "w") as tar:
+                for row in range(start, end):
+                    offsets[row] = tar.offset
+                    self.__write_instance(tar, dataset, row)
+            os.replace(path + DEEP_EXT_TMP, path)
+            names.append(name.encode(DEEP_ENCODE_UTF8))
+            lengths.append(end - start)
+        types = {}
+        for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+            types["data_types_%i" % entry_type] = np.array(dataset.data_types[entry_type], dtype=np.int64)
+            # A None sequence type (not a sequence) is stored as -1
+            types["sequence_types_%i" % entry_type] = np.array([-1 if t is None else t
+                                                                for t in dataset.sequence_types[entry_type]],
+                                                               dtype=np.int64)
+        path = "%s/%s%s" % (self.directory, DEEP_SHARD_INDEX, DEEP_EXT_NPZ)
+        # np.savez appends its extension to paths without it
+        with open(path + DEEP_EXT_TMP, "wb") as f:
+            np.savez(f,
+                     shards=np.array(names, dtype=np.bytes_),
+                     lengths=np.array(lengths, dtype=np.int64),
+                     offsets=offsets,
+                     **types)
+        os.replace(path + DEEP_EXT_TMP, path)
+        Notification(DEEP_NOTIF_SUCCESS, DEEP_MSG_SHARDS_WRITTEN % (num_instances, len(names), self.directory))
+
+    def __write_instance(self, tar: tarfile.TarFile, dataset, row: int) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Write the data of an instance into a shard
+
+        PARAMETERS:
+        -----------
+
+        :param tar->tarfile.TarFile: The shard
+        :param dataset->Dataset: The loaded dataset
+        :param row->int: The row of the instance in the index of the dataset
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+            for entry_num, data in enumerate(dataset.data.get_entries(entry_type, row)):
+                data_type = dataset.data_types[entry_type][entry_num]
+                if data_type == DEEP_TYPE_SEQUENCE:
+                    items = data.split()
+                    data_type = dataset.sequence_types[entry_type][entry_num]
+                else:
+                    items = [data]
+                for item_num, item in enumerate(items):
+                    content, extension = self.__encode(item, data_type)
+                    info = tarfile.TarInfo("%i/%i/%i/%i%s" % (row, entry_type, entry_num, item_num, extension))
+                    info.size = len(content)
+                    tar.addfile(info, io.BytesIO(content))
+
+    @staticmethod
+    def __encode(data, data_type: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the bytes stored in a shard for a data
+
+        PARAMETERS:
+        -----------
+
+        :param data: The raw data (path or number)
+        :param data_type->int: The DEEP_TYPE flag of the data
+
+        RETURN:
+        -------
+
+        :return content->bytes: The bytes to store
+        :return extension->str: The extension of the member
+        """
+        if data_type == DEEP_TYPE_NP_ARRAY and not data.endswith(DEEP_EXT_NPY):
+            # A member of a .npz archive is stored as a .npy file
+            content = io.BytesIO()
+            np.save(content, ArrayLoader(mmap=False).load(data))
+            return content.getvalue(), DEEP_EXT_NPY
+        elif data_type in (DEEP_TYPE_IMAGE, DEEP_TYPE_NP_ARRAY):
+            with open(data, "rb") as f:
+                return f.read(), os.path.splitext(data)[1]
+        else:
+            return str(data).encode(DEEP_ENCODE_UTF8), ""
+
+    @staticmethod
+    def __check_types(dataset) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Check that every entry of the dataset can be packed (the videos cannot be decoded from memory)
+
+        PARAMETERS:
+        -----------
+
+        :param dataset->Dataset: The loaded dataset
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        handled = (DEEP_TYPE_IMAGE, DEEP_TYPE_NP_ARRAY, DEEP_TYPE_INTEGER, DEEP_TYPE_FLOAT)
+        for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+            for entry_num, data_type in enumerate(dataset.data_types[entry_type]):
+                if data_type == DEEP_TYPE_SEQUENCE:
+                    data_type = dataset.sequence_types[entry_type][entry_num]
+                if data_type not in handled:
+                    Notification(DEEP_NOTIF_FATAL, DEEP_MSG_SHARDS_TYPE_NOT_HANDLED % (entry_num, data_type))
@@ -0,0 +1,628 @@
+import io
+import tarfile
+import numpy as np
+from torch.utils.data import IterableDataset
+from torch.utils.data import get_worker_info
+
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.distributed import get_rank_and_world_size
+from deeplodocus.utils.distributed import get_shared_seed
+from deeplodocus.utils.flags import *
+
+
+class ShardedDataset(IterableDataset):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A dataset reading the shards written by 'deeplodocus pack' (see ShardWriter)
+
+    The shards are read sequentially (one large file at a time instead of one small file per data).
+    Once the dataset has been shuffled (i.e. for training), the order of the shards changes at each epoch
+    and the instances go through a shuffle buffer : each new instance replaces a random instance of the buffer
+    which is given to the network.
+    The instances are kept encoded in the buffer and decoded when they leave it.
+
+    The DataLoader workers read distinct shards (or distinct instances if there are less shards than workers),
+    also across processes : with several processes, each one reads the shards of its workers
+    and gives the same number of instances (if the shards do not split evenly, a process may stop before the end
+    of its shards or give some instances again, the shards being split differently at each epoch).
+    As in Dataset, the instances are given as (inputs, labels, additional_data)
+    and the instances beyond the number of raw instances are augmented
+    """
+
+    def __init__(self, directory: str,
+                 use_raw_data=True,
+                 transform_manager=None,
+                 cv_library=DEEP_LIB_OPENCV,
+                 shuffle_buffer=DEEP_SHARD_SHUFFLE_BUFFER,
+                 rank=None,
+                 world_size=None,
+                 seed=None,
+                 name="Default"):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the ShardedDataset
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory of the shards and of their index
+        :param use_raw_data->bool: Whether to feed the network with raw data or always apply transforms on it
+        :param transform_manager: A transform object
+        :param cv_library: The computer vision library used to decode the images
+        :param shuffle_buffer->int: The number of instances in the shuffle buffer
+        :param rank->int: The rank of the current process (read from the process group if None)
+        :param world_size->int: The number of processes sharing the dataset (read from the process group if None)
+        :param seed->int: The seed of the shuffling (drawn at random if None, the same in all the processes)
+        :param name->str: Name of the dataset
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.directory = directory
+        self.use_raw_data = use_raw_data
+        self.transform_manager = transform_manager
+        self.shuffle_buffer = shuffle_buffer
+        self.name = name
+        self.shards = None
+        self.lengths = None
+        self.data_types = None
+        self.sequence_types = None
+        self.number_raw_instances = 0
+        self.len_data = None
+        # No shuffling until shuffle() is called, then the shuffling depends on the seed and the epoch
+        self.rank, self.world_size = get_rank_and_world_size(rank, world_size)
+        self.seed = get_shared_seed(seed)
+        self.epoch = None
+        self.cv_library = None
+        self.set_cv_library(cv_library)
+
+    def __iter__(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Read the instances of the shards assigned to the current process
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: A generator of instances (inputs, labels, additional_data)
+        """
+        worker = get_worker_info()
+        num_workers = 1 if worker is None else worker.num_workers
+        # The workers of all the processes read distinct shards
+        first_worker = self.rank * num_workers
+        worker_id = first_worker + (0 if worker is None else worker.id)
+        shares = [self.__get_share(w, num_workers * self.world_size)
+                  for w in range(first_worker, first_worker + num_workers + 1)]
+        # Each process gives the same number of instances, split between its workers
+        # in proportion to their share of the raw instances
+        length = -(-len(self) // self.world_size)
+        bounds = [length * (share - shares[0]) // max(1, shares[-1] - shares[0]) for share in shares]
+        count = bounds[worker_id - first_worker + 1] - bounds[worker_id - first_worker]
+        if self.epoch is None:
+            rng = None
+        else:
+            rng = np.random.default_rng([self.seed, self.epoch, worker_id])
+        buffer = []
+        for index, (instance, augment) in enumerate(self.__read(worker_id, num_workers * self.world_size, count)):
+            # The instance is identified by its position in the epoch (for the transforms)
+            item = (self.rank * length + bounds[worker_id - first_worker] + index, instance, augment)
+            if rng is None or self.shuffle_buffer <= 1:
+                yield self.__decode(*item)
+            elif len(buffer) < self.shuffle_buffer:
+                buffer.append(item)
+            else:
+                i = rng.integers(len(buffer))
+                yield self.__decode(*buffer[i])
+                buffer[i] = item
+        if rng is not None:
+            rng.shuffle(buffer)
+        for item in buffer:
+            yield self.__decode(*item)
+
+    def __len__(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the size of the dataset
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: Length of the dataset
+        """
+        if self.len_data is None:
+            return self.number_raw_instances
+        else:
+            return self.len_data
+
+    """
+    "
+    " PUBLIC METHODS
+    "
+    """
+
+    def load(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load the index of the shards
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        path = "%s/%s%s" % (self.directory, DEEP_SHARD_INDEX, DEEP_EXT_NPZ)
+        try:
+            index = np.load(path)
+        except FileNotFoundError:
+            Notification(DEEP_NOTIF_FATAL, DEEP_MSG_SHARDS_INDEX_NOT_FOUND % self.directory)
+        with index:
+            self.shards = ["%s/%s" % (self.directory, s.decode(DEEP_ENCODE_UTF8)) for s in index["shards"].tolist()]
+            self.lengths = index["lengths"]
+            self.data_types = {}
+            self.sequence_types = {}
+            for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+                self.data_types[entry_type] = index["data_types_%i" % entry_type].tolist()
+                self.sequence_types[entry_type] = [None if t == -1 else t
+                                                   for t in index["sequence_types_%i" % entry_type].tolist()]
+        self.number_raw_instances = int(np.sum(self.lengths))
+        self.len_data = self.__len__()
+        Notification(DEEP_NOTIF_SUCCESS, DEEP_MSG_DATA_LOADED % self.name)
+
+    def summary(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Print the summary of the dataset
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        Notification(DEEP_NOTIF_INFO, DEEP_MSG_SHARDS_SUMMARY % (self.name,
+                                                                 self.number_raw_instances,
+                                                                 len(self.shards),
+                                                                 self.directory))
+
+    def set_cv_library(self, cv_library) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set self.cv_library to the given value and import the corresponding cv library
+
+        PARAMETERS:
+        -----------
+
+        :param cv_library: The DEEP_LIB flag of the library
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.cv_library = cv_library
+        if cv_library == DEEP_LIB_OPENCV:
+            global cv2
+            import cv2
+        elif cv_library == DEEP_LIB_PIL:
+            global Image
+            from PIL import Image
+        else:
+            Notification(DEEP_NOTIF_ERROR, DEEP_MSG_CV_LIBRARY_NOT_IMPLEMENTED % cv_library)
+
+    def set_len_dataset(self, length_data: int) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set the number of instances given in an epoch (the instances beyond the raw instances are augmented)
+
+        PARAMETERS:
+        -----------
+
+        :param length_data->int: The number of instances (None or 0 for the number of raw instances)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.len_data = length_data if length_data else self.number_raw_instances
+
+    def set_rank(self, rank: int = None, world_size: int = None) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Set the process reading the dataset (for a dataset loaded before the process group was created)
+
+        PARAMETERS:
+        -----------
+
+        :param rank->int: The rank of the current process (read from the process group if None)
+        :param world_size->int: The number of processes sharing the dataset (read from the process group if None)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.rank, self.world_size = get_rank_and_world_size(rank, world_size)
+
+    def shuffle(self, method: int) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Shuffle the order of the shards and of the instances (through the shuffle buffer) for the next epoch
+
+        PARAMETERS:
+        -----------
+
+        :param method->int: The DEEP_SHUFFLE flag
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if method in (DEEP_SHUFFLE_BATCHES, DEEP_SHUFFLE_ALL):
+            self.epoch = 0 if self.epoch is None else self.epoch + 1
+        elif method != DEEP_SHUFFLE_NONE:
+            Notification(DEEP_NOTIF_ERROR, "The shuffling method does not exist.")
+        # Reset the TransformManager
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Reset the transform_manager
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if self.transform_manager is not None:
+            self.transform_manager.reset()
+
+    """
+    "
+    " PRIVATE METHODS
+    "
+    """
+
+    def __get_share(self, worker_id: int, num_workers: int) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of raw instances read by the workers before the given one
+
+        PARAMETERS:
+        -----------
+
+        :param worker_id->int: The id of the worker (num_workers for the total)
+        :param num_workers->int: The number of workers
+
+        RETURN:
+        -------
+
+        :return->int: The number of raw instances
+        """
+        if len(self.shards) >= num_workers:
+            lengths = self.lengths[self.__get_order(epoch_pass=0, num_workers=num_workers)]
+            return int(sum(lengths[w::num_workers].sum() for w in range(worker_id)))
+        else:
+            return sum(self.number_raw_instances // num_workers + (w < self.number_raw_instances % num_workers)
+                       for w in range(worker_id))
+
+    def __get_order(self, epoch_pass: int, num_workers: int) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the order of the shards for a pass over the dataset
+        The order is the same in every worker so that they read distinct shards
+
+        PARAMETERS:
+        -----------
+
+        :param epoch_pass->int: The number of passes over the dataset already done in the epoch
+        :param num_workers->int: The number of workers
+
+        RETURN:
+        -------
+
+        :return->np.array: The indices of the shards in reading order
+        """
+        order = np.arange(len(self.shards))
+        if self.epoch is not None:
+            order = np.random.default_rng([self.seed, self.epoch, epoch_pass, num_workers]).permutation(order)
+        return order
+
+    def __read(self, worker_id: int, num_workers: int, count: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Read the encoded instances of a worker, going through its shards again until count instances are given
+
+        PARAMETERS:
+        -----------
+
+        :param worker_id->int: The id of the worker
+        :param num_workers->int: The number of workers
+        :param count->int: The number of instances to give
+
+        RETURN:
+        -------
+
+        :return: A generator of (encoded instance, augment)
+        """
+        augment = not self.use_raw_data
+        given = 0
+        epoch_pass = 0
+        while given < count:
+            order = self.__get_order(epoch_pass, num_workers)
+            if len(self.shards) >= num_workers:
+                shards, stride = [self.shards[i] for i in order[worker_id::num_workers]], 1
+            else:
+                shards, stride = [self.shards[i] for i in order], num_workers
+            k = 0
+            for shard in shards:
+                for instance in self.__read_shard(shard):
+                    if k % stride == worker_id % stride:
+                        yield instance, augment
+                        given += 1
+                        if given == count:
+                            return
+                    k += 1
+            # The instances given again are augmented
+            augment = True
+            epoch_pass += 1
+
+    @staticmethod
+    def __read_shard(path: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Read a shard sequentially
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the shard
+
+        RETURN:
+        -------
+
+        :return: A generator of encoded instances {(entry_type, entry_num): [bytes of each item]}
+        """
+        instance = {}
+        current = None
+        # Stream mode : the shard is read from the beginning to the end without seeking
+        with tarfile.open(path, "r|") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                row, entry_type, entry_num, _ = member.name.split("/")
+                if row != current and current is not None:
+                    yield instance
+                    instance = {}
+                current = row
+                instance.setdefault((int(entry_type), int(entry_num)), []).append(tar.extractfile(member).read())
+        if current is not None:
+            yield instance
+
+    def __decode(self, index: int, instance: dict, augment: bool):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Decode (and transform if required) an instance
+
+        PARAMETERS:
+        -----------
+
+        :param index->int: The position of the instance in the epoch
+        :param instance->dict: The encoded instance
+        :param augment->bool: Whether to augment the instance
+
+        RETURN:
+        -------
+
+        :return: The instance (inputs, labels, additional_data)
+        """
+        entries = []
+        for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA):
+            loaded_data = []
+            for entry_num, data_type in enumerate(self.data_types[entry_type]):
+                items = instance[(entry_type, entry_num)]
+                if data_type == DEEP_TYPE_SEQUENCE:
+                    item_type = self.sequence_types[entry_type][entry_num]
+                    sequence = [self.__decode_data(item, item_type, augment, index, entry_type, entry_num)
+                                for item in items]
+                    # A sequence of images is a single array (as in Dataset)
+                    if item_type == DEEP_TYPE_IMAGE and sequence:
+                        sequence = np.stack(sequence)
+                    loaded_data.append(sequence)
+                else:
+                    loaded_data.append(self.__decode_data(items[0], data_type, augment, index, entry_type, entry_num))
+            entries.append(loaded_data)
+        inputs, labels, additional_data = entries
+        return inputs, labels, additional_data
+
+    def __decode_data(self, content: bytes, data_type: int, augment: bool, index: int, entry_type: int, entry_num: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Decode (and transform if required) a data stored in a shard
+
+        PARAMETERS:
+        -----------
+
+        :param content->bytes: The stored bytes
+        :param data_type->int: The DEEP_TYPE flag of the data
+        :param augment->bool: Whether to augment the data
+        :param index->int: The position of the instance in the epoch
+        :param entry_type->int: Whether it in an input, a label or an additional_data
+        :param entry_num->int: Number of the entry (input1, input2, ...)
+
+        RETURN:
+        -------
+
+        :return: The decoded data
+        """
+        if data_type == DEEP_TYPE_IMAGE:
+            if self.cv_library == DEEP_LIB_OPENCV:
+                image = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+                # Convert BGR(A) to RGB(A)
+                if image.ndim > 2 and image.shape[2] == 3:
+                    image = image[:, :, (2, 1, 0)]
+                elif image.ndim > 2 and image.shape[2] == 4:
+                    image = image[:, :, (2, 1, 0, 3)]
+            else:
+                image = np.array(Image.open(io.BytesIO(content)))
+            if augment is True:
+                image = self.transform_manager.transform(data=image,
+                                                         index=index,
+                                                         type_data=DEEP_TYPE_IMAGE,
+                                                         entry_type=entry_type,
+                                                         entry_num=entry_num)
+            # The image keeps its dtype, the conversion is done once on the mini-batch (see Collate)
+            return np.swapaxes(image, 0, 2)
+        elif data_type == DEEP_TYPE_NP_ARRAY:
+            return np.load(io.BytesIO(content))
+        elif data_type == DEEP_TYPE_INTEGER:
+            return int(content)
+        else:
+            return float(content)
@@ -0,0 +1,382 @@
+import numpy as np
+import torch
+from torch.utils.data import Sampler
+from torch.utils.data.dataloader import default_collate
+
+
+class SlotHandle(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A small handle sent by a DataLoader worker instead of a batched tensor written into the SharedMemoryRing
+    """
+
+    __slots__ = ["slot", "rows"]
+
+    def __init__(self, slot: int, rows: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the SlotHandle
+
+        PARAMETERS:
+        -----------
+
+        :param slot->int: The slot of the ring containing the tensor
+        :param rows->int: The number of instances written in the slot
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.slot = slot
+        self.rows = rows
+
+
+class SharedMemoryRing(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A ring of preallocated shared-memory tensors used to send the mini-batches from the DataLoader workers
+    to the main process without pickling their content
+
+    Each tensor of an example mini-batch gets a shared buffer of shape (num_slots, *shape).
+    The instances of the mini-batch number b are stacked directly into the slot b % num_slots by a worker
+    which only returns SlotHandles.
+    The main process replaces the handles by copies of the slots.
+
+    The DataLoader has at most num_workers * prefetch_factor mini-batches in flight,
+    a ring with more slots than that is never overwritten before the main process moved on to the next mini-batch.
+    A view on a slot is only valid until then : the tensors are only read as views when the caller copies them
+    right away (e.g. the images converted to another dtype), the other tensors are copied out of the ring.
+    """
+
+    def __init__(self, example: list, num_slots: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Allocate the shared buffers from an example mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param example->list: An example of collated mini-batch (full size)
+        :param num_slots->int: The number of slots in the ring
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.num_slots = num_slots
+        self.buffers = {}
+        self.__allocate(example, path=())
+
+    def write(self, slot: int, batch: list):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Collate a list of instances into a slot of the ring (in a DataLoader worker)
+        The data which do not fit into the buffers (other shape or dtype) are collated as usual
+
+        PARAMETERS:
+        -----------
+
+        :param slot->int: The slot of the ring to write into
+        :param batch->list: The list of instances
+
+        RETURN:
+        -------
+
+        :return: The mini-batch where the tensors written into the ring are replaced by SlotHandles
+        """
+        return self.__collate(slot, batch, path=())
+
+    def read(self, minibatch, borrowed: tuple = ()):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Replace the SlotHandles of a mini-batch by copies of the shared buffers (in the main process)
+
+        PARAMETERS:
+        -----------
+
+        :param minibatch: The mini-batch received from a DataLoader worker
+        :param borrowed->tuple: The positions of the data read as views on the buffers, which the caller copies
+                                before the next mini-batch
+
+        RETURN:
+        -------
+
+        :return: The mini-batch of tensors
+        """
+        return self.__read(minibatch, path=(), borrowed=borrowed)
+
+    def __allocate(self, data, path: tuple) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Allocate a shared buffer for each tensor of a (nested) mini-batch
+
+        PARAMETERS:
+        -----------
+
+        :param data: The (nested) mini-batch
+        :param path->tuple: The position of the data in the mini-batch
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        if isinstance(data, torch.Tensor):
+            self.buffers[path] = torch.empty((self.num_slots,) + tuple(data.shape), dtype=data.dtype).share_memory_()
+        elif isinstance(data, (list, tuple)):
+            for i, d in enumerate(data):
+                self.__allocate(d, path + (i,))
+
+    def __collate(self, slot: int, batch: list, path: tuple):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Collate the data found at the same position in each instance
+        The arrays are stacked directly into the shared buffer (no intermediate mini-batch tensor)
+
+        PARAMETERS:
+        -----------
+
+        :param slot->int: The slot of the ring to write into
+        :param batch->list: The data of each instance at this position
+        :param path->tuple: The position of the data in the instances
+
+        RETURN:
+        -------
+
+        :return: The (nested) mini-batch with SlotHandles
+        """
+        elem = batch[0]
+        buffer = self.buffers.get(path)
+        if buffer is not None and isinstance(elem, np.ndarray) and len(batch) <= buffer.shape[1]:
+            # The arrays are stacked by NumPy, which also reads the read-only arrays (views on a TensorCache)
+            if torch.from_numpy(np.empty(0, dtype=elem.dtype)).dtype == buffer.dtype \
+                    and all(b.dtype == elem.dtype and b.shape == tuple(buffer.shape[2:]) for b in batch):
+                np.stack(batch, out=buffer[slot, :len(batch)].numpy())
+                return SlotHandle(slot=slot, rows=len(batch))
+        elif buffer is None and isinstance(elem, (list, tuple)):
+            return [self.__collate(slot, [b[i] for b in batch], path + (i,)) for i in range(len(elem))]
+        return self.__write(slot, default_collate(batch), path)
+
+    def __write(self, slot: int, data, path: tuple):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Copy the tensors of a (nested) mini-batch into a slot of the ring
+
+        PARAMETERS:
+        -----------
+
+        :param slot->int: The slot of the ring to write into
+        :param data: The (nested) mini-batch
+        :param path->tuple: The position of the data in the mini-batch
+
+        RETURN:
+        -------
+
+        :return: The (nested) mini-batch with SlotHandles
+        """
+        if isinstance(data, torch.Tensor):
+            buffer = self.buffers.get(path)
+            # The last mini-batch may contain less instances than the buffer
+            if buffer is not None \
+                    and data.dtype == buffer.dtype \
+                    and data.shape[1:] == buffer.shape[2:] \
+                    and data.shape[0] <= buffer.shape[1]:
+                buffer[slot, :data.shape[0]].copy_(data)
+                return SlotHandle(slot=slot, rows=data.shape[0])
+            return data
+        elif isinstance(data, (list, tuple)):
+            return [self.__write(slot, d, path + (i,)) for i, d in enumerate(data)]
+        else:
+            return data
+
+    def __read(self, data, path: tuple, borrowed: tuple):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Replace the SlotHandles of a (nested) mini-batch by copies of (or views on) the shared buffers
+
+        PARAMETERS:
+        -----------
+
+        :param data: The (nested) mini-batch
+        :param path->tuple: The position of the data in the mini-batch
+        :param borrowed->tuple: The positions of the data read as views on the buffers
+
+        RETURN:
+        -------
+
+        :return: The (nested) mini-batch of tensors
+        """
+        if isinstance(data, SlotHandle):
+            view = self.buffers[path][data.slot, :data.rows]
+            if any(path[:len(position)] == position for position in borrowed):
+                return view
+            return view.clone()
+        elif isinstance(data, (list, tuple)):
+            return [self.__read(d, path + (i,), borrowed) for i, d in enumerate(data)]
+        else:
+            return data
+
+
+class RingBatchSampler(Sampler):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Batch sampler yielding (slot, index) pairs so that each mini-batch knows its slot in the SharedMemoryRing
+    """
+
+    def __init__(self, batch_sampler, num_slots: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the RingBatchSampler
+
+        PARAMETERS:
+        -----------
+
+        :param batch_sampler: The batch sampler giving the indices of each mini-batch
+        :param num_slots->int: The number of slots in the ring
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.batch_sampler = batch_sampler
+        self.num_slots = num_slots
+
+    def __iter__(self):
+        for batch_index, batch in enumerate(self.batch_sampler):
+            slot = batch_index % self.num_slots
+            yield [(slot, index) for index in batch]
+
+    def __len__(self) -> int:
+        return len(self.batch_sampler)
+
+
+class SlotDataset(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Wrap a Dataset to pass the slot of the mini-batch along with each instance
+    """
+
+    def __init__(self, dataset):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the SlotDataset
+
+        PARAMETERS:
+        -----------
+
+        :param dataset->Dataset: The wrapped dataset
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.dataset = dataset
+
+    def __getitem__(self, item: tuple):
+        slot, index = item
+        return slot, self.dataset[index]
+
+    def __len__(self) -> int:
+        return len(self.dataset)
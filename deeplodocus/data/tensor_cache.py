@@ -0,0 +1,275 @@
+import os
+import hashlib
+import numpy as np
+
+from deeplodocus.utils.notification import Notification
+from deeplodocus.utils.flags import *
+
+
+class TensorCache(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A memory-mapped cache of decoded samples
+
+    All the cached samples of a split are written one after the other into a single raw binary file.
+    An offset index (offset, shape and dtype of each sample) is saved next to it in a .npz file.
+    Once written, a sample is read as a zero-copy view on the memory-mapped file.
+
+    The files are named after a key so that a cache is never reused for another list of source files
+    (or source files modified since), or another mandatory transform config
+    """
+
+    def __init__(self, directory: str, name: str, key: str):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Initialize the TensorCache
+
+        PARAMETERS:
+        -----------
+
+        :param directory->str: The directory containing the cache files
+        :param name->str: The name of the cached dataset
+        :param key->str: The key of the cache (see TensorCache.compute_key)
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.name = name
+        self.key = key
+        self.path_raw = "%s/%s_%s%s" % (directory, name, key, DEEP_EXT_RAW)
+        self.path_index = "%s/%s_%s%s" % (directory, name, key, DEEP_EXT_NPZ)
+        self.buffer = None
+        self.offsets = None
+        self.shapes = None
+        self.ndims = None
+        self.dtypes = None
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the TensorCache without the memory map (see Dataset.__getstate__)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the TensorCache without the memory map
+        """
+        state = self.__dict__.copy()
+        state["buffer"] = None
+        return state
+
+    @staticmethod
+    def compute_key(columns: list, config: list) -> str:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Compute the key of a cache from the source files of the cached columns and the config used to decode them
+        The size and modification time of each file are hashed with its path so that a replaced file invalidates the cache
+
+        PARAMETERS:
+        -----------
+
+        :param columns->list: The columns of source files (np.array or TextColumn) to cache
+        :param config->list: Anything describing how the samples are decoded (mandatory transforms, cv library, ...)
+
+        RETURN:
+        -------
+
+        :return->str: The key of the cache
+        """
+        h = hashlib.sha1()
+        for column in columns:
+            # The lines of a TextColumn are read sequentially
+            for path in column:
+                path = bytes(path)
+                h.update(path + b"\n")
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # A missing file is reported when it is decoded
+                    continue
+                h.update(b"%d %d\n" % (stat.st_size, stat.st_mtime_ns))
+        h.update(repr(config).encode(DEEP_ENCODE_UTF8))
+        return h.hexdigest()[:16]
+
+    def exists(self) -> bool:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Check whether the cache has already been written
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->bool: Whether the cache files exist
+        """
+        return os.path.isfile(self.path_raw) and os.path.isfile(self.path_index)
+
+    def write(self, num_rows: int, num_columns: int, get_sample) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Decode every sample and write it into the cache
+        The files are written under a temporary name and renamed at the end so that an interrupted write is never used
+
+        PARAMETERS:
+        -----------
+
+        :param num_rows->int: The number of rows to cache
+        :param num_columns->int: The number of columns to cache
+        :param get_sample: A function (row, column) -> np.array returning the decoded sample
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        os.makedirs(os.path.dirname(self.path_raw), exist_ok=True)
+        offsets = np.zeros((num_rows, num_columns), dtype=np.int64)
+        shapes = np.zeros((num_rows, num_columns, DEEP_CACHE_MAX_DIMENSIONS), dtype=np.int64)
+        ndims = np.zeros((num_rows, num_columns), dtype=np.int64)
+        dtypes = [None] * num_columns
+        offset = 0
+        with open(self.path_raw + DEEP_EXT_TMP, "wb") as f:
+            for row in range(num_rows):
+                for column in range(num_columns):
+                    sample = np.ascontiguousarray(get_sample(row, column))
+                    # All the samples of a column must share the same dtype
+                    if dtypes[column] is None:
+                        dtypes[column] = sample.dtype.str
+                    elif sample.dtype.str != dtypes[column]:
+                        sample = sample.astype(dtypes[column])
+                    if sample.ndim > DEEP_CACHE_MAX_DIMENSIONS:
+                        Notification(DEEP_NOTIF_FATAL, DEEP_MSG_CACHE_TOO_MANY_DIMENSIONS % (sample.ndim, DEEP_CACHE_MAX_DIMENSIONS))
+                    offsets[row, column] = offset
+                    shapes[row, column, :sample.ndim] = sample.shape
+                    ndims[row, column] = sample.ndim
+                    f.write(sample.tobytes())
+                    offset += sample.nbytes
+        # np.savez appends its extension to paths without it
+        with open(self.path_index + DEEP_EXT_TMP, "wb") as f:
+            np.savez(f, offsets=offsets, shapes=shapes, ndims=ndims, dtypes=np.array(dtypes))
+        os.replace(self.path_raw + DEEP_EXT_TMP, self.path_raw)
+        os.replace(self.path_index + DEEP_EXT_TMP, self.path_index)
+
+    def open(self) -> None:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Load the offset index of the cache
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        with np.load(self.path_index) as index:
+            self.offsets = index["offsets"]
+            self.shapes = index["shapes"]
+            self.ndims = index["ndims"]
+            self.dtypes = [np.dtype(d) for d in index["dtypes"]]
+        self.buffer = None
+
+    def get(self, row: int, column: int, writable: bool = False) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get a zero-copy view on a cached sample
+        The read-only view is shared by every later read of the sample in the process.
+        A writable sample is mapped copy-on-write on its own : only the pages modified in place are copied,
+        and the modifications are never seen by the other reads
+
+        PARAMETERS:
+        -----------
+
+        :param row->int: The row of the sample
+        :param column->int: The column of the sample
+        :param writable->bool: Whether the sample may be modified in place (e.g. by the transforms)
+
+        RETURN:
+        -------
+
+        :return->np.array: The cached sample
+        """
+        dtype = self.dtypes[column]
+        shape = tuple(self.shapes[row, column, :self.ndims[row, column]])
+        offset = self.offsets[row, column]
+        size = int(np.prod(shape)) * dtype.itemsize
+        if writable is True:
+            if size == 0:
+                return np.empty(shape, dtype=dtype)
+            return np.memmap(self.path_raw, dtype=dtype, mode="c", offset=offset, shape=shape).view(np.ndarray)
+        # Map the file lazily (once per process)
+        if self.buffer is None:
+            self.buffer = np.memmap(self.path_raw, dtype=np.uint8, mode="r")
+        sample = self.buffer[offset:offset + size].view(dtype).reshape(shape)
+        sample.setflags(write=False)
+        return sample
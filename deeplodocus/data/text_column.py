@@ -0,0 +1,267 @@
+import os
+import numpy as np
+
+from deeplodocus.utils.flags import *
+
+
+class TextColumn(object):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    A column of the ColumnarIndex whose lines stay on disk
+
+    The list files are read once, by chunks, to record the byte offset of each line in a compact int64 array.
+    A line is then read from its file when it is requested.
+    The memory used is 8 bytes per line whatever the length of the lines.
+    Each process (e.g. each DataLoader worker) opens its own file handles.
+    """
+
+    def __init__(self, paths: list):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Index the lines of the given list files (one after the other)
+
+        PARAMETERS:
+        -----------
+
+        :param paths->list: The paths of the list files of the column
+
+        RETURN:
+        -------
+
+        :return: None
+        """
+        self.paths = paths
+        offsets = []
+        bounds = [0]
+        for path in paths:
+            file_offsets = self.__index_file(path)
+            offsets.append(file_offsets)
+            bounds.append(bounds[-1] + len(file_offsets) - 1)
+        # Each file has one more offset than lines (the end of its last line)
+        self.offsets = np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int64)
+        self.bounds = np.array(bounds, dtype=np.int64)
+        self.handles = {}
+        self.pid = None
+
+    def __getstate__(self) -> dict:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the state of the TextColumn without the file handles (see Dataset.__getstate__)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->dict: The state of the TextColumn without the file handles
+        """
+        state = self.__dict__.copy()
+        state["handles"] = {}
+        state["pid"] = None
+        return state
+
+    def __len__(self) -> int:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the number of lines in the column
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->int: The number of lines
+        """
+        return int(self.bounds[-1])
+
+    def __getitem__(self, index: int) -> bytes:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Read a line from its list file
+
+        PARAMETERS:
+        -----------
+
+        :param index->int: The index of the line in the column
+
+        RETURN:
+        -------
+
+        :return->bytes: The stripped line (UTF-8 encoded)
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError("Line %i out of range" % index)
+        file_index = int(np.searchsorted(self.bounds, index, side="right")) - 1
+        # Skip the end offsets of the previous files
+        position = index + file_index
+        start = int(self.offsets[position])
+        end = int(self.offsets[position + 1])
+        f = self.__get_handle(file_index)
+        f.seek(start)
+        return f.read(end - start).strip()
+
+    def __iter__(self):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Read the lines of the column sequentially (one pass over the files)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return: A generator of stripped lines (UTF-8 encoded)
+        """
+        for path in self.paths:
+            with open(path, "rb") as f:
+                for line in f:
+                    yield line.strip()
+
+    def to_array(self, dtype) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Parse the whole column into a numeric array (in one sequential pass)
+        Raise a ValueError if a line cannot be converted (an OverflowError if an integer does not fit the data type)
+
+        PARAMETERS:
+        -----------
+
+        :param dtype: The NumPy data type of the array
+
+        RETURN:
+        -------
+
+        :return->np.array: The converted column
+        """
+        parse = int if np.issubdtype(dtype, np.integer) else float
+        return np.fromiter((parse(line) for line in self), dtype=dtype, count=len(self))
+
+    def __get_handle(self, file_index: int):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the handle of a list file opened by the current process
+
+        PARAMETERS:
+        -----------
+
+        :param file_index->int: The index of the file in the column
+
+        RETURN:
+        -------
+
+        :return: The file handle
+        """
+        # Handles inherited through a fork share their position with the parent process
+        if self.pid != os.getpid():
+            self.handles = {}
+            self.pid = os.getpid()
+        if file_index not in self.handles:
+            self.handles[file_index] = open(self.paths[file_index], "rb")
+        return self.handles[file_index]
+
+    @staticmethod
+    def __index_file(path: str) -> np.array:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the byte offset of the start of each line of a file, and the end of the last line
+
+        PARAMETERS:
+        -----------
+
+        :param path->str: The path of the file
+
+        RETURN:
+        -------
+
+        :return->np.array: The offsets (number of lines + 1)
+        """
+        offsets = [np.zeros(1, dtype=np.int64)]
+        position = 0
+        last = b""
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(DEEP_TEXT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                # A line starts after each line feed
+                line_feeds = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == DEEP_TEXT_LINE_FEED)
+                offsets.append(line_feeds.astype(np.int64) + position + 1)
+                position += len(chunk)
+                last = chunk[-1:]
+        offsets = np.concatenate(offsets)
+        # Like readlines() : a last line without line feed is still a line, a final line feed does not start a new one
+        if position > 0 and last != b"\n":
+            offsets = np.append(offsets, position)
+        return offsets
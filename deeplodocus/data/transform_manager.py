@@ -143,7 +143,7 @@ class TransformManager(object):
                          "An error occurred while updating the TransformManager '" + str(self.name) +"'. Please check the given configuration")
 
 
-    def transform(self, data, index, type_data, entry_type , entry_num):
+    def transform(self, data, index, type_data, entry_type, entry_num, mandatory: bool = True):
         """
         AUTHORS:
         --------
@@ -163,51 +163,72 @@ class TransformManager(object):
         :param type_data: Type of data to transform (image, video, sound, ...)
         :param entry_type: Type of entry (input, label, additional_data)
         :param entry_num: Number of the entry (input1, input2, ...) (useful for sequences)
+        :param mandatory->bool: Whether to apply the mandatory transforms (False if the data has been materialized)
 
         RETURN:
         -------
 
         :return transformed_data: The transformed data
         """
+        transformer = self.__get_transformer(entry_type, entry_num)
+        return transformer.transform(data, index, type_data, mandatory=mandatory)
 
-        list_transformers = None
+    def apply_mandatory_transforms(self, data, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
 
-        # Get the list of transformers corresponding to the type of entry
-        if entry_type == DEEP_ENTRY_INPUT:
-            list_transformers = self.list_input_transformers
-        elif entry_type == DEEP_ENTRY_LABEL:
-            list_transformers = self.list_label_transformers
-        elif entry_type == DEEP_ENTRY_ADDITIONAL_DATA:
-            list_transformers = self.list_additional_data_transformers
-        else:
-            Notification(DEEP_NOTIF_FATAL, "The following type of transformer does not exist : " + str (entry_type))
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
 
+        Apply the mandatory transforms only (used to materialize a dataset)
 
-        # Check if the transformer points to another transformer
-        pointer = list_transformers[entry_num].get_pointer()
+        PARAMETERS:
+        -----------
 
-        # If we do not point to another transformer, transform directly the data
-        if pointer is None:
-        # Transform
-            transformed_data = list_transformers[entry_num].transform(data, index, type_data)
+        :param data: The data to transform
+        :param entry_type: Type of entry (input, label, additional_data)
+        :param entry_num: Number of the entry (input1, input2, ...)
 
-        # If we point to another transformer, load the transformer then transform the data
-        else:
+        RETURN:
+        -------
+
+        :return: The transformed data
+        """
+        transformer = self.__get_transformer(entry_type, entry_num, required=False)
+        if transformer is None:
+            return data
+        return transformer.apply_mandatory_transforms(data)
+
+    def get_mandatory_transforms_config(self, entry_type, entry_num):
+        """
+        AUTHORS:
+        --------
 
-            if pointer[0] == DEEP_ENTRY_INPUT:
-                list_transformers = self.list_input_transformers
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
 
-            elif pointer[0] == DEEP_ENTRY_LABEL:
-                list_transformers = self.list_label_transformers
+        Get a description of the mandatory transforms applied to an entry (used to key the materialized datasets)
 
-            elif pointer[0] == DEEP_ENTRY_ADDITIONAL_DATA:
-                list_transformers = self.list_additional_data_transformers
+        PARAMETERS:
+        -----------
 
-            else:
-                Notification(DEEP_NOTIF_FATAL, "The following type of transformer does not exist : " + str (pointer[0]))
-            transformed_data = list_transformers[pointer[1]].transform(data, index, type_data)
+        :param entry_type: Type of entry (input, label, additional_data)
+        :param entry_num: Number of the entry (input1, input2, ...)
 
-        return transformed_data
+        RETURN:
+        -------
+
+        :return: The name of the transformer and the description of its mandatory transforms (None if no transformer)
+        """
+        transformer = self.__get_transformer(entry_type, entry_num, required=False)
+        if transformer is None:
+            return None
+        return [transformer.name, transformer.get_mandatory_transforms_config()]
 
     def reset(self):
         """
@@ -248,6 +269,73 @@ class TransformManager(object):
                 transformer.reset()
 
 
+    def __get_transformer(self, entry_type, entry_num, required=True):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the transformer of an entry (following the pointers to other transformers)
+
+        PARAMETERS:
+        -----------
+
+        :param entry_type: Type of entry (input, label, additional_data)
+        :param entry_num: Number of the entry (input1, input2, ...)
+        :param required: Whether the entry must have a transformer
+
+        RETURN:
+        -------
+
+        :return transformer: The transformer of the entry (None if the entry has no transformer and it is not required)
+        """
+        list_transformers = self.__get_list_transformers(entry_type)
+        transformer = list_transformers[entry_num] if entry_num < len(list_transformers) else None
+
+        # If we point to another transformer, load the transformer pointed
+        if transformer is not None and transformer.get_pointer() is not None:
+            pointer = transformer.get_pointer()
+            transformer = self.__get_list_transformers(pointer[0])[pointer[1]]
+
+        if transformer is None and required is True:
+            Notification(DEEP_NOTIF_FATAL, "The entry %i of type %i does not have any transformer" % (entry_num, entry_type))
+        return transformer
+
+    def __get_list_transformers(self, entry_type):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get the list of transformers corresponding to the type of entry
+
+        PARAMETERS:
+        -----------
+
+        :param entry_type: Type of entry (input, label, additional_data)
+
+        RETURN:
+        -------
+
+        :return: The list of transformers
+        """
+        if entry_type == DEEP_ENTRY_INPUT:
+            return self.list_input_transformers
+        elif entry_type == DEEP_ENTRY_LABEL:
+            return self.list_label_transformers
+        elif entry_type == DEEP_ENTRY_ADDITIONAL_DATA:
+            return self.list_additional_data_transformers
+        else:
+            Notification(DEEP_NOTIF_FATAL, "The following type of transformer does not exist : " + str(entry_type))
+
     def __summary(self):
         """
         AUTHORS:
@@ -39,7 +39,7 @@ class OneOf(Transformer):
         """
         Transformer.__init__(self, config)
 
-    def transform(self, transformed_data, index, data_type):
+    def transform(self, transformed_data, index, data_type, mandatory: bool = True):
         """
         AUTHORS:
         --------
@@ -57,6 +57,7 @@ class OneOf(Transformer):
         :param data: The data to transform
         :param index: The index of the data
         :param data_type: The data_type
+        :param mandatory->bool: Whether to apply the mandatory transforms (False if they have already been applied)
 
         RETURN:
         -------
@@ -68,7 +69,8 @@ class OneOf(Transformer):
             transforms = self.last_transforms
 
         else:
-            transforms += self.list_mandatory_transforms                                    # Get the mandatory transforms
+            if mandatory is True:
+                transforms += self.list_mandatory_transforms                                # Get the mandatory transforms
             random_transform_index = random.randint(0, len(self.list_transforms) -1)        # Get a random transform among the ones available in the list
             transforms += self.list_transforms[random_transform_index]                      # Get the one function
 
@@ -38,7 +38,7 @@ class Sequential(Transformer):
         Transformer.__init__(self, config)
 
 
-    def transform(self, transformed_data, index, data_type):
+    def transform(self, transformed_data, index, data_type, mandatory: bool = True):
         """
         AUTHORS:
         --------
@@ -56,6 +56,7 @@ class Sequential(Transformer):
         :param transformed_data: The data to transform
         :param index: The index of the data
         :param data_type: The data_type
+        :param mandatory->bool: Whether to apply the mandatory transforms (False if they have already been applied)
 
         RETURN:
         -------
@@ -69,7 +70,10 @@ class Sequential(Transformer):
 
         else:
             # Get mandatory transforms + transforms
-            transforms = self.list_mandatory_transforms + self.list_transforms
+            if mandatory is True:
+                transforms = self.list_mandatory_transforms + self.list_transforms
+            else:
+                transforms = list(self.list_transforms)
 
         # Reinitialize the last transforms
         self.last_transforms = []
@@ -54,7 +54,7 @@ class SomeOf(Transformer):
         else:
             self.number_transformation = None
 
-    def transform(self, transformed_data, index, data_type):
+    def transform(self, transformed_data, index, data_type, mandatory: bool = True):
         """
         AUTHORS:
         --------
@@ -72,6 +72,7 @@ class SomeOf(Transformer):
         :param transformed_data: The data to transform
         :param index: The index of the data
         :param data_type: The data_type
+        :param mandatory->bool: Whether to apply the mandatory transforms (False if they have already been applied)
 
         RETURN:
         -------
@@ -85,7 +86,8 @@ class SomeOf(Transformer):
 
         else:
             # Add the mandatory transforms
-            transforms += self.list_mandatory_transforms
+            if mandatory is True:
+                transforms += self.list_mandatory_transforms
 
             if self.number_transformation is not None:
                 number_transforms_applied = self.number_transformation
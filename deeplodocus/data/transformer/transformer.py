@@ -182,16 +182,68 @@ class Transformer(object):
 
 
 
-    def transform(self, data, index, data_type):
+    def transform(self, data, index, data_type, mandatory: bool = True):
         """
         Authors : Alix Leroy,
         :param data: data to transform
         :param index: The index of the instance in the Data Frame
         :param data_type: The type of data
+        :param mandatory: Whether to apply the mandatory transforms
         :return: The transformed data
         """
         pass # Will be overridden
 
+    def apply_mandatory_transforms(self, data):
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Apply the mandatory transforms only
+        The last transforms used are not updated (the mandatory transforms are deterministic)
+
+        PARAMETERS:
+        -----------
+
+        :param data: The data to transform
+
+        RETURN:
+        -------
+
+        :return data: The transformed data
+        """
+        for transform in self.list_mandatory_transforms:
+            data, _ = transform[1](data, **transform[2])
+        return data
+
+    def get_mandatory_transforms_config(self) -> list:
+        """
+        AUTHORS:
+        --------
+
+        :author: Deeplodocus contributors
+
+        DESCRIPTION:
+        ------------
+
+        Get a description of the mandatory transforms (name, method and arguments)
+
+        PARAMETERS:
+        -----------
+
+        None
+
+        RETURN:
+        -------
+
+        :return->list: The description of each mandatory transform
+        """
+        return [[t[0], "%s.%s" % (t[1].__module__, t[1].__qualname__), t[2]] for t in self.list_mandatory_transforms]
+
     def apply_transforms(self, transformed_data, transforms):
         """
         AUTHORS:
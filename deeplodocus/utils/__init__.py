@@ -13,6 +13,7 @@ def get_main_path():
     ------------
 
     Get the path to the main running file.
+    The processes without main file (interactive sessions, spawned from "python -m") use the working directory
 
     PARAMETERS:
     -----------
@@ -24,4 +25,6 @@ def get_main_path():
 
     :return: The path to the main file
     """
+    if not hasattr(__main__, "__file__"):
+        return os.getcwd()
     return os.path.dirname(os.path.abspath(__main__.__file__))
@@ -0,0 +1,105 @@
+"""
+This script contains the functions used to split the work between several processes (torch.distributed)
+"""
+import numpy as np
+import torch
+import torch.distributed as dist
+
+
+def get_rank_and_world_size(rank: int = None, world_size: int = None):
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Get the rank of the current process and the number of processes
+    The values not given are read from the default process group (0 and 1 if there is none)
+
+    PARAMETERS:
+    -----------
+
+    :param rank->int: The rank of the current process
+    :param world_size->int: The number of processes
+
+    RETURN:
+    -------
+
+    :return rank->int: The rank of the current process
+    :return world_size->int: The number of processes
+    """
+    initialized = dist.is_available() and dist.is_initialized()
+    if rank is None:
+        rank = dist.get_rank() if initialized else 0
+    if world_size is None:
+        world_size = dist.get_world_size() if initialized else 1
+    return rank, world_size
+
+
+def get_shared_seed(seed: int = None) -> int:
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Get a seed identical in all the processes
+    A seed drawn at random is the one of the process of rank 0 if a process group exists
+
+    PARAMETERS:
+    -----------
+
+    :param seed->int: The seed (drawn at random if None)
+
+    RETURN:
+    -------
+
+    :return->int: The seed
+    """
+    if seed is not None:
+        return seed
+    seed = torch.tensor([np.random.randint(2 ** 31)], dtype=torch.int64)
+    if dist.is_available() and dist.is_initialized():
+        dist.broadcast(seed, src=0)
+    return int(seed.item())
+
+
+def reduce_dict(values: dict, weight: float = 1.0) -> dict:
+    """
+    AUTHORS:
+    --------
+
+    :author: Deeplodocus contributors
+
+    DESCRIPTION:
+    ------------
+
+    Average the scalar values of a dictionary over all the processes (in a single all-reduce)
+    Every process must give the same keys, in the same order. A None value (e.g. a process without any mini-batch)
+    is left out of the average of its key
+
+    PARAMETERS:
+    -----------
+
+    :param values->dict: The scalar values (tensors, numbers or None) of the current process
+    :param weight->float: The weight of the current process in the average (e.g. its number of mini-batches)
+
+    RETURN:
+    -------
+
+    :return->dict: The averaged values (tensors stay tensors, numbers stay numbers, None if no process has a value)
+    """
+    keys = list(values.keys())
+    tensor = torch.tensor([[0.0 if values[key] is None else float(values[key]) for key in keys],
+                           [0.0 if values[key] is None else 1.0 for key in keys]], dtype=torch.float64) * weight
+    dist.all_reduce(tensor, op=dist.ReduceOp.SUM)
+    sums, weights = tensor.tolist()
+    means = [total / total_weight if total_weight > 0 else None for total, total_weight in zip(sums, weights)]
+    return {key: torch.tensor(mean) if mean is not None and isinstance(values[key], torch.Tensor) else mean
+            for key, mean in zip(keys, means)}
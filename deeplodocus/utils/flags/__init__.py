@@ -14,6 +14,7 @@ from deeplodocus.utils.flags.ui import *
 from deeplodocus.utils.flags.backend import *
 from deeplodocus.utils.flags.module import *
 from deeplodocus.utils.flags.event import *
+from deeplodocus.utils.flags.cache import *
 
 #
 # MODEL SAVING CONDITION
@@ -44,6 +45,59 @@ DEEP_VERBOSE_TRAINING = 0
 DEEP_SHUFFLE_NONE = 0
 DEEP_SHUFFLE_BATCHES = 1
 DEEP_SHUFFLE_ALL = 2
+DEEP_SHUFFLE_BUCKETS = 3                # Mini-batches of instances of the same shape, in a random order
+
+#
+# METRIC SCHEDULE
+#
+DEEP_METRIC_SCHEDULE_BATCH = 0          # Computed on every training mini-batch
+DEEP_METRIC_SCHEDULE_EVERY_N = 1        # Computed on one training optimizer step out of N
+DEEP_METRIC_SCHEDULE_VALIDATION = 2     # Only computed on the validation (or test) mini-batches
+DEEP_METRIC_SCHEDULE_EPOCH = 3          # Computed once per epoch on the accumulated predictions
+DEEP_METRIC_SCHEDULE_ALL = [DEEP_METRIC_SCHEDULE_BATCH,
+                            DEEP_METRIC_SCHEDULE_EVERY_N,
+                            DEEP_METRIC_SCHEDULE_VALIDATION,
+                            DEEP_METRIC_SCHEDULE_EPOCH]
+
+#
+# DATALOADER
+#
+DEEP_DATALOADER_PREFETCH_FACTOR = 2     # Mini-batches loaded in advance by each worker
+DEEP_DATALOADER_EXTRA_SLOTS = 2         # Slots of the shared memory ring on top of the mini-batches in flight
+
+#
+# DIRECTORY SCANNING
+#
+DEEP_SCAN_NUM_THREADS = 16
+
+#
+# TEXT COLUMNS
+#
+DEEP_TEXT_CHUNK_SIZE = 16 * 1024 * 1024     # Bytes read at once when indexing the lines of a list file
+DEEP_TEXT_LINE_FEED = 10
+
+#
+# SHARDS
+#
+DEEP_SHARD_SIZE = 1000                  # Instances per shard written by 'deeplodocus pack'
+DEEP_SHARD_SHUFFLE_BUFFER = 1000        # Instances held in memory to shuffle the shards read sequentially
+DEEP_SHARD_NAME = "shard_%06i"
+DEEP_SHARD_INDEX = "index"
+
+#
+# SEQUENCES
+#
+DEEP_SEQUENCE_NUM_THREADS = 4           # Threads decoding the images of a sequence in each process
+
+#
+# NUMPY ARRAYS
+#
+DEEP_ARRAY_CACHE_SIZE = 128             # Memory-mapped arrays kept open by each process
+
+#
+# VIDEO
+#
+DEEP_VIDEO_SEEK_THRESHOLD = 30          # Frames skipped above which the video is seeked instead of read
 
 #
 # SAVE NETWORK FORMAT
@@ -0,0 +1,10 @@
+#
+# TENSOR CACHE
+#
+DEEP_CACHE_MAX_DIMENSIONS = 4
+
+#
+# SAMPLE CACHE
+#
+DEEP_SAMPLE_CACHE_MAX_PROCESSES = 64    # Processes (main process and DataLoader workers) with their own counters
+DEEP_SAMPLE_CACHE_DTYPES = ("|b1", "|i1", "|u1", "<i2", "<u2", "<i4", "<u4", "<i8", "<u8", "<f2", "<f4", "<f8")
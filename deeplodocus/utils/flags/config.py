@@ -66,6 +66,22 @@ DEEP_CONFIG = {DEEP_CONFIG_PROJECT: {"name": {"dtype": str,
                                                         "default": 0},
                                       "shuffle": {"dtype": int,
                                                   "default": 2},
+                                      "seed": {"dtype": int,
+                                               "default": None},
+                                      "accumulation_steps": {"dtype": int,
+                                                             "default": 1},
+                                      "mixed_precision": {"enabled": {"dtype": bool,
+                                                                      "default": False},
+                                                          "loss_scaling": {"dtype": bool,
+                                                                           "default": False}},
+                                      "distributed": {"world_size": {"dtype": int,
+                                                                     "default": 1},
+                                                      "backend": {"dtype": str,
+                                                                  "default": "gloo"},
+                                                      "init_method": {"dtype": str,
+                                                                      "default": "tcp://127.0.0.1:29500"},
+                                                      "start_method": {"dtype": str,
+                                                                       "default": "spawn"}},
                                       "save_condition": {"dtype": int,
                                                          "default": 1},
                                      "save_method" : {"dtype" : int,
@@ -73,25 +89,101 @@ DEEP_CONFIG = {DEEP_CONFIG_PROJECT: {"name": {"dtype": str,
                DEEP_CONFIG_DATA: {"dataloader": {"batch_size": {"dtype": int,
                                                                 "default": 32},
                                                  "num_workers": {"dtype": int,
-                                                                 "default": 1}},
+                                                                 "default": 1},
+                                                 "dtype": {"dtype": str,
+                                                           "default": "float32"},
+                                                 "shared_memory": {"dtype": bool,
+                                                                   "default": False}},
                                   "dataset": {"train": {"inputs": {"dtype": str,
                                                                    "default": None},
                                                         "labels": {"dtype": str,
                                                                    "default": None},
                                                         "additional_data": {"dtype": str,
-                                                                            "default": None}},
+                                                                            "default": None},
+                                                        "materialize": {"dtype": bool,
+                                                                        "default": False},
+                                                        "lazy_text": {"dtype": bool,
+                                                                      "default": False},
+                                                        "shards": {"dtype": str,
+                                                                   "default": None},
+                                                        "shuffle_buffer": {"dtype": int,
+                                                                           "default": 1000},
+                                                        "sample_cache_size": {"dtype": int,
+                                                                              "default": 0},
+                                                        "sample_cache_shared": {"dtype": bool,
+                                                                                "default": False},
+                                                        "np_mmap": {"dtype": bool,
+                                                                    "default": True},
+                                                        "sequence_threads": {"dtype": int,
+                                                                             "default": 4},
+                                                        "video": {"start": {"dtype": int,
+                                                                            "default": 0},
+                                                                  "stop": {"dtype": int,
+                                                                           "default": None},
+                                                                  "stride": {"dtype": int,
+                                                                             "default": 1},
+                                                                  "clip_length": {"dtype": int,
+                                                                                  "default": None}}},
                                               "validation": {"inputs": {"dtype": str,
                                                                         "default": None},
                                                              "labels": {"dtype": str,
                                                                         "default": None},
                                                              "additional_data": {"dtype": str,
-                                                                                 "default": None}},
+                                                                                 "default": None},
+                                                             "materialize": {"dtype": bool,
+                                                                             "default": False},
+                                                             "lazy_text": {"dtype": bool,
+                                                                           "default": False},
+                                                             "shards": {"dtype": str,
+                                                                        "default": None},
+                                                             "shuffle_buffer": {"dtype": int,
+                                                                                "default": 1000},
+                                                             "sample_cache_size": {"dtype": int,
+                                                                                   "default": 0},
+                                                             "sample_cache_shared": {"dtype": bool,
+                                                                                     "default": False},
+                                                             "np_mmap": {"dtype": bool,
+                                                                         "default": True},
+                                                             "sequence_threads": {"dtype": int,
+                                                                                  "default": 4},
+                                                             "video": {"start": {"dtype": int,
+                                                                                 "default": 0},
+                                                                       "stop": {"dtype": int,
+                                                                                "default": None},
+                                                                       "stride": {"dtype": int,
+                                                                                  "default": 1},
+                                                                       "clip_length": {"dtype": int,
+                                                                                       "default": None}}},
                                               "test": {"inputs": {"dtype": str,
                                                                   "default": None},
                                                        "labels": {"dtype": str,
                                                                   "default": None},
                                                        "additional_data": {"dtype": str,
-                                                                           "default": None}}}}}
+                                                                           "default": None},
+                                                       "materialize": {"dtype": bool,
+                                                                       "default": False},
+                                                       "lazy_text": {"dtype": bool,
+                                                                     "default": False},
+                                                       "shards": {"dtype": str,
+                                                                  "default": None},
+                                                       "shuffle_buffer": {"dtype": int,
+                                                                          "default": 1000},
+                                                       "sample_cache_size": {"dtype": int,
+                                                                             "default": 0},
+                                                       "sample_cache_shared": {"dtype": bool,
+                                                                               "default": False},
+                                                       "np_mmap": {"dtype": bool,
+                                                                   "default": True},
+                                                       "sequence_threads": {"dtype": int,
+                                                                            "default": 4},
+                                                       "video": {"start": {"dtype": int,
+                                                                           "default": 0},
+                                                                 "stop": {"dtype": int,
+                                                                          "default": None},
+                                                                 "stride": {"dtype": int,
+                                                                            "default": 1},
+                                                                 "clip_length": {"dtype": int,
+                                                                                 "default": None}}}}}}
 
 # A dict of names for each config file
 DEEP_CONFIG_FILES = {item: "%s%s" % (item, DEEP_EXT_YAML) for item in DEEP_CONFIG_SECTIONS}
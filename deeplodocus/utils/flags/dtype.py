@@ -1,3 +1,5 @@
+import torch
+
 #
 # TYPE FLAGS
 #
@@ -11,3 +13,14 @@ DEEP_TYPE_BOOLEAN = 6
 DEEP_TYPE_SOUND = 7
 DEEP_TYPE_SEQUENCE = 8
 DEEP_TYPE_NP_ARRAY = 9
+
+#
+# OUTPUT DATA TYPES
+#
+DEEP_DTYPE_UINT8 = "uint8"
+DEEP_DTYPE_FLOAT16 = "float16"
+DEEP_DTYPE_FLOAT32 = "float32"
+
+DEEP_DTYPE_TORCH = {DEEP_DTYPE_UINT8: torch.uint8,
+                    DEEP_DTYPE_FLOAT16: torch.float16,
+                    DEEP_DTYPE_FLOAT32: torch.float32}
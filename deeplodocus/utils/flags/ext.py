@@ -7,3 +7,8 @@ DEEP_EXT_JPG = ".jpg"
 DEEP_EXT_CSV = ".csv"
 DEEP_EXT_NPY = ".npy"
 DEEP_EXT_NPZ = ".npz"
+DEEP_EXT_RAW = ".raw"
+DEEP_EXT_TMP = ".tmp"
+DEEP_EXT_TAR = ".tar"
+
+DEEP_NPZ_MEMBER_SEPARATOR = ":"        # archive.npz:member
@@ -3,6 +3,7 @@ import torch.nn.functional
 
 from deeplodocus.utils import get_main_path
 import deeplodocus.data.transforms as tfm
+import deeplodocus.core.metrics as mtc
 
 
 DEEP_MODULE_OPTIMIZERS = {"pytorch":
@@ -26,7 +27,10 @@ DEEP_MODULE_LOSSES = {"pytorch":
                               "prefix": "modules.losses"}
                       }
 
-DEEP_MODULE_METRICS = {"pytorch":
+DEEP_MODULE_METRICS = {"deeplodocus":
+                             {"path" : mtc.__path__,
+                              "prefix" : mtc.__name__},
+                       "pytorch":
                              {"path" : torch.nn.__path__,
                               "prefix" : torch.nn.__name__},
                        "custom":
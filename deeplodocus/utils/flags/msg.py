@@ -16,6 +16,11 @@ DEEP_MSG_NO_TESTER = "Cannot evaluate : Tester not loaded"
 DEEP_MSG_NO_TRAINER = "Cannot evaluate : Trainer not loaded"
 DEEP_MSG_INVALID_DEVICE = "%s is not a valid input device : Please specify 'cuda' or 'cpu'"
 DEEP_MSG_OPTIMIZER_NOT_LOADED = "Could not load optimizer : %s"
+DEEP_MSG_METRIC_SCHEDULE_INVALID = "The schedule of the metric %s is not valid : %s"
+DEEP_MSG_METRIC_EVERY_INVALID = "The metric %s must be computed every N optimizer steps with N a positive integer, got : %s"
+DEEP_MSG_METRIC_AVERAGE_INVALID = "The average of the metric %s is not valid : %s (expected one of %s)"
+DEEP_MSG_METRIC_ACTIVATION_INVALID = "The activation of the metric %s is not valid : %s (expected one of %s)"
+DEEP_MSG_METRIC_EPOCH_ONLY = "The metric %s has no call, only update() and compute() : it must be computed once per epoch (schedule : 3)"
 
 # Deep Success
 DEEP_MSG_LOAD_CONFIG_FILE = "File loaded : %s"
@@ -52,12 +57,40 @@ DEEP_MSG_PROJECT_NOT_GENERATED = "Project not generated"
 DEEP_MSG_DATA_CANNOT_IDENTIFY_IMAGE = "%s could not identify image file : %s"
 DEEP_MSG_DATA_CANNOT_FIND_IMAGE = "Image not found : %s"
 DEEP_MSG_DATA_CANNOT_LOAD_IMAGE = "%s could not open image file %s"
+DEEP_MSG_DATA_CANNOT_LOAD_VIDEO = "OpenCV could not open video file %s"
+DEEP_MSG_DATA_VIDEO_FRAME_SHAPE = "The frame %i of the video file %s has the shape %s instead of %s"
+DEEP_MSG_DATA_SEQUENCE_SHAPES = "The image %s has the shape %s, the previous images of its sequence have the shape %s"
+DEEP_MSG_DATA_NPY_VERSION = "The member %s of the archive %s has an unknown .npy format version : %s"
 DEEP_MSG_DATA_NOT_HANDLED = "The type of the following data is not handled : %s"
 DEEP_MSG_DATA_SOURCE_NOT_FOUND = "Source path not found : %s"
 DEEP_MSG_DATA_IS_NONE = "The following data is None : %s"
 DEEP_MSG_DATA_ENTRY = "Please check the following entry format : %s"
+DEEP_MSG_DATA_MIXED_TYPES = "The entry %i mixes numbers and other types of data : %s"
+DEEP_MSG_DATA_TYPE_MISMATCH = "The data %s (row %i) does not have the type of the entry %i"
+DEEP_MSG_DATA_DTYPE_NOT_HANDLED = "The following output dtype is not handled : %s (available : %s)"
+DEEP_MSG_CACHE_TOO_MANY_DIMENSIONS = "Cannot cache a sample with %i dimensions (maximum %i)"
+DEEP_MSG_SHARDS_TYPE_NOT_HANDLED = "Cannot pack the entry %i of type %i into shards (images, numpy arrays, numbers and sequences of them only)"
+DEEP_MSG_SHARDS_INDEX_NOT_FOUND = "No shard index found in %s (the shards are written by 'deeplodocus pack')"
+DEEP_MSG_SHARDS_NO_INPUTS = "Nothing to pack : the '%s' dataset of %s has no inputs"
+DEEP_MSG_DATA_SHAPES_NOT_HANDLED = "Cannot group the instances by the shape of the first input of type %i (images and numpy arrays only)"
+DEEP_MSG_DATA_SHAPES_NOT_RECORDED = "The shapes of the '%s' dataset have not been recorded at load (record_shapes), the instances cannot be grouped by shape"
 # DEEP_INFO
 DEEP_MSG_DATA_SUMMARY = "Summary of the '%s' dataset :\n%s"
+DEEP_MSG_CACHE_WRITING = "Materializing the '%s' dataset into %s"
+DEEP_MSG_CACHE_FOUND = "Using the materialized '%s' dataset : %s"
+DEEP_MSG_DATA_MANIFEST_FOUND = "Using the cached list of files of %s : %s"
+DEEP_MSG_SHARDS_WRITING = "Packing the '%s' dataset into %s"
+DEEP_MSG_SHARDS_WRITTEN = "%i instances packed into %i shards : %s"
+DEEP_MSG_SHARDS_SUMMARY = "Summary of the '%s' dataset : %i instances in %i shards (%s)"
+DEEP_MSG_SAMPLE_CACHE_CREATED = "Caching the decoded samples of the '%s' dataset (%s, %.1f MB)"
+DEEP_MSG_SAMPLE_CACHE_SUMMARY = "Sample cache of the '%s' dataset : %i hits, %i misses (hit rate %.1f%%), %.1f MB used"
+DEEP_MSG_DATA_SHAPES_RECORDED = "The instances of the '%s' dataset have %i different shapes"
+
+# DEEP_WARNING
+DEEP_MSG_CACHE_NOTHING_TO_CACHE = "The '%s' dataset has no image entry to materialize"
+DEEP_MSG_SHARDS_NO_SHARED_MEMORY = "The '%s' dataset is read from shards, the mini-batches are not sent through shared memory"
+DEEP_MSG_BUCKETS_NO_SHARED_MEMORY = "The mini-batches of the '%s' dataset have different shapes, they are not sent through shared memory"
+DEEP_MSG_SHUFFLE_NOT_FOUND = "The shuffling method %s does not exist, the instances of the '%s' dataset are not shuffled"
 
 # DEEP_SUCCESS
 DEEP_MSG_DATA_LOADED = "The '%s' dataset has been successfully loaded"
@@ -68,3 +101,34 @@ DEEP_MSG_DATA_LOADED = "The '%s' dataset has been successfully loaded"
 DEEP_MSG_CV_LIBRARY_SET = "Set cv library to : %s"
 DEEP_MSG_CV_LIBRARY_NOT_IMPLEMENTED = "The following image module is not implemented : %s"
 
+
+#####################
+# DEEP_MSG_TRAINING #
+#####################
+
+# DEEP_INFO
+DEEP_MSG_DISTRIBUTED_START = "Starting %i training processes (%s backend, %s)"
+DEEP_MSG_DISTRIBUTED_PROCESS = "Training process %i of %i started (%i threads)"
+
+# DEEP_FATAL
+DEEP_MSG_ACCUMULATION_STEPS_INVALID = "The number of accumulation steps must be a positive integer, got : %s"
+DEEP_MSG_MIXED_PRECISION_NOT_AVAILABLE = "The mixed precision on CPU requires PyTorch 1.10+, got : %s"
+DEEP_MSG_LOSS_SCALING_NOT_AVAILABLE = "The loss scaling on CPU requires PyTorch 2.3+, got : %s"
+DEEP_MSG_EVALUATION_EMPTY = "The '%s' dataset has no instance to evaluate the model on"
+
+
+#######################
+# DEEP_MSG_PREDICTION #
+#######################
+
+# DEEP_FATAL
+DEEP_MSG_PREDICTION_SIZE_UNKNOWN = "The number of instances to predict is unknown, the %s sink cannot be preallocated"
+DEEP_MSG_PREDICTION_BUFFER_TOO_SMALL = "The output buffer of the prediction holds %i instances, more were predicted"
+DEEP_MSG_PREDICTION_PARQUET = "The Parquet sink requires pyarrow : %s"
+
+# DEEP_WARNING
+DEEP_MSG_PREDICTION_INCOMPLETE = "The prediction stopped before the last mini-batch, the predictions written to %s are incomplete"
+DEEP_MSG_PREDICTION_ROWS_MISSING = "%i instances were predicted out of %i, the other rows of %s are left empty"
+
+# DEEP_SUCCESS
+DEEP_MSG_PREDICTION_SAVED = "The predictions have been written to : %s"
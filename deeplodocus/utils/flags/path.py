@@ -3,3 +3,4 @@ from deeplodocus.utils import get_main_path
 DEEP_PATH_NOTIFICATION = r"%s/logs" % get_main_path()
 DEEP_PATH_HISTORY = r"%s/results/history" % get_main_path()
 DEEP_PATH_SAVE_MODEL = r"%s/results/models" % get_main_path()
+DEEP_PATH_CACHE = r"%s/cache" % get_main_path()
@@ -21,8 +21,9 @@ def sorted_nicely(l):
     l -- The iterable to be sorted.
 
     """
+    split = re.compile('([0-9]+)').split
     convert = lambda text: int(text) if text.isdigit() else text
-    alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
+    alphanum_key = lambda key: [convert(c) for c in split(key)]
     return sorted(l, key=alphanum_key)
 
 
@@ -114,6 +115,9 @@ def is_np_array(data):
     try:
         if data.endswith(DEEP_EXT_NPY) or data.endswith(DEEP_EXT_NPZ):
             return True
+        # A member of a .npz archive (archive.npz:member)
+        if DEEP_EXT_NPZ + DEEP_NPZ_MEMBER_SEPARATOR in data:
+            return True
     except:
         return False
 
@@ -1,8 +1,8 @@
 import os
 import shutil
 import datetime
-import __main__
 
+from deeplodocus.utils import get_main_path
 from deeplodocus.utils.flags import *
 
 
@@ -20,7 +20,7 @@ class Logs(object):
     """
 
     def __init__(self, type: str,
-                 directory: str ="%s/logs" % os.path.dirname(os.path.abspath(__main__.__file__)),
+                 directory: str ="%s/logs" % get_main_path(),
                  extension: str = ".csv",
                  write_time=True) -> None:
         """
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The test modules import the dataset and the model of dummies.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
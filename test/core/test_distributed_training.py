@@ -0,0 +1,89 @@
+"""
+Check that a distributed training of the Frontal Lobe (2 spawned processes, gloo backend) ends with the same weights
+in every process, that these weights are written back to the model of the Frontal Lobe
+and that the datasets are loaded once, by the main process
+"""
+import os
+
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.nn as nn
+
+from deeplodocus.brain.frontal_lobe import FrontalLobe
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.utils.namespace import Namespace
+
+from dummies import PairModel
+
+NUM_INSTANCES = 20
+
+
+class WeightsLobe(FrontalLobe):
+    """
+    A Frontal Lobe recording the processes loading the datasets and saving the weights of each process
+    after the training (without history nor saved models)
+    """
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+
+    def _FrontalLobe__train_process(self, rank: int, world_size: int, *args) -> None:
+        super()._FrontalLobe__train_process(rank, world_size, *args)
+        torch.save(self.model.state_dict(), os.path.join(self.directory, "weights_%i.pt" % rank))
+
+    def _FrontalLobe__load_dataset(self, data, transforms, name, record_shapes=False):
+        with open(os.path.join(self.directory, "loads.txt"), "a") as file:
+            file.write("%s %i\n" % (name, os.getpid()))
+        return super()._FrontalLobe__load_dataset(data, transforms, name, record_shapes)
+
+    def load_memory(self):
+        with open(os.path.join(self.directory, "memory_%i" % dist.get_rank()), "w"):
+            pass
+
+
+def line_files(directory: str) -> dict:
+    # Values labelled with a line
+    values = np.arange(NUM_INSTANCES) / NUM_INSTANCES
+    np.savetxt(os.path.join(directory, "inputs.txt"), values)
+    np.savetxt(os.path.join(directory, "labels.txt"), 3 * values + 1)
+    return {"inputs": [os.path.join(directory, "inputs.txt")] * 2,
+            "labels": [os.path.join(directory, "labels.txt")],
+            "additional_data": [None],
+            "number": NUM_INSTANCES}
+
+
+def test_distributed_training(tmp_path):
+    data = line_files(str(tmp_path))
+    lobe = WeightsLobe(str(tmp_path))
+    lobe.config = Namespace({"training": {"num_epochs": 2,
+                                          "initial_epoch": 0,
+                                          "shuffle": 2,
+                                          "seed": 3,
+                                          "distributed": {"world_size": 2,
+                                                          "backend": "gloo",
+                                                          "init_method": "file://%s/rendezvous" % tmp_path,
+                                                          "start_method": "spawn"}},
+                             "history": {"verbose": 0},
+                             "data": {"dataloader": {"batch_size": 4, "num_workers": 0},
+                                      "dataset": {"train": data, "validation": data}},
+                             "transform": {"train": {}, "validation": {}}})
+    torch.manual_seed(0)
+    lobe.model = PairModel(nn.Sequential(nn.Unflatten(0, (-1, 1)), nn.Linear(1, 1), nn.Flatten(0))).double()
+    lobe.optimizer = torch.optim.SGD(lobe.model.parameters(), lr=0.1)
+    lobe.losses = {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+    lobe.metrics = {}
+    initial = {key: value.clone() for key, value in lobe.model.state_dict().items()}
+    lobe.train()
+    # The datasets are loaded (and their lengths confirmed) by the main process only
+    with open(os.path.join(str(tmp_path), "loads.txt")) as file:
+        assert sorted(file.read().split("\n")[:-1]) == ["Trainer %i" % os.getpid(), "Validator %i" % os.getpid()]
+    # Only the process of rank 0 sends signals to the callbacks
+    assert sorted(name for name in os.listdir(str(tmp_path)) if name.startswith("memory")) == ["memory_0"]
+    weights = [torch.load(os.path.join(str(tmp_path), "weights_%i.pt" % rank)) for rank in range(2)]
+    trained = lobe.model.state_dict()
+    for key, value in trained.items():
+        assert torch.equal(weights[0][key], weights[1][key])
+        assert torch.equal(value, weights[0][key])
+        assert not torch.equal(value, initial[key])
@@ -0,0 +1,105 @@
+"""
+Check that the gradient of each optimizer step is the mean of the gradients of its mini-batches,
+including when the loader yields more or fewer mini-batches than expected (e.g. the estimated length of a stream of shards)
+"""
+import io
+import sys
+import numpy as np
+import torch
+import torch.nn as nn
+
+from deeplodocus.brain.thalamus import Thalamus
+from deeplodocus.core.inference.trainer import Trainer
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+
+def line_dataset(length: int) -> ArrayDataset:
+    # Pairs of values labelled with a line of their index
+    values = (np.arange(length) / length).astype(np.float32)[:, None]
+    return ArrayDataset(inputs=[values, values], labels=[3 * values + 1], name="Line")
+
+
+def pair_model() -> PairModel:
+    return PairModel(nn.Linear(1, 1))
+
+
+class RecordingSGD(torch.optim.SGD):
+    """
+    An optimizer without learning rate recording the gradients of each step
+    """
+
+    def __init__(self, params):
+        super().__init__(params, lr=0.0)
+        self.gradients = []
+
+    def step(self, closure=None):
+        self.gradients.append([p.grad.clone() for group in self.param_groups for p in group["params"]])
+        return super().step(closure)
+
+
+def minibatch_gradients(model: nn.Module, dataset: ArrayDataset, batch_size: int) -> list:
+    gradients = []
+    for start in range(0, len(dataset), batch_size):
+        model.zero_grad()
+        instances = [dataset[index] for index in range(start, min(start + batch_size, len(dataset)))]
+        inputs = torch.tensor(np.stack([instance[0][0] for instance in instances]))
+        labels = torch.tensor(np.stack([instance[1][0] for instance in instances]))
+        nn.MSELoss()(model(inputs, inputs), labels).backward()
+        gradients.append([p.grad.clone() for p in model.parameters()])
+    return gradients
+
+
+def step_gradients(accumulation_steps: int, num_minibatches: int = None) -> list:
+    torch.manual_seed(0)
+    model = pair_model()
+    optimizer = RecordingSGD(model.parameters())
+    losses = {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+    tester = Tester(model=model, dataset=line_dataset(10), metrics={}, losses=losses, batch_size=10, num_workers=0)
+    trainer = Trainer(model=model, dataset=line_dataset(100), metrics={}, losses=losses, optimizer=optimizer,
+                      num_epochs=1, initial_epoch=0, batch_size=10, num_workers=0, tester=tester, shuffle=None,
+                      verbose=0, accumulation_steps=accumulation_steps)
+    if num_minibatches is not None:
+        trainer.num_minibatches = num_minibatches
+    # Answer no when the trainer asks to continue the training
+    stdin, sys.stdin = sys.stdin, io.StringIO("n\n")
+    try:
+        trainer.fit()
+    finally:
+        sys.stdin = stdin
+    return optimizer.gradients
+
+
+def check_steps(gradients: list, steps: list) -> None:
+    torch.manual_seed(0)
+    expected = minibatch_gradients(pair_model(), line_dataset(100), batch_size=10)
+    assert len(gradients) == len(steps)
+    for step_gradient, minibatches in zip(gradients, steps):
+        for index, gradient in enumerate(step_gradient):
+            mean = torch.stack([expected[minibatch][index] for minibatch in minibatches]).mean(dim=0)
+            assert torch.allclose(gradient, mean, atol=1e-6)
+
+
+def test_accumulation():
+    # 10 mini-batches in steps of 4 : the last step has 2 mini-batches
+    check_steps(step_gradients(accumulation_steps=4), [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+
+def test_more_minibatches_than_expected():
+    # 5 mini-batches expected out of 10 : each extra mini-batch is an optimizer step on its own
+    check_steps(step_gradients(accumulation_steps=4, num_minibatches=5),
+                [[0, 1, 2, 3], [4], [5], [6], [7], [8], [9]])
+
+
+def test_fewer_minibatches_than_expected():
+    # 13 mini-batches expected out of 10 : the last step is stepped with its 2 mini-batches
+    check_steps(step_gradients(accumulation_steps=4, num_minibatches=13), [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+
+if __name__ == "__main__":
+    test_accumulation()
+    test_more_minibatches_than_expected()
+    test_fewer_minibatches_than_expected()
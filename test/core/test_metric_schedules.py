@@ -0,0 +1,95 @@
+"""
+Check when each metric is computed (DEEP_METRIC_SCHEDULE flags) and that the metrics computed once per epoch
+get the same predictions with and without the shared memory ring
+"""
+import io
+import sys
+import numpy as np
+import torch
+import torch.nn as nn
+
+from deeplodocus.brain.thalamus import Thalamus
+from deeplodocus.core.inference.trainer import Trainer
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.core.metrics.metric import Metric
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+
+def square_dataset(length: int) -> ArrayDataset:
+    # Pairs of vectors labelled with the square of their index
+    vectors = np.repeat(np.arange(length, dtype=np.float32)[:, None], 2, axis=1)
+    return ArrayDataset(inputs=[vectors, vectors], labels=[(np.arange(length) ** 2).astype(np.float32)[:, None]],
+                        name="Squares")
+
+
+def pair_model() -> PairModel:
+    return PairModel(nn.Linear(4, 1), concatenate=True)
+
+
+class CallCounter(object):
+    """
+    A metric counting its calls and keeping the labels it receives
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.labels = []
+
+    def __call__(self, outputs, labels):
+        self.calls += 1
+        self.labels.append(labels.flatten().tolist())
+        return (outputs - labels).abs().mean()
+
+
+def make_losses() -> dict:
+    return {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+
+
+def epoch_labels(shared_memory: bool) -> list:
+    counter = CallCounter()
+    metrics = {"epoch": Metric(name="epoch", method=counter, schedule=DEEP_METRIC_SCHEDULE_EPOCH)}
+    tester = Tester(model=pair_model(), dataset=square_dataset(11), metrics=metrics, losses=make_losses(),
+                    batch_size=1, num_workers=1, shared_memory=shared_memory)
+    tester.evaluate(tester.model)
+    assert counter.calls == 1
+    return counter.labels[0]
+
+
+def test_epoch_metric_shared_memory():
+    # The ring has fewer slots than mini-batches : its slots are reused during the epoch
+    expected = [float(i ** 2) for i in range(11)]
+    assert epoch_labels(shared_memory=False) == expected
+    assert epoch_labels(shared_memory=True) == expected
+
+
+def test_schedules():
+    torch.manual_seed(0)
+    model = pair_model()
+    counters = {schedule: CallCounter() for schedule in DEEP_METRIC_SCHEDULE_ALL}
+    metrics = {str(schedule): Metric(name=str(schedule), method=counter, schedule=schedule, every=3)
+               for schedule, counter in counters.items()}
+    tester = Tester(model=model, dataset=square_dataset(30), metrics=metrics, losses=make_losses(),
+                    batch_size=10, num_workers=0)
+    trainer = Trainer(model=model, dataset=square_dataset(100), metrics=metrics, losses=make_losses(),
+                      optimizer=torch.optim.SGD(model.parameters(), lr=0.0), num_epochs=1, initial_epoch=0,
+                      batch_size=10, num_workers=0, tester=tester, shuffle=None, verbose=0)
+    # Answer no when the trainer asks to continue the training
+    stdin, sys.stdin = sys.stdin, io.StringIO("n\n")
+    try:
+        trainer.fit()
+    finally:
+        sys.stdin = stdin
+    # 10 training mini-batches (10 optimizer steps) and 3 validation mini-batches
+    assert counters[DEEP_METRIC_SCHEDULE_BATCH].calls == 10 + 3
+    assert counters[DEEP_METRIC_SCHEDULE_EVERY_N].calls == 4 + 3
+    assert counters[DEEP_METRIC_SCHEDULE_VALIDATION].calls == 3
+    assert counters[DEEP_METRIC_SCHEDULE_EPOCH].calls == 1 + 1
+    assert [len(labels) for labels in counters[DEEP_METRIC_SCHEDULE_EPOCH].labels] == [100, 30]
+
+
+if __name__ == "__main__":
+    test_epoch_metric_shared_memory()
+    test_schedules()
@@ -0,0 +1,125 @@
+"""
+Check the built-in metrics of deeplodocus.core.metrics against numpy references on fixed inputs
+(scikit-learn is used as well when it is installed)
+"""
+import numpy as np
+import torch
+
+from deeplodocus.core.metrics.classification import Accuracy, TopKAccuracy, ConfusionMatrix, Precision, Recall, F1Score
+from deeplodocus.core.metrics.metric import Metric
+from deeplodocus.core.metrics.regression import MeanAbsoluteError, MeanSquaredError
+from deeplodocus.core.metrics.segmentation import IoU
+from deeplodocus.utils.flags.module import DEEP_MODULE_METRICS
+from deeplodocus.utils.generic_utils import browse_module
+
+try:
+    import sklearn.metrics
+except ImportError:
+    sklearn = None
+
+num_classes = 4
+generator = torch.Generator().manual_seed(0)
+outputs = torch.randn(60, num_classes, generator=generator)
+labels = torch.randint(0, num_classes, (60,), generator=generator)
+predictions = outputs.argmax(dim=1).numpy()
+y = labels.numpy()
+
+
+def confusion_matrix(y_true: np.ndarray, y_pred: np.ndarray, n: int) -> np.ndarray:
+    matrix = np.zeros((n, n), dtype=np.int64)
+    np.add.at(matrix, (y_true, y_pred), 1)
+    return matrix
+
+
+def class_scores(matrix: np.ndarray, score: str) -> tuple:
+    true_positives = np.diag(matrix).astype(np.float64)
+    labelled, predicted = matrix.sum(axis=1), matrix.sum(axis=0)
+    denominators = {"precision": predicted,
+                    "recall": labelled,
+                    "f1": (labelled + predicted) / 2,
+                    "iou": labelled + predicted - true_positives}[score]
+    scores = np.divide(true_positives, denominators, out=np.zeros(len(matrix)), where=denominators > 0)
+    # The macro average is over the classes present in the labels or the predictions
+    present = (labelled + predicted) > 0
+    micro = true_positives.sum() / max(denominators.sum(), 1)
+    return scores[present].mean(), micro, scores
+
+
+def close(value: torch.Tensor, reference: float) -> bool:
+    return np.isclose(float(value), reference, atol=1e-6)
+
+
+def test_accuracy():
+    assert close(Accuracy()(outputs, labels), (predictions == y).mean())
+    top_3 = np.argsort(-outputs.numpy(), axis=1)[:, :3]
+    assert close(TopKAccuracy(k=3)(outputs, labels), (top_3 == y[:, None]).any(axis=1).mean())
+    assert close(TopKAccuracy(k=10)(outputs, labels), 1.0)
+    # Binary probabilities, labels (N, 1) and an ignored label
+    probabilities = torch.sigmoid(outputs[:, 0])
+    binary = (labels % 2).reshape(-1, 1)
+    assert close(Accuracy(threshold=0.5)(probabilities, binary),
+                 ((probabilities.numpy() > 0.5) == binary.numpy()[:, 0]).mean())
+    ignored = labels.clone()
+    ignored[:10] = -1
+    assert close(Accuracy(ignore_index=-1)(outputs, ignored), (predictions[10:] == y[10:]).mean())
+    if sklearn is not None:
+        assert close(Accuracy()(outputs, labels), sklearn.metrics.accuracy_score(y, predictions))
+
+
+def test_confusion_matrix_scores():
+    matrix = confusion_matrix(y, predictions, num_classes)
+    assert np.array_equal(ConfusionMatrix(num_classes)(outputs, labels).numpy(), matrix)
+    for metric, score in ((Precision, "precision"), (Recall, "recall"), (F1Score, "f1")):
+        macro, micro, scores = class_scores(matrix, score)
+        assert close(metric(num_classes, average="macro")(outputs, labels), macro)
+        assert close(metric(num_classes, average="micro")(outputs, labels), micro)
+        assert close(metric(num_classes, average="binary")(outputs, labels), scores[1])
+    if sklearn is not None:
+        assert np.array_equal(ConfusionMatrix(num_classes)(outputs, labels).numpy(),
+                              sklearn.metrics.confusion_matrix(y, predictions))
+        assert close(F1Score(num_classes)(outputs, labels), sklearn.metrics.f1_score(y, predictions, average="macro"))
+
+
+def test_iou():
+    segmentation = torch.randn(2, 3, 6, 6, generator=generator)
+    pixels = torch.randint(0, 3, (2, 6, 6), generator=generator)
+    pixels[0, 0] = 255
+    kept = pixels.numpy().reshape(-1) != 255
+    matrix = confusion_matrix(pixels.numpy().reshape(-1)[kept], segmentation.argmax(dim=1).numpy().reshape(-1)[kept], 3)
+    macro, micro, _ = class_scores(matrix, "iou")
+    assert close(IoU(3, ignore_index=255)(segmentation, pixels), macro)
+    assert close(IoU(3, average="micro", ignore_index=255)(segmentation, pixels), micro)
+
+
+def test_regression():
+    values = torch.randn(30, 2, generator=generator)
+    targets = torch.randn(30, 2, generator=generator)
+    assert close(MeanAbsoluteError()(values, targets), np.abs(values.numpy() - targets.numpy()).mean())
+    assert close(MeanSquaredError()(values, targets), ((values.numpy() - targets.numpy()) ** 2).mean())
+
+
+def test_update_compute():
+    # The statistics summed over mini-batches give the value of the whole set
+    for metric in (Accuracy(), TopKAccuracy(k=2), F1Score(num_classes), IoU(num_classes), MeanSquaredError()):
+        targets = labels if not isinstance(metric, MeanSquaredError) else outputs.flip(0)
+        for start in range(0, 60, 25):
+            metric.update(outputs[start:start + 25], targets[start:start + 25])
+        assert torch.isclose(metric.compute(), metric(outputs, targets))
+        metric.reset()
+        assert metric.compute() is None
+
+
+def test_discovery():
+    f1_score = browse_module(DEEP_MODULE_METRICS, "F1Score")
+    assert f1_score is F1Score
+    metric = Metric(name="f1", method=f1_score(num_classes=num_classes))
+    assert close(metric.call(None, outputs, labels, None), class_scores(confusion_matrix(y, predictions, 4), "f1")[0])
+
+
+if __name__ == "__main__":
+    test_accuracy()
+    test_confusion_matrix_scores()
+    test_iou()
+    test_regression()
+    test_update_compute()
+    test_discovery()
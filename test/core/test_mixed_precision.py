@@ -0,0 +1,112 @@
+"""
+Check the mixed precision of the Trainer : the model runs in bfloat16 inside the autocast context,
+the losses which opted out receive float32 outputs, the loss scaler scales each step and the training still converges
+"""
+import io
+import sys
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+
+from deeplodocus.brain.thalamus import Thalamus
+from deeplodocus.core.inference.generic_evaluator import GenericEvaluator
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.inference.trainer import Trainer
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+pytestmark = pytest.mark.skipif(getattr(getattr(torch, "amp", None), "GradScaler", None) is None,
+                                reason="The loss scaling on CPU requires PyTorch 2.3+")
+
+
+class RecordingMSE(nn.Module):
+    """
+    A mean squared error recording the data type of the outputs it receives
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.dtypes = []
+
+    def forward(self, outputs, labels):
+        self.dtypes.append(outputs.dtype)
+        return nn.functional.mse_loss(outputs.float(), labels.float())
+
+
+class RecordingScaler(torch.amp.GradScaler):
+    """
+    A loss scaler of the CPU counting its calls
+    """
+
+    def __init__(self):
+        super().__init__("cpu")
+        self.calls = {"scale": 0, "step": 0, "update": 0}
+
+    def scale(self, outputs):
+        self.calls["scale"] += 1
+        return super().scale(outputs)
+
+    def step(self, optimizer, *args, **kwargs):
+        self.calls["step"] += 1
+        return super().step(optimizer, *args, **kwargs)
+
+    def update(self, new_scale=None):
+        self.calls["update"] += 1
+        return super().update(new_scale)
+
+
+def record_output(module: nn.Module, inputs, output) -> None:
+    # A forward hook recording the data type of the outputs (picklable, the signals of the Trainer send the model)
+    module.dtypes.append(output.dtype)
+
+
+def line_dataset(length: int) -> ArrayDataset:
+    values = (np.arange(length) / length).astype(np.float32)[:, None]
+    return ArrayDataset(inputs=[values, values], labels=[3 * values + 1], name="Line")
+
+
+def mean_error(model: nn.Module) -> float:
+    values = torch.tensor(line_dataset(100).entries[DEEP_ENTRY_INPUT][0])
+    with torch.no_grad():
+        return nn.functional.mse_loss(model(values, values), 3 * values + 1).item()
+
+
+def test_mixed_precision():
+    torch.manual_seed(0)
+    model = PairModel(nn.Linear(1, 1))
+    model.dtypes = []
+    model.register_forward_hook(record_output)
+    mixed, opted_out = RecordingMSE(), RecordingMSE()
+    losses = {"mixed": Loss(name="mixed", loss=mixed, weight=1.0),
+              "opted_out": Loss(name="opted_out", loss=opted_out, weight=1.0, autocast=False)}
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    scaler = RecordingScaler()
+    tester = Tester(model=model, dataset=line_dataset(10), metrics={}, losses=losses, batch_size=10, num_workers=0,
+                    autocast=True)
+    trainer = Trainer(model=model, dataset=line_dataset(100), metrics={}, losses=losses, optimizer=optimizer,
+                      num_epochs=3, initial_epoch=0, batch_size=10, num_workers=0, tester=tester, shuffle=None,
+                      verbose=0, autocast=True, grad_scaler=scaler)
+    # The context only runs in mixed precision when enabled
+    with trainer.autocast_context():
+        assert GenericEvaluator.is_autocast_enabled() is True
+    with Tester(model=model, dataset=line_dataset(10), metrics={}, losses=losses, num_workers=0).autocast_context():
+        assert GenericEvaluator.is_autocast_enabled() is False
+    error = mean_error(model)
+    model.dtypes.clear()
+    # Answer no when the trainer asks to continue the training
+    stdin, sys.stdin = sys.stdin, io.StringIO("n\n")
+    try:
+        trainer.fit()
+    finally:
+        sys.stdin = stdin
+    # 10 optimizer steps per epoch
+    assert scaler.calls == {"scale": 30, "step": 30, "update": 30}
+    assert set(model.dtypes) == {torch.bfloat16}
+    assert set(mixed.dtypes) == {torch.bfloat16}
+    assert set(opted_out.dtypes) == {torch.float32}
+    # The weights stay in float32 and the training converges
+    assert all(parameter.dtype == torch.float32 for parameter in model.parameters())
+    assert mean_error(model) < error / 2
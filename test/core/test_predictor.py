@@ -0,0 +1,101 @@
+"""
+Check that the Predictor only infers in inference mode : the code run between two mini-batches of predict_batches()
+keeps autograd and the mode of the model, even when the prediction stops early,
+and that the sinks only report the predictions written completely
+"""
+import os
+import tempfile
+import numpy as np
+import torch
+import torch.nn as nn
+
+from deeplodocus.core.inference.predictor import Predictor
+from deeplodocus.core.inference.sinks import NpySink, CsvSink, ParquetSink
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+
+def make_predictor(sinks: list = None) -> Predictor:
+    torch.manual_seed(0)
+    # A linear model of the sum of the two values of an instance, with a dropout only active in train mode
+    model = PairModel(nn.Sequential(nn.Linear(1, 1), nn.Dropout(p=0.5)))
+    values = np.arange(10, dtype=np.float32)[:, None]
+    return Predictor(model=model, dataset=ArrayDataset(inputs=[values, values], name="Range"), batch_size=4,
+                     num_workers=0, sinks=sinks)
+
+
+
+def test_between_minibatches():
+    predictor = make_predictor()
+    model = predictor.model
+    model.train()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.0)
+    for minibatch_index, outputs in enumerate(predictor.predict_batches()):
+        # Eval mode : the dropout is not applied (the learning rate is 0, the weights do not change)
+        values = torch.arange(4 * minibatch_index, min(4 * minibatch_index + 4, 10), dtype=torch.float32)
+        assert torch.allclose(outputs, model.layers[0](2 * values.reshape(-1, 1)).detach())
+        # The caller can train the model between two mini-batches
+        assert torch.is_inference_mode_enabled() is False and model.training is True
+        loss = model(torch.ones(2, 1), torch.ones(2, 1)).sum()
+        loss.backward()
+        optimizer.step()
+        optimizer.zero_grad()
+    assert model.training is True
+
+
+def test_stop_early():
+    predictor = make_predictor()
+    predictor.model.train()
+    batches = predictor.predict_batches()
+    next(batches)
+    batches.close()
+    assert predictor.model.training is True
+    predictor.model.eval()
+    next(predictor.predict_batches())
+    assert predictor.model.training is False
+
+
+def test_predict_sinks():
+    predictor = make_predictor()
+    predictor.model.train()
+    outputs = predictor.predict()
+    expected = predictor.model.layers[0](2 * torch.arange(10, dtype=torch.float32).reshape(-1, 1)).detach()
+    assert outputs.shape == (10, 1) and torch.allclose(outputs, expected)
+    directory = tempfile.mkdtemp()
+    npy, csv = os.path.join(directory, "outputs.npy"), os.path.join(directory, "outputs.csv")
+    predictor = make_predictor(sinks=[NpySink(npy), CsvSink(csv)])
+    assert predictor.predict() is None
+    assert np.allclose(np.load(npy), expected.numpy())
+    assert np.allclose(np.loadtxt(csv, delimiter=",").reshape(-1, 1), expected.numpy())
+
+
+def test_incomplete_sinks(capsys):
+    directory = tempfile.mkdtemp()
+    npy, parquet = os.path.join(directory, "outputs.npy"), os.path.join(directory, "outputs.parquet")
+    # The sinks do not report a success when the caller stops before the last mini-batch
+    batches = make_predictor(sinks=[NpySink(npy)]).predict_batches()
+    next(batches)
+    batches.close()
+    output = capsys.readouterr().out
+    assert DEEP_MSG_PREDICTION_INCOMPLETE % npy in output
+    assert DEEP_MSG_PREDICTION_SAVED % npy not in output
+    # Nor when the preallocated file has rows left empty
+    sink = NpySink(npy)
+    sink.open(num_instances=3)
+    sink.write(np.ones((2, 1), dtype=np.float32))
+    sink.close()
+    assert DEEP_MSG_PREDICTION_ROWS_MISSING % (2, 3, npy) in capsys.readouterr().out
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return
+    assert make_predictor(sinks=[ParquetSink(parquet)]).predict() is None
+    assert DEEP_MSG_PREDICTION_SAVED % parquet in capsys.readouterr().out
+    assert pyarrow.parquet.read_table(parquet).num_rows == 10
+
+
+if __name__ == "__main__":
+    test_between_minibatches()
+    test_stop_early()
+    test_predict_sinks()
@@ -0,0 +1,55 @@
+"""
+Check that the means of the losses and the metrics accumulated over mini-batches of different sizes
+are the means over the instances
+"""
+import numpy as np
+import torch
+import torch.nn as nn
+
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.core.metrics.metric import Metric
+from deeplodocus.core.metrics.running_accumulator import RunningAccumulator
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+
+def mean_absolute_label(outputs, labels):
+    return labels.abs().mean()
+
+
+def test_weighted_means():
+    values = torch.arange(10, dtype=torch.float32) ** 2
+    accumulator = RunningAccumulator()
+    for batch in torch.split(values, (4, 4, 2)):
+        accumulator.update({"tensor": batch.mean(), "number": batch.mean().item()}, batch_size=len(batch))
+    assert accumulator.get_count() == 10
+    means = accumulator.compute()
+    assert isinstance(means["tensor"], float)
+    assert np.isclose(means["tensor"], values.mean().item())
+    assert np.isclose(means["number"], values.mean().item())
+    tensors = accumulator.compute(as_tensors=True)
+    assert tensors["tensor"].dtype == torch.float32
+    assert torch.isclose(tensors["tensor"], values.mean())
+    accumulator.reset()
+    assert accumulator.get_count() == 0 and accumulator.compute() == {}
+
+
+def test_tester_weighted_means():
+    # 10 instances in mini-batches of 4 : the last mini-batch has 2 instances
+    values = np.random.default_rng(0).standard_normal((10, 1)).astype(np.float32)
+    dataset = ArrayDataset(inputs=[values, values], labels=[values ** 2], name="Values")
+    metrics = {"label": Metric(name="label", method=mean_absolute_label)}
+    losses = {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+    tester = Tester(model=PairModel(), dataset=dataset, metrics=metrics, losses=losses, batch_size=4, num_workers=0)
+    sum_losses, total_losses, total_metrics = tester.evaluate(tester.model)
+    values = values.astype(np.float64)
+    assert np.isclose(total_metrics["label"], np.abs(values ** 2).mean())
+    assert np.isclose(total_losses["mse"].item(), ((2 * values - values ** 2) ** 2).mean(), rtol=1e-5)
+    assert np.isclose(sum_losses.item(), total_losses["mse"].item())
+
+
+if __name__ == "__main__":
+    test_weighted_means()
+    test_tester_weighted_means()
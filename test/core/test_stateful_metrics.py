@@ -0,0 +1,202 @@
+"""
+Check the metrics updated with each mini-batch and computed once per epoch (update, compute, reset, synchronize)
+and the ranking metrics against exact numpy references
+"""
+import os
+import tempfile
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from deeplodocus.brain.thalamus import Thalamus
+from deeplodocus.callbacks.history import History
+from deeplodocus.core.inference.generic_evaluator import GenericEvaluator
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.core.metrics.metric import Metric
+from deeplodocus.core.metrics.ranking import AUC, AveragePrecision
+from deeplodocus.utils.deep_error import DeepError
+from deeplodocus.utils.distributed import reduce_dict
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+# Distinct scores, one per bin of the histograms : the ranking metrics are exact
+num_instances = 100
+random = np.random.default_rng(0)
+scores = (np.stack([random.permutation(num_instances), random.permutation(num_instances)], axis=1) + 0.5) / num_instances
+targets = (random.random((num_instances, 2)) < scores * 0.8 + 0.1).astype(np.int64)
+
+
+def exact_auc(score: np.ndarray, target: np.ndarray) -> float:
+    # The probability that a positive instance is ranked above a negative instance
+    positives, negatives = score[target == 1], score[target == 0]
+    return (positives[:, None] > negatives[None, :]).mean()
+
+
+def exact_average_precision(score: np.ndarray, target: np.ndarray) -> float:
+    # The mean of the precisions at the rank of each positive instance
+    ranked = target[np.argsort(-score)]
+    precisions = np.cumsum(ranked) / np.arange(1, len(ranked) + 1)
+    return precisions[ranked == 1].mean()
+
+
+class Counter(object):
+    """
+    A stateful metric without a call, counting the instances
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.resets = 0
+
+    def update(self, outputs, labels):
+        self.count += len(labels)
+
+    def compute(self):
+        return torch.tensor(float(self.count))
+
+    def reset(self):
+        self.count = 0
+        self.resets += 1
+
+
+def score_dataset() -> ArrayDataset:
+    # The scores and the targets of one class
+    score = scores[:, :1].astype(np.float32)
+    return ArrayDataset(inputs=[score, np.zeros_like(score)], labels=[targets[:, :1].astype(np.float32)], name="Scores")
+
+
+def test_ranking_metrics():
+    outputs, labels = torch.tensor(scores), torch.tensor(targets)
+    for column in range(2):
+        assert np.isclose(AUC(num_bins=num_instances)(outputs[:, column], labels[:, column]).item(),
+                          exact_auc(scores[:, column], targets[:, column]), atol=1e-6)
+        assert np.isclose(AveragePrecision(num_bins=num_instances)(outputs[:, column], labels[:, column]).item(),
+                          exact_average_precision(scores[:, column], targets[:, column]), atol=1e-6)
+    # Multi-label : the mean over the classes
+    assert np.isclose(AUC(num_bins=num_instances)(outputs, labels).item(),
+                      np.mean([exact_auc(scores[:, c], targets[:, c]) for c in range(2)]), atol=1e-6)
+    # Logits turned into scores by a sigmoid
+    logits = torch.logit(outputs[:, 0].double()).float()
+    assert np.isclose(AUC(num_bins=num_instances, activation="sigmoid")(logits, labels[:, 0]).item(),
+                      exact_auc(scores[:, 0], targets[:, 0]), atol=1e-6)
+
+
+def test_update_compute_reset():
+    metric = Metric(name="auc", method=AUC(num_bins=num_instances), schedule=DEEP_METRIC_SCHEDULE_EPOCH)
+    assert metric.is_stateful() is True
+    assert Metric(name="callable", method=lambda outputs, labels: 0).is_stateful() is False
+    outputs, labels = torch.tensor(scores[:, 0]), torch.tensor(targets[:, 0])
+    for epoch in range(2):
+        metric.reset()
+        # Mini-batches of different sizes
+        for start in range(0, num_instances, 30):
+            metric.update(None, outputs[start:start + 30], labels[start:start + 30], None)
+        # Without a process group, synchronize() leaves the state unchanged
+        metric.synchronize()
+        assert np.isclose(metric.compute().item(), exact_auc(scores[:, 0], targets[:, 0]), atol=1e-6)
+
+
+def test_evaluator_helpers():
+    counter = Counter()
+    metrics = {"count": Metric(name="count", method=counter, schedule=DEEP_METRIC_SCHEDULE_EPOCH),
+               "mean": Metric(name="mean", method=lambda outputs, labels: outputs.mean(),
+                              schedule=DEEP_METRIC_SCHEDULE_EPOCH)}
+    stateful_metrics, other_metrics = GenericEvaluator.split_stateful_metrics(metrics)
+    assert list(stateful_metrics) == ["count"] and list(other_metrics) == ["mean"]
+    for size in (4, 4, 3):
+        GenericEvaluator.update_metrics(stateful_metrics, None, torch.zeros(size), torch.zeros(size), None)
+    assert GenericEvaluator.compute_stateful_metrics(stateful_metrics) == {"count": torch.tensor(11.0)}
+    # A metric without a call can only be computed once per epoch
+    try:
+        Metric(name="count", method=Counter(), schedule=DEEP_METRIC_SCHEDULE_BATCH)
+    except DeepError:
+        pass
+    else:
+        raise AssertionError("A metric without a call was scheduled with each mini-batch")
+
+
+def test_tester_epoch():
+    counter = Counter()
+    metrics = {"auc": Metric(name="auc", method=AUC(num_bins=num_instances), schedule=DEEP_METRIC_SCHEDULE_EPOCH),
+               "count": Metric(name="count", method=counter, schedule=DEEP_METRIC_SCHEDULE_EPOCH)}
+    losses = {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+    tester = Tester(model=PairModel(), dataset=score_dataset(), metrics=metrics, losses=losses,
+                    batch_size=16, num_workers=0)
+    for epoch in range(2):
+        _, _, total_metrics = tester.evaluate(tester.model)
+        assert np.isclose(total_metrics["auc"], exact_auc(scores[:, 0], targets[:, 0]), atol=1e-6)
+        assert total_metrics["count"] == num_instances
+    assert counter.resets == 2
+
+
+def test_history_without_update():
+    # An epoch in which the stateful metric received no mini-batch : the metric has no value
+    metrics = {"auc": Metric(name="auc", method=AUC(), schedule=DEEP_METRIC_SCHEDULE_EPOCH)}
+    metrics["auc"].reset()
+    result_metrics = GenericEvaluator.compute_stateful_metrics(metrics)
+    assert result_metrics == {"auc": None}
+    losses = {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+    # No previous history is loaded (the validation log created with the headers has the default file name)
+    history = History(metrics=metrics, losses=losses, log_dir=tempfile.mkdtemp(),
+                      validation_filename="previous_history_validation.csv")
+    history.on_batch_end(minibatch_index=1, num_minibatches=1, epoch_index=1, total_loss=1.0,
+                         result_losses={"mse": torch.tensor(1.0)}, result_metrics={})
+    history.on_epoch_end(epoch_index=1, num_epochs=1, num_minibatches=1, result_epoch_metrics=result_metrics,
+                         total_validation_loss=1.0, result_validation_losses={"mse": torch.tensor(1.0)},
+                         result_validation_metrics=result_metrics, num_minibatches_validation=1)
+    # The metric is left empty in the saved rows
+    for file_name in ("history_train_epochs.csv", "history_validation.csv"):
+        with open(os.path.join(history.log_dir, file_name)) as file:
+            assert file.read().splitlines()[-1].endswith(",")
+
+
+def synchronized_auc(rank: int, path: str, results, empty_rank: bool) -> None:
+    # Each process updates the metric with half of the instances (the process 1 with none if empty_rank)
+    dist.init_process_group("gloo", init_method="file://" + path, rank=rank, world_size=2)
+    metric = Metric(name="auc", method=AUC(num_bins=num_instances), schedule=DEEP_METRIC_SCHEDULE_EPOCH)
+    metric.reset()
+    if empty_rank is False:
+        metric.update(None, torch.tensor(scores[rank::2, 0]), torch.tensor(targets[rank::2, 0]), None)
+    elif rank == 0:
+        metric.update(None, torch.tensor(scores[:, 0]), torch.tensor(targets[:, 0]), None)
+    metric.synchronize()
+    # The values of the process without any mini-batch are left out of the averages
+    means = reduce_dict({"loss": None if empty_rank and rank == 1 else torch.tensor(float(rank + 1)),
+                         "missing": None},
+                        weight=1 if empty_rank is False or rank == 0 else 0)
+    results.put((rank, (metric.compute().item(), float(means["loss"]), means["missing"])))
+    dist.destroy_process_group()
+
+
+def test_synchronize():
+    if not dist.is_available():
+        return
+    context = mp.get_context("fork")
+    for empty_rank in (False, True):
+        results = context.Queue()
+        path = os.path.join(tempfile.mkdtemp(), "rendezvous")
+        processes = [context.Process(target=synchronized_auc, args=(rank, path, results, empty_rank))
+                     for rank in range(2)]
+        for process in processes:
+            process.start()
+        values = dict(results.get(timeout=60) for _ in processes)
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+        for auc, loss, missing in values.values():
+            assert np.isclose(auc, exact_auc(scores[:, 0], targets[:, 0]), atol=1e-6)
+            assert loss == (1.0 if empty_rank else 1.5)
+            assert missing is None
+
+
+if __name__ == "__main__":
+    test_ranking_metrics()
+    test_update_compute_reset()
+    test_evaluator_helpers()
+    test_tester_epoch()
+    test_history_without_update()
+    test_synchronize()
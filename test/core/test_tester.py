@@ -0,0 +1,110 @@
+"""
+Check that the Tester evaluates a model in eval mode without autograd graph :
+the statistics of the batch normalization are not updated and the mode of the model is restored,
+and that an empty dataset stops the evaluation with an error instead of summing missing losses
+"""
+import os
+import tempfile
+import numpy as np
+import pytest
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from deeplodocus.brain.thalamus import Thalamus
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.utils.deep_error import DeepError
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+
+class RecordingMSE(nn.Module):
+    """
+    A mean squared error recording whether the outputs it receives require a gradient
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requires_grad = []
+
+    def forward(self, outputs, labels):
+        self.requires_grad.append(outputs.requires_grad)
+        return nn.functional.mse_loss(outputs, labels)
+
+
+def line_dataset(length: int) -> ArrayDataset:
+    values = (np.arange(length) / length).astype(np.float32)[:, None]
+    return ArrayDataset(inputs=[values, values], labels=[3 * values + 1], name="Line")
+
+
+def test_batch_norm():
+    torch.manual_seed(0)
+    model = PairModel(nn.Sequential(nn.Linear(1, 4), nn.BatchNorm1d(4), nn.Linear(4, 1)))
+    batch_norm = model.layers[1]
+    # Running statistics different from their initial values
+    model(torch.randn(8, 1), torch.randn(8, 1))
+    mse = RecordingMSE()
+    tester = Tester(model=model, dataset=line_dataset(20), metrics={}, batch_size=8, num_workers=0,
+                    losses={"mse": Loss(name="mse", loss=mse, weight=1.0)})
+    for training in (True, False):
+        model.train(training)
+        statistics = [batch_norm.running_mean.clone(), batch_norm.running_var.clone(),
+                      batch_norm.num_batches_tracked.clone()]
+        sum_losses, total_losses, _ = tester.evaluate(model)
+        assert model.training is training
+        assert torch.equal(batch_norm.running_mean, statistics[0])
+        assert torch.equal(batch_norm.running_var, statistics[1])
+        assert torch.equal(batch_norm.num_batches_tracked, statistics[2])
+        # 3 mini-batches, none requiring a gradient
+        assert mse.requires_grad == [False] * 3
+        assert not sum_losses.requires_grad
+        assert not total_losses["mse"].requires_grad
+        mse.requires_grad.clear()
+    # The evaluation in eval mode : the same losses whatever the mode of the model before
+    model.eval()
+    with torch.no_grad():
+        inputs = torch.tensor(line_dataset(20).entries[DEEP_ENTRY_INPUT][0])
+        expected = nn.functional.mse_loss(model(inputs, inputs), 3 * inputs + 1)
+    assert torch.isclose(tester.evaluate(model)[0], expected)
+
+
+def test_empty_dataset():
+    model = PairModel(nn.Linear(1, 1))
+    tester = Tester(model=model, dataset=line_dataset(0), metrics={}, batch_size=8, num_workers=0,
+                    losses={"mse": Loss(name="mse", loss=RecordingMSE(), weight=1.0)})
+    # No mini-batch : no loss to sum
+    with pytest.raises(DeepError):
+        tester.evaluate(model)
+
+
+def evaluate_empty(rank: int, path: str, results) -> None:
+    # Both processes have no mini-batch : the averaged losses are None
+    dist.init_process_group("gloo", init_method="file://" + path, rank=rank, world_size=2)
+    model = PairModel(nn.Linear(1, 1))
+    tester = Tester(model=model, dataset=line_dataset(0), metrics={}, batch_size=8, num_workers=0,
+                    losses={"mse": Loss(name="mse", loss=RecordingMSE(), weight=1.0)}, rank=rank, world_size=2)
+    try:
+        tester.evaluate(model)
+        results.put((rank, None))
+    except Exception as error:
+        results.put((rank, type(error).__name__))
+    dist.destroy_process_group()
+
+
+def test_empty_dataset_distributed():
+    if not dist.is_available():
+        return
+    context = mp.get_context("fork")
+    results = context.Queue()
+    path = os.path.join(tempfile.mkdtemp(), "rendezvous")
+    processes = [context.Process(target=evaluate_empty, args=(rank, path, results)) for rank in range(2)]
+    for process in processes:
+        process.start()
+    errors = dict(results.get(timeout=60) for _ in processes)
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert errors == {0: DeepError.__name__, 1: DeepError.__name__}
@@ -0,0 +1,41 @@
+"""
+Compare the per-item latency of a row lookup in the ColumnarIndex against the former pandas DataFrame path
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from deeplodocus.data.columnar_index import ColumnarIndex
+
+
+num_rows = 1000000
+num_lookups = 100000
+
+# Two input entries and one label entry, as in the default project
+input1 = ["./images/image%i.png" % i for i in range(num_rows)]
+input2 = ["./images/mask%i.png" % i for i in range(num_rows)]
+label1 = [str(i % 2) for i in range(num_rows)]
+
+indices = np.random.randint(0, num_rows, num_lookups)
+
+
+# Former path : one DataFrame row (a list per cell) looked up with iloc
+data_frame = pd.DataFrame({"inputs": [list(row) for row in zip(input1, input2)],
+                           "labels": [[label] for label in label1]})
+t0 = time.time()
+for index in indices:
+    inputs, labels = data_frame.iloc[index]
+t1 = time.time()
+
+
+# New path : one array access per entry
+columnar_index = ColumnarIndex(inputs=[input1, input2], labels=[label1], additional_data=[])
+t2 = time.time()
+for index in indices:
+    inputs, labels, additional_data = columnar_index.get(index)
+t3 = time.time()
+
+
+print("Time (s) for " + str(num_lookups) + " lookups using the DataFrame : " + str(t1 - t0) + ". Average per item : " + str((t1 - t0) / num_lookups))
+print("Time (s) for " + str(num_lookups) + " lookups using the ColumnarIndex : " + str(t3 - t2) + ". Average per item : " + str((t3 - t2) / num_lookups))
+print("Speed up : x" + str((t1 - t0) / (t3 - t2)))
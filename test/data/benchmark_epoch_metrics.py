@@ -0,0 +1,70 @@
+"""
+Compare an AUC computed once per epoch on the predictions kept from all the mini-batches
+with the AUC updated with each mini-batch (histograms of the scores) : value, memory kept and time per epoch
+"""
+import time
+import torch
+
+from deeplodocus.core.inference.generic_evaluator import GenericEvaluator
+from deeplodocus.core.metrics.metric import Metric
+from deeplodocus.core.metrics.ranking import AUC
+from deeplodocus.core.metrics.running_accumulator import PredictionAccumulator
+from deeplodocus.utils.flags import *
+
+
+def exact_auc(outputs, labels):
+    """
+    The AUC of the sorted scores (rank statistic, without ties)
+    """
+    ranks = torch.empty_like(outputs).scatter_(0, outputs.argsort(), torch.arange(1, len(outputs) + 1,
+                                                                                  dtype=outputs.dtype))
+    positives = labels.bool()
+    num_positives = positives.sum()
+    num_negatives = len(labels) - num_positives
+    return (ranks[positives].sum() - num_positives * (num_positives + 1) / 2) / (num_positives * num_negatives)
+
+
+def stored_epoch(metrics: dict):
+    predictions = PredictionAccumulator(metrics)
+    for outputs, labels in batches:
+        predictions.update(None, outputs, labels, None)
+    kept = sum(t.numel() * t.element_size() for t in predictions.outputs + predictions.labels)
+    return GenericEvaluator.compute_metrics(metrics, *predictions.get())["auc"], kept
+
+
+def stateful_epoch(metrics: dict):
+    for metric in metrics.values():
+        metric.reset()
+    for outputs, labels in batches:
+        GenericEvaluator.update_metrics(metrics, None, outputs, labels, None)
+    kept = sum(t.numel() * t.element_size() for t in metrics["auc"].get_method().state)
+    return GenericEvaluator.compute_stateful_metrics(metrics)["auc"], kept
+
+
+def seconds_per_epoch(function, metrics: dict, repeats: int = 3) -> float:
+    function(metrics)
+    t0 = time.time()
+    for _ in range(repeats):
+        function(metrics)
+    return (time.time() - t0) / repeats
+
+
+num_instances = 2000000
+batch_size = 1000
+
+if __name__ == "__main__":
+    torch.manual_seed(0)
+    scores = torch.rand(num_instances)
+    batches = [(scores[i:i + batch_size], (torch.rand(batch_size) < scores[i:i + batch_size]).long())
+               for i in range(0, num_instances, batch_size)]
+    stored = {"auc": Metric(name="auc", method=exact_auc, schedule=DEEP_METRIC_SCHEDULE_EPOCH)}
+    stateful = {"auc": Metric(name="auc", method=AUC(), schedule=DEEP_METRIC_SCHEDULE_EPOCH)}
+
+    (stored_value, stored_bytes), (stateful_value, stateful_bytes) = stored_epoch(stored), stateful_epoch(stateful)
+    print("AUC on the predictions kept : %.6f. With the histograms : %.6f" % (stored_value, stateful_value))
+    print("Memory kept over the epoch. Predictions : %.1f MB. Histograms : %.3f MB"
+          % (stored_bytes / 1e6, stateful_bytes / 1e6))
+    stored_time = seconds_per_epoch(stored_epoch, stored)
+    stateful_time = seconds_per_epoch(stateful_epoch, stateful)
+    print("Seconds per epoch. Predictions kept : %.3f. Histograms : %.3f. Speed up : x%.2f"
+          % (stored_time, stateful_time, stored_time / stateful_time))
@@ -0,0 +1,124 @@
+"""
+Compare a validation epoch of the Tester (eval mode, without autograd graph) with the previous evaluation loop
+(train mode, autograd graph built then detached) : time per epoch, memory kept by the autograd graph per mini-batch
+and BatchNorm running statistics
+"""
+import time
+import numpy as np
+import torch
+import torch.nn as nn
+
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.utils import dict_utils
+from deeplodocus.utils.flags import *
+
+
+class ImageDataset(object):
+    """
+    A dataset of random float32 images with a binary label, in the Dataset format (inputs, labels, additional_data)
+    """
+
+    def __init__(self, length: int, shape: tuple):
+        rng = np.random.default_rng(0)
+        self.name = "Images"
+        self.images = rng.standard_normal((length,) + shape).astype(np.float32)
+        self.labels = rng.integers(0, 2, length)
+        self.data_types = {DEEP_ENTRY_INPUT: [DEEP_TYPE_NP_ARRAY, DEEP_TYPE_INTEGER],
+                           DEEP_ENTRY_LABEL: [DEEP_TYPE_INTEGER],
+                           DEEP_ENTRY_ADDITIONAL_DATA: []}
+        self.sequence_types = {DEEP_ENTRY_INPUT: [None, None],
+                               DEEP_ENTRY_LABEL: [None],
+                               DEEP_ENTRY_ADDITIONAL_DATA: []}
+
+    def __getitem__(self, index: int):
+        return [self.images[index], 0], [self.labels[index]], []
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def reset(self):
+        pass
+
+
+class ConvNet(nn.Module):
+    """
+    A convolutional network with BatchNorm layers (as the DQN template)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.layers = nn.Sequential(nn.Conv2d(3, 16, kernel_size=5, stride=2), nn.BatchNorm2d(16), nn.ReLU(),
+                                    nn.Conv2d(16, 32, kernel_size=5, stride=2), nn.BatchNorm2d(32), nn.ReLU(),
+                                    nn.Conv2d(32, 32, kernel_size=5, stride=2), nn.BatchNorm2d(32), nn.ReLU(),
+                                    nn.AdaptiveAvgPool2d(1), nn.Flatten(), nn.Linear(32, 2))
+
+    def forward(self, x, unused):
+        return self.layers(x)
+
+
+def previous_evaluate(tester: Tester, model: nn.Module):
+    """
+    The evaluation loop of the Tester before the inference mode
+    """
+    total_losses = dict_utils.like(tester.losses, [])
+    for minibatch in tester.dataloader:
+        inputs, labels, additional_data = tester.clean_single_element_list(tester.collate.convert(minibatch))
+        outputs = model(*inputs)
+        outputs = outputs.detach()
+        batch_losses = tester.compute_metrics(tester.losses, inputs, outputs, labels, additional_data)
+        total_losses = dict_utils.apply(total_losses, dict_utils.apply_weight(batch_losses, tester.losses), "append")
+    return dict_utils.mean(total_losses)
+
+
+def graph_bytes(tester: Tester, model: nn.Module, inference: bool) -> int:
+    """
+    Number of bytes of the tensors saved for the backward pass while inferring one mini-batch
+    """
+    saved = []
+
+    def pack(tensor):
+        saved.append(tensor.numel() * tensor.element_size())
+        return tensor
+
+    minibatch = next(iter(tester.dataloader))
+    inputs, labels, additional_data = tester.clean_single_element_list(tester.collate.convert(minibatch))
+    with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+        if inference:
+            with tester.inference_mode(model):
+                model(*inputs)
+        else:
+            model(*inputs)
+    return sum(saved)
+
+
+def seconds_per_epoch(function, repeats: int = 3) -> float:
+    function()
+    t0 = time.time()
+    for _ in range(repeats):
+        function()
+    return (time.time() - t0) / repeats
+
+
+batch_size = 64
+
+if __name__ == "__main__":
+    torch.manual_seed(0)
+    model = ConvNet()
+    losses = {"cross_entropy": Loss(name="cross_entropy", loss=nn.CrossEntropyLoss(), weight=1.0)}
+    tester = Tester(model=model, dataset=ImageDataset(1024, (3, 96, 96)), metrics={}, losses=losses,
+                    batch_size=batch_size, num_workers=0)
+
+    running_mean = model.layers[1].running_mean.clone()
+    tester.evaluate(model)
+    assert torch.equal(running_mean, model.layers[1].running_mean) and model.training
+    previous_evaluate(tester, model)
+    print("BatchNorm running statistics changed by the previous evaluation : %s. By the Tester : False"
+          % (not torch.equal(running_mean, model.layers[1].running_mean)))
+
+    previous = seconds_per_epoch(lambda: previous_evaluate(tester, model))
+    inference = seconds_per_epoch(lambda: tester.evaluate(model))
+    print("Seconds per validation epoch. Previous evaluation : %.3f. Tester : %.3f. Speed up : x%.2f"
+          % (previous, inference, previous / inference))
+    print("Autograd graph per mini-batch of %i. Previous evaluation : %.1f MB. Tester : %.1f MB"
+          % (batch_size, graph_bytes(tester, model, False) / 1e6, graph_bytes(tester, model, True) / 1e6))
@@ -0,0 +1,116 @@
+"""
+Compare the time spent by compute_metrics to call 12 metrics on a mini-batch with the previous dispatch
+(membership tests of the arguments at every call) and with the call adapters compiled with the metrics,
+with real metrics and with metrics returning a constant (dispatch only)
+"""
+import time
+import torch
+import torch.nn as nn
+
+from deeplodocus.core.inference.generic_evaluator import GenericEvaluator
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.core.metrics.metric import Metric
+from deeplodocus.utils.flags import *
+
+
+def previous_compute_metrics(metrics: dict, inputs, outputs, labels, additional_data) -> dict:
+    """
+    The dispatch of compute_metrics before the call adapters
+    """
+    result_metrics = {}
+    for key, metric in metrics.items():
+        metric_args = metric.get_arguments()
+        metric_method = metric.get_method()
+        if DEEP_ENTRY_INPUT in metric_args:
+            if DEEP_ENTRY_LABEL in metric_args:
+                if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
+                    temp_metric_result = metric_method(inputs, outputs, labels, additional_data)
+                else:
+                    temp_metric_result = metric_method(inputs, outputs, labels)
+            else:
+                if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
+                    temp_metric_result = metric_method(inputs, outputs, additional_data)
+                else:
+                    temp_metric_result = metric_method(inputs, outputs)
+        else:
+            if DEEP_ENTRY_LABEL in metric_args:
+                if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
+                    temp_metric_result = metric_method(outputs, labels, additional_data)
+                else:
+                    temp_metric_result = metric_method(outputs, labels)
+            else:
+                if DEEP_ENTRY_ADDITIONAL_DATA in metric_args:
+                    temp_metric_result = metric_method(outputs, additional_data)
+                else:
+                    temp_metric_result = metric_method(outputs)
+        if metric.is_loss() is True:
+            result_metrics[metric.get_name()] = temp_metric_result
+        else:
+            if isinstance(temp_metric_result, torch.Tensor):
+                temp_metric_result = temp_metric_result.detach()
+            result_metrics[metric.get_name()] = temp_metric_result
+    return result_metrics
+
+
+def mean_output(outputs):
+    return outputs.mean()
+
+
+def accuracy(outputs, labels):
+    return (outputs.argmax(dim=1) == labels).float().mean()
+
+
+def weighted_error(outputs, labels, additional_data):
+    return ((outputs.argmax(dim=1) != labels).float() * additional_data).mean()
+
+
+def input_norm(inputs, outputs):
+    return inputs.norm() / outputs.norm()
+
+
+def constant(outputs):
+    return 0.0
+
+
+def constant_with_labels(outputs, labels):
+    return 0.0
+
+
+def constant_with_additional_data(outputs, labels, additional_data):
+    return 0.0
+
+
+def constant_with_inputs(inputs, outputs):
+    return 0.0
+
+
+def calls_per_second(function, metrics: dict, repeats: int = 2000) -> float:
+    t0 = time.time()
+    for _ in range(repeats):
+        function(metrics, inputs, outputs, labels, additional_data)
+    return repeats / (time.time() - t0)
+
+
+inputs = torch.randn(8, 4)
+outputs = torch.randn(8, 3)
+labels = torch.randint(0, 3, (8,))
+additional_data = torch.rand(8)
+
+if __name__ == "__main__":
+    for name, methods in (("Tensor metrics", (mean_output, accuracy, weighted_error, input_norm)),
+                          ("Constant metrics", (constant, constant_with_labels, constant_with_additional_data,
+                                                constant_with_inputs))):
+        metrics = {}
+        for i, method in enumerate(methods * 3):
+            metrics["metric_%i" % i] = Metric(name="metric_%i" % i, method=method)
+        losses = {"cross_entropy": Loss(name="cross_entropy", loss=nn.CrossEntropyLoss(), weight=1.0)}
+        metrics.update(losses)
+
+        previous = previous_compute_metrics(metrics, inputs, outputs, labels, additional_data)
+        compiled = GenericEvaluator.compute_metrics(metrics, inputs, outputs, labels, additional_data)
+        assert all(torch.equal(torch.as_tensor(previous[key]), torch.as_tensor(compiled[key])) for key in metrics)
+
+        previous = calls_per_second(previous_compute_metrics, metrics)
+        compiled = calls_per_second(GenericEvaluator.compute_metrics, metrics)
+        print("%s (%i). Mini-batches/s with the previous dispatch : %.0f. With the call adapters : %.0f. Speed up : x%.2f"
+              % (name, len(metrics), previous, compiled, compiled / previous))
@@ -0,0 +1,63 @@
+"""
+Compare the number of instances per second given by a Dataset of large .npy / .npz arrays
+read into memory (np.load) and memory-mapped, when the whole array or only a slice of it is used
+"""
+import os
+import time
+import tempfile
+import numpy as np
+
+from deeplodocus.data.dataset import Dataset
+from deeplodocus.utils.flags import *
+
+
+def write_arrays(directory: str, num_arrays: int, shape: tuple) -> tuple:
+    paths = []
+    members = []
+    for i in range(num_arrays):
+        array = np.random.rand(*shape).astype(np.float32)
+        paths.append("%s/array%i.npy" % (directory, i))
+        np.save(paths[-1], array)
+        # An uncompressed archive, the member is mapped directly in the archive
+        np.savez("%s/archive%i.npz" % (directory, i), features=array, other=array[:1])
+        members.append("%s/archive%i.npz:features" % (directory, i))
+    labels = "%s/labels.txt" % directory
+    with open(labels, "w") as f:
+        f.write("\n".join(str(i % 10) for i in range(num_arrays)))
+    lists = []
+    for name, content in (("npy", paths), ("npz", members)):
+        lists.append("%s/%s.txt" % (directory, name))
+        with open(lists[-1], "w") as f:
+            f.write("\n".join(content))
+    return lists[0], lists[1], labels
+
+
+def instances_per_second(list_file: str, labels: str, np_mmap: bool, whole: bool) -> float:
+    dataset = Dataset(list_inputs=[[list_file]],
+                      list_labels=[[labels]],
+                      list_additional_data=[None],
+                      np_mmap=np_mmap,
+                      name="Benchmark")
+    dataset.load()
+    t0 = time.time()
+    for epoch in range(num_epochs):
+        for i in range(len(dataset)):
+            array = dataset[i][0][0]
+            # Use the whole array or only its first slice
+            (array if whole else array[0]).sum()
+    return num_epochs * len(dataset) / (time.time() - t0)
+
+
+num_arrays = 20
+num_epochs = 3
+shape = (64, 256, 256)      # 16 MB per array
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        npy, npz, labels = write_arrays(directory, num_arrays, shape)
+        for name, list_file in (("npy", npy), ("npz member", npz)):
+            for whole in (True, False):
+                read = instances_per_second(list_file, labels, np_mmap=False, whole=whole)
+                mapped = instances_per_second(list_file, labels, np_mmap=True, whole=whole)
+                print("%s, %s : %.1f instances/s read, %.1f memory-mapped. Speed up : x%.2f"
+                      % (name, "whole array" if whole else "first slice", read, mapped, mapped / read))
@@ -0,0 +1,60 @@
+"""
+Compare the number of mini-batches per second received by the main process with the default DataLoader transport
+(pickled mini-batches) and with the shared memory ring, for 1, 4 and 8 workers
+"""
+import time
+import numpy as np
+
+from deeplodocus.core.inference.generic_inferer import GenericInferer
+from deeplodocus.utils.flags import *
+
+
+class SyntheticDataset(object):
+    """
+    A dataset of random uint8 images returning instances in the Dataset format (inputs, labels, additional_data)
+    """
+
+    def __init__(self, length: int, shape: tuple):
+        self.length = length
+        self.image = np.random.randint(0, 255, shape, dtype=np.uint8)
+        self.data_types = {DEEP_ENTRY_INPUT: [DEEP_TYPE_IMAGE],
+                           DEEP_ENTRY_LABEL: [DEEP_TYPE_INTEGER],
+                           DEEP_ENTRY_ADDITIONAL_DATA: []}
+        self.sequence_types = {DEEP_ENTRY_INPUT: [None],
+                               DEEP_ENTRY_LABEL: [None],
+                               DEEP_ENTRY_ADDITIONAL_DATA: []}
+
+    def __getitem__(self, index: int):
+        return [self.image.copy()], [index % 10], []
+
+    def __len__(self) -> int:
+        return self.length
+
+    def reset(self):
+        pass
+
+
+def batches_per_second(dataset, num_workers: int, shared_memory: bool) -> float:
+    inferer = GenericInferer(model=None,
+                             dataset=dataset,
+                             batch_size=batch_size,
+                             num_workers=num_workers,
+                             dtype=DEEP_DTYPE_UINT8,
+                             shared_memory=shared_memory)
+    num_batches = 0
+    t0 = time.time()
+    for minibatch in inferer.dataloader:
+        inputs, labels, additional_data = inferer.clean_single_element_list(inferer.collate.convert(minibatch))
+        num_batches += 1
+    return num_batches / (time.time() - t0)
+
+
+batch_size = 32
+dataset = SyntheticDataset(length=batch_size * 200, shape=(3, 224, 224))
+
+if __name__ == "__main__":
+    for num_workers in (1, 4, 8):
+        default = batches_per_second(dataset, num_workers, shared_memory=False)
+        ring = batches_per_second(dataset, num_workers, shared_memory=True)
+        print("Workers : %i. Batches/s with the default transport : %.1f. With the shared memory ring : %.1f. Speed up : x%.2f"
+              % (num_workers, default, ring, ring / default))
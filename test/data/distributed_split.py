@@ -0,0 +1,66 @@
+"""
+Check the split of a dataset between several processes (gloo backend, CPU only) :
+each process uses distinct instances, all the instances are used and every process gets the same number of mini-batches
+"""
+import os
+import tempfile
+import numpy as np
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+from deeplodocus.core.inference.generic_inferer import GenericInferer
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset
+
+
+def get_indices(inferer: GenericInferer, epoch: int) -> list:
+    inferer.set_epoch(epoch)
+    indices = []
+    for minibatch in inferer.dataloader:
+        inputs, labels, additional_data = inferer.clean_single_element_list(inferer.collate.convert(minibatch))
+        indices.append(labels.flatten().tolist())
+    return indices
+
+
+def run(rank: int, world_size: int, init_file: str):
+    dist.init_process_group("gloo", init_method="file://" + init_file, rank=rank, world_size=world_size)
+    # The label of each instance is its index, its bucket is its index modulo 3
+    indices = np.arange(length)
+    dataset = ArrayDataset(inputs=[np.zeros(length, dtype=np.int64)], labels=[indices], buckets=indices % 3,
+                           name="Index")
+    results = {}
+    for shuffle in (DEEP_SHUFFLE_ALL, DEEP_SHUFFLE_BUCKETS, None):
+        inferer = GenericInferer(model=None, dataset=dataset, batch_size=4, num_workers=0, shuffle=shuffle)
+        results[shuffle] = [get_indices(inferer, epoch) for epoch in (1, 2)]
+    gathered = [None] * world_size
+    dist.all_gather_object(gathered, results)
+    if rank == 0:
+        for shuffle in (DEEP_SHUFFLE_ALL, DEEP_SHUFFLE_BUCKETS, None):
+            for epoch in range(2):
+                batches = [g[shuffle][epoch] for g in gathered]
+                indices = [sum(b, []) for b in batches]
+                used = sum(indices, [])
+                # The padded instances are the only ones used twice
+                assert set(used) == set(range(length))
+                if shuffle is None:
+                    assert sorted(used) == list(range(length))
+                else:
+                    assert len({len(b) for b in batches}) == 1
+                    assert len(used) - length < world_size * 4
+                if shuffle == DEEP_SHUFFLE_BUCKETS:
+                    assert all(len({i % 3 for i in batch}) == 1 for b in batches for batch in b)
+            if shuffle is not None:
+                assert gathered[0][shuffle][0] != gathered[0][shuffle][1]
+        print("The %i processes used distinct instances and the same number of mini-batches" % world_size)
+    dist.destroy_process_group()
+
+
+length = 103
+
+if __name__ == "__main__":
+    for world_size in (2, 3):
+        with tempfile.TemporaryDirectory() as directory:
+            # Forked processes : deeplodocus needs the path of the main script when it is imported
+            mp.start_processes(run, args=(world_size, os.path.join(directory, "init")), nprocs=world_size,
+                               start_method="fork")
@@ -0,0 +1,107 @@
+"""
+Train a small model with 1, 2 and 4 processes (gloo backend, CPU only) and compare the epochs per second
+Check that the replicas of the model stay identical and that only the process of rank 0 sends the training signals
+"""
+import io
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+from deeplodocus.brain.thalamus import Thalamus
+from deeplodocus.core.inference.trainer import Trainer
+from deeplodocus.core.inference.tester import Tester
+from deeplodocus.core.metrics.loss import Loss
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset, PairModel
+
+
+def regression_dataset(length: int, size: int) -> ArrayDataset:
+    # Random vectors labelled with a linear function of them, each vector is split into the two inputs
+    rng = np.random.default_rng(0)
+    inputs = rng.standard_normal((length, size)).astype(np.float32)
+    labels = inputs @ rng.standard_normal((size, 1)).astype(np.float32)
+    return ArrayDataset(inputs=[inputs[:, :size // 2], inputs[:, size // 2:]], labels=[labels], name="Regression")
+
+
+class SignalCounter(object):
+    """
+    Count the signals received by the callbacks
+    """
+
+    def __init__(self):
+        self.counts = {}
+        for event in (DEEP_EVENT_ON_TRAINING_START, DEEP_EVENT_ON_EPOCH_START, DEEP_EVENT_ON_BATCH_END,
+                      DEEP_EVENT_ON_EPOCH_END, DEEP_EVENT_ON_TRAINING_END):
+            self.counts[event] = 0
+        Thalamus().connect(receiver=self.on_training_start, event=DEEP_EVENT_ON_TRAINING_START)
+        Thalamus().connect(receiver=self.on_epoch_start, event=DEEP_EVENT_ON_EPOCH_START)
+        Thalamus().connect(receiver=self.on_batch_end, event=DEEP_EVENT_ON_BATCH_END)
+        Thalamus().connect(receiver=self.on_epoch_end, event=DEEP_EVENT_ON_EPOCH_END)
+        Thalamus().connect(receiver=self.on_training_end, event=DEEP_EVENT_ON_TRAINING_END)
+
+    def on_training_start(self, **kwargs):
+        self.counts[DEEP_EVENT_ON_TRAINING_START] += 1
+
+    def on_epoch_start(self, **kwargs):
+        self.counts[DEEP_EVENT_ON_EPOCH_START] += 1
+
+    def on_batch_end(self, **kwargs):
+        self.counts[DEEP_EVENT_ON_BATCH_END] += 1
+
+    def on_epoch_end(self, **kwargs):
+        self.counts[DEEP_EVENT_ON_EPOCH_END] += 1
+
+    def on_training_end(self, **kwargs):
+        self.counts[DEEP_EVENT_ON_TRAINING_END] += 1
+
+
+def run(rank: int, world_size: int, init_file: str, results: dict):
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // world_size))
+    dist.init_process_group("gloo", init_method="file://" + init_file, rank=rank, world_size=world_size)
+    torch.manual_seed(0)
+    model = PairModel(nn.Sequential(nn.Linear(size, 256), nn.ReLU(), nn.Linear(256, 1)), concatenate=True)
+    losses = {"mse": Loss(name="mse", loss=nn.MSELoss(), weight=1.0)}
+    counter = SignalCounter()
+    tester = Tester(model=model, dataset=regression_dataset(length // 4, size), metrics={}, losses=losses,
+                    batch_size=batch_size, num_workers=0)
+    trainer = Trainer(model=model, dataset=regression_dataset(length, size), metrics={}, losses=losses,
+                      optimizer=torch.optim.SGD(model.parameters(), lr=0.01), num_epochs=num_epochs,
+                      initial_epoch=0, batch_size=batch_size, num_workers=0, tester=tester, seed=0)
+    # Answer no when the trainer of a single process asks to continue the training
+    sys.stdin = io.StringIO("n\n")
+    t0 = time.time()
+    trainer.fit()
+    duration = time.time() - t0
+    weights = torch.cat([p.detach().flatten() for p in model.parameters()])
+    gathered = [torch.zeros_like(weights) for _ in range(world_size)]
+    dist.all_gather(gathered, weights)
+    assert all(torch.equal(gathered[0], w) for w in gathered)
+    if rank == 0:
+        assert counter.counts[DEEP_EVENT_ON_BATCH_END] == num_epochs * trainer.get_num_minibatches()
+        results[world_size] = num_epochs / duration
+    else:
+        assert sum(counter.counts.values()) == 0
+    dist.destroy_process_group()
+
+
+length = 8192
+size = 512
+batch_size = 64
+num_epochs = 2
+
+if __name__ == "__main__":
+    results = mp.Manager().dict()
+    for world_size in (1, 2, 4):
+        with tempfile.TemporaryDirectory() as directory:
+            # Forked processes : deeplodocus needs the path of the main script when it is imported
+            mp.start_processes(run, args=(world_size, os.path.join(directory, "init"), results), nprocs=world_size,
+                               start_method="fork")
+        print("Processes : %i. Epochs/s : %.2f. Speed up : x%.2f" % (world_size, results[world_size],
+                                                                    results[world_size] / results[1]))
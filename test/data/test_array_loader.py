@@ -0,0 +1,88 @@
+"""
+Check that the ArrayLoader maps the .npy files (format versions 1.0 and 2.0) and the members of the .npz archives stored
+without compression, reads the compressed members and the other versions, and maps the arrays copy-on-write
+"""
+import io
+import zipfile
+
+import numpy as np
+import pytest
+
+from deeplodocus.data.array_loader import ArrayLoader
+from deeplodocus.utils.deep_error import DeepError
+
+ARRAY = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+
+
+def npy_bytes(array: np.ndarray, version: tuple) -> bytes:
+    buffer = io.BytesIO()
+    np.lib.format.write_array(buffer, array, version=version)
+    return buffer.getvalue()
+
+
+def write_npz(path: str, members: dict, compression: int) -> str:
+    with zipfile.ZipFile(path, "w", compression=compression) as archive:
+        for name, content in members.items():
+            archive.writestr(name + ".npy", content)
+    return path
+
+
+@pytest.mark.parametrize("version", [(1, 0), (2, 0)])
+def test_npy(tmp_path, version):
+    path = str(tmp_path / "array.npy")
+    with open(path, "wb") as file:
+        file.write(npy_bytes(ARRAY, version))
+    mapped = ArrayLoader(mmap=True).load(path)
+    assert isinstance(mapped, np.memmap)
+    assert np.array_equal(mapped, ARRAY)
+    assert np.array_equal(ArrayLoader(mmap=False).load(path), ARRAY)
+
+
+@pytest.mark.parametrize("version", [(1, 0), (2, 0), (3, 0)])
+def test_npz_versions(tmp_path, version):
+    path = write_npz(str(tmp_path / "arrays.npz"), {"first": npy_bytes(ARRAY, version)}, zipfile.ZIP_STORED)
+    array = ArrayLoader(mmap=True).load(path + ":first")
+    # The header of the version 3.0 is not parsed : the member is read
+    assert isinstance(array, np.memmap) is (version != (3, 0))
+    assert np.array_equal(array, ARRAY)
+
+
+def test_npz_unknown_version(tmp_path):
+    content = bytearray(npy_bytes(ARRAY, (1, 0)))
+    # The version follows the 6 bytes of the magic string
+    content[6:8] = bytes([9, 0])
+    path = write_npz(str(tmp_path / "arrays.npz"), {"first": bytes(content)}, zipfile.ZIP_STORED)
+    with pytest.raises(DeepError):
+        ArrayLoader(mmap=True).load(path + ":first")
+
+
+def test_npz_compression(tmp_path):
+    stored = str(tmp_path / "stored.npz")
+    deflated = str(tmp_path / "deflated.npz")
+    np.savez(stored, first=ARRAY, second=-ARRAY)
+    np.savez_compressed(deflated, first=ARRAY, second=-ARRAY)
+    loader = ArrayLoader(mmap=True)
+    for path in (stored, deflated):
+        # The first member if none is given
+        assert np.array_equal(loader.load(path), ARRAY)
+        assert np.array_equal(loader.load(path + ":first"), ARRAY)
+        assert np.array_equal(loader.load(path + ":second"), -ARRAY)
+        assert np.array_equal(ArrayLoader(mmap=False).load(path + ":second"), -ARRAY)
+    # Only the members stored without compression are mapped, the compressed ones are read (not mapped as raw bytes)
+    assert isinstance(loader.load(stored + ":second"), np.memmap)
+    assert not isinstance(loader.load(deflated + ":second"), np.memmap)
+
+
+def test_copy_on_write(tmp_path):
+    npy = str(tmp_path / "array.npy")
+    npz = str(tmp_path / "arrays.npz")
+    np.save(npy, ARRAY)
+    np.savez(npz, first=ARRAY)
+    for data in (npy, npz + ":first"):
+        array = ArrayLoader(mmap=True).load(data)
+        assert array.flags.writeable
+        array[0] = -1
+        # The change stays in the map : the file and the other maps still have the original values
+        assert (array[0] == -1).all()
+        assert np.array_equal(ArrayLoader(mmap=True).load(data), ARRAY)
+        assert np.array_equal(ArrayLoader(mmap=False).load(data), ARRAY)
@@ -0,0 +1,62 @@
+"""
+Check that the Dataset returns the images in their native dtype (uint8) and that the Collate converts the mini-batches
+to the configured dtype, with or without the shared memory ring, including the read-only images of a TensorCache
+"""
+import warnings
+
+import cv2
+import numpy as np
+import pytest
+import torch
+
+from deeplodocus.data.collate import Collate
+from deeplodocus.data.dataset import Dataset
+from deeplodocus.data.shared_memory import SharedMemoryRing
+from deeplodocus.utils.flags import *
+
+
+def image_dataset(directory, materialize: bool) -> tuple:
+    images = [np.random.default_rng(i).integers(0, 256, (4, 5, 3), dtype=np.uint8) for i in range(4)]
+    paths = []
+    for i, image in enumerate(images):
+        paths.append("%s/image%i.png" % (directory, i))
+        cv2.imwrite(paths[-1], image)
+    with open("%s/inputs.txt" % directory, "w") as f:
+        f.write("\n".join(paths))
+    dataset = Dataset(list_inputs=["%s/inputs.txt" % directory], list_labels=[None], list_additional_data=[None],
+                      materialize=materialize, cache_dir="%s/cache" % directory, name="images")
+    dataset.load()
+    # Converted from BGR to RGB, channels first
+    return dataset, [np.swapaxes(image[:, :, ::-1], 0, 2) for image in images]
+
+
+@pytest.mark.parametrize("materialize", [False, True])
+@pytest.mark.parametrize("dtype", [DEEP_DTYPE_UINT8, DEEP_DTYPE_FLOAT16, DEEP_DTYPE_FLOAT32])
+def test_collate(tmp_path, materialize, dtype):
+    dataset, images = image_dataset(tmp_path, materialize)
+    batch = [dataset[index] for index in range(4)]
+    for (inputs, _, _), image in zip(batch, images):
+        assert inputs[0].dtype == np.uint8
+        assert np.array_equal(inputs[0], image)
+        # The images of a materialized dataset are read-only views on the cache
+        assert inputs[0].flags.writeable is not materialize
+    expected = torch.from_numpy(np.stack(images)).to(DEEP_DTYPE_TORCH[dtype])
+    collate = Collate(data_types=dataset.data_types, sequence_types=dataset.sequence_types, dtype=dtype)
+    with warnings.catch_warnings():
+        # PyTorch warns when wrapping a read-only array into a tensor
+        warnings.simplefilter("error")
+        # The Collate may replace the stacked images of the instances : a fresh batch each time
+        minibatch = collate([dataset[index] for index in range(4)])
+        assert minibatch[0][0].dtype == torch.uint8
+        minibatch = collate.convert(minibatch)
+        assert minibatch[0][0].dtype == DEEP_DTYPE_TORCH[dtype]
+        assert torch.equal(minibatch[0][0], expected)
+        # The ring : the images are stacked into a slot and copied out by their conversion
+        collate.set_ring(SharedMemoryRing(example=collate([dataset[0] for _ in range(4)]), num_slots=2))
+        for slot in range(3):
+            minibatch = collate.convert(collate([(slot % 2, dataset[index]) for index in range(4)]))
+            assert minibatch[0][0].dtype == DEEP_DTYPE_TORCH[dtype]
+            assert torch.equal(minibatch[0][0], expected)
+    # The mini-batch does not share memory with the ring
+    collate([(0, dataset[0]) for _ in range(4)])
+    assert torch.equal(minibatch[0][0], expected)
@@ -0,0 +1,72 @@
+"""
+Check the type found for the data of a Dataset : the paths of images may contain spaces,
+the other lines with whitespace-separated items are sequences.
+The numeric columns are integers only if all their values are integers (parsed without rounding),
+every row of a column has the type of its first row
+"""
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from deeplodocus.data.dataset import Dataset
+from deeplodocus.utils.deep_error import DeepError
+from deeplodocus.utils.flags import *
+
+data_type = Dataset._Dataset__data_type
+
+
+def test_data_type():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "an image.png")
+        open(path, "wb").close()
+        assert data_type(path) == DEEP_TYPE_IMAGE
+    assert data_type("image.png") == DEEP_TYPE_IMAGE
+    assert data_type("first.png second.png") == DEEP_TYPE_SEQUENCE
+    assert data_type("1 2 3") == DEEP_TYPE_SEQUENCE
+    assert data_type("1.5") == DEEP_TYPE_FLOAT
+
+
+def load_column(lines: list, lazy_text: bool) -> Dataset:
+    # A dataset of one input column
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "column.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(lines))
+        dataset = Dataset(list_inputs=[path], list_labels=[None], list_additional_data=[None],
+                          lazy_text=lazy_text, cache_dir=None)
+        dataset.load()
+        return dataset
+
+
+def test_column_types():
+    large = [str(2 ** 53 + 1), str(2 ** 62 + 1), "-3"]
+    for lazy_text in (False, True):
+        dataset = load_column(["1", "2", "-3"], lazy_text)
+        assert dataset.data_types[DEEP_ENTRY_INPUT] == [DEEP_TYPE_INTEGER]
+        assert dataset.data.get_column(DEEP_ENTRY_INPUT, 0).dtype == np.int64
+        dataset = load_column(["0.5", "2.25", "1e3"], lazy_text)
+        assert dataset.data_types[DEEP_ENTRY_INPUT] == [DEEP_TYPE_FLOAT]
+        assert dataset.data.get_column(DEEP_ENTRY_INPUT, 0).tolist() == [0.5, 2.25, 1000.0]
+        # Integers and floats : a float column, wherever the first float is
+        for lines in (["1", "2.5", "3"], ["1.5", "2", "3"]):
+            dataset = load_column(lines, lazy_text)
+            assert dataset.data_types[DEEP_ENTRY_INPUT] == [DEEP_TYPE_FLOAT]
+            assert dataset.data.get_column(DEEP_ENTRY_INPUT, 0).tolist() == [float(line) for line in lines]
+        # The integers above 2 ** 53 are kept exactly
+        dataset = load_column(large, lazy_text)
+        assert dataset.data_types[DEEP_ENTRY_INPUT] == [DEEP_TYPE_INTEGER]
+        assert [dataset.data.get_entries(DEEP_ENTRY_INPUT, index)[0] for index in range(3)] == [int(line) for line in large]
+        # The integers beyond int64 fall back to float64
+        dataset = load_column(["1", str(2 ** 64)], lazy_text)
+        assert dataset.data_types[DEEP_ENTRY_INPUT] == [DEEP_TYPE_FLOAT]
+        # Numbers and other data, whichever comes first
+        for lines in (["1", "image.png"], ["image.png", "1"], ["image.png", "first.png second.png"]):
+            with pytest.raises(DeepError):
+                load_column(lines, lazy_text)
+
+
+if __name__ == "__main__":
+    test_data_type()
+    test_column_types()
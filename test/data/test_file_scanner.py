@@ -0,0 +1,56 @@
+"""
+Check that the FileScanner lists the files in natural order, reuses its manifest while the directories are unchanged
+and scans the directories again once one of them changed
+"""
+import os
+import tempfile
+
+import pytest
+
+from deeplodocus.data.file_scanner import FileScanner
+
+
+def write(path: str):
+    with open(path, "w") as f:
+        f.write(path)
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as d:
+        os.makedirs("%s/sub" % d)
+        for name in ("image10.png", "image2.png", "image1.png", "sub/image3.png"):
+            write("%s/%s" % (d, name))
+        yield d
+
+
+def no_walk(*args):
+    raise AssertionError("The directory was walked instead of using its manifest")
+
+
+def test_order(directory):
+    paths = FileScanner(cache_dir=None).scan(directory)
+    assert paths == ["%s/%s" % (directory, name)
+                     for name in ("image1.png", "image2.png", "image10.png", "sub/image3.png")]
+
+
+def test_manifest(directory, tmp_path, monkeypatch):
+    # The cache directory is outside of the directory scanned (writing the manifest would change its modification time)
+    cache_dir = str(tmp_path)
+    paths = FileScanner(cache_dir=cache_dir).scan(directory)
+    assert len(os.listdir(cache_dir)) == 1
+    # Cache hit : a new FileScanner reads the manifest without walking the directory
+    with monkeypatch.context() as m:
+        m.setattr(FileScanner, "_FileScanner__walk", no_walk)
+        assert FileScanner(cache_dir=cache_dir).scan(directory) == paths
+    # Cache miss : adding a file changes the modification time of its sub-directory
+    write("%s/sub/image0.png" % directory)
+    mtime = os.stat("%s/sub" % directory).st_mtime_ns
+    os.utime("%s/sub" % directory, ns=(mtime, mtime + 10 ** 9))
+    new_paths = FileScanner(cache_dir=cache_dir).scan(directory)
+    assert new_paths == paths[:3] + ["%s/sub/image0.png" % directory, "%s/sub/image3.png" % directory]
+    # The new manifest replaced the previous one
+    assert len(os.listdir(cache_dir)) == 1
+    with monkeypatch.context() as m:
+        m.setattr(FileScanner, "_FileScanner__walk", no_walk)
+        assert FileScanner(cache_dir=cache_dir).scan(directory) == new_paths
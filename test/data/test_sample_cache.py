@@ -0,0 +1,76 @@
+"""
+Check that the SharedSampleCache gives back copies of the samples put, that each process evicts
+the least recently used of its own slots and that the samples which do not fit a slot are not cached
+"""
+import types
+
+import numpy as np
+
+import deeplodocus.data.sample_cache as sample_cache
+from deeplodocus.data.sample_cache import SharedSampleCache
+
+
+def set_worker(monkeypatch, worker_id: int, num_workers: int):
+    worker = types.SimpleNamespace(id=worker_id, num_workers=num_workers)
+    monkeypatch.setattr(sample_cache, "get_worker_info", lambda: worker)
+
+
+def test_round_trip():
+    cache = SharedSampleCache(max_bytes=4 * 64, slot_bytes=64, num_keys=10)
+    samples = {0: np.arange(12, dtype=np.uint8).reshape(2, 3, 2),
+               3: np.linspace(0, 1, 5, dtype=np.float32),
+               7: np.array([[True, False]])}
+    assert cache.get(0) is None
+    for key, sample in samples.items():
+        cache.put(key, sample)
+    for key, sample in samples.items():
+        cached = cache.get(key)
+        assert cached.dtype == sample.dtype
+        assert np.array_equal(cached, sample)
+    # The samples are copied out : modifying one does not alter the cache
+    cache.get(0)[:] = 0
+    assert np.array_equal(cache.get(0), samples[0])
+    assert cache.get(1) is None
+    hits, misses, nbytes = cache.get_statistics()
+    assert (hits, misses, nbytes) == (5, 2, 3 * 64)
+
+
+def test_eviction(monkeypatch):
+    cache = SharedSampleCache(max_bytes=4 * 64, slot_bytes=64, num_keys=10)
+    # The worker 0 of 2 writes into the slots 0 and 2 only
+    set_worker(monkeypatch, 0, 2)
+    cache.put(0, np.full(4, 0))
+    cache.put(1, np.full(4, 1))
+    assert sorted(cache.keys.tolist()) == [-1, -1, 0, 1]
+    assert cache.keys[1] == -1 and cache.keys[3] == -1
+    # The key 0 is used again : the key 1 is the least recently used
+    assert cache.get(0) is not None
+    cache.put(2, np.full(4, 2))
+    assert cache.get(1) is None
+    assert np.array_equal(cache.get(0), np.full(4, 0))
+    assert np.array_equal(cache.get(2), np.full(4, 2))
+    # The worker 1 fills its own slots without evicting the samples of the worker 0
+    set_worker(monkeypatch, 1, 2)
+    cache.put(3, np.full(4, 3))
+    cache.put(4, np.full(4, 4))
+    for key in (0, 2, 3, 4):
+        assert np.array_equal(cache.get(key), np.full(4, key))
+    assert sorted(cache.keys.tolist()) == [0, 2, 3, 4]
+
+
+def test_rejection():
+    cache = SharedSampleCache(max_bytes=4 * 64, slot_bytes=64, num_keys=10)
+    # Larger than a slot
+    cache.put(0, np.zeros(65, dtype=np.uint8))
+    # Unsupported dtypes
+    cache.put(1, np.zeros(2, dtype=np.complex64))
+    cache.put(2, np.array(["text"]))
+    # More dimensions than recorded
+    cache.put(3, np.zeros((1, 1, 1, 1, 1), dtype=np.uint8))
+    for key in range(4):
+        assert cache.get(key) is None
+    assert (cache.keys == -1).all()
+    # A sample of exactly one slot is cached
+    cache.put(4, np.ones(64, dtype=np.uint8))
+    assert np.array_equal(cache.get(4), np.ones(64, dtype=np.uint8))
+
@@ -0,0 +1,130 @@
+"""
+Check that the order of the samplers only depends on the seed and the epoch,
+that a sampler resumed from its state gives the rest of the epoch,
+that the processes split the instances (padded with the first ones of the epoch)
+and that the BucketBatchSampler forms its mini-batches within the buckets
+"""
+import numpy as np
+
+from deeplodocus.data.sampler import BucketBatchSampler
+from deeplodocus.data.sampler import EpochPermutationSampler
+
+buckets = np.array([0, 1, 2, 1, 0, 0, 2, 1, 0, 0, 1, 2, 0])
+
+
+def permutation_sampler(**kwargs) -> EpochPermutationSampler:
+    return EpochPermutationSampler(length=23, seed=3, **kwargs)
+
+
+def bucket_sampler(**kwargs) -> BucketBatchSampler:
+    return BucketBatchSampler(buckets=buckets, length=len(buckets), batch_size=2, seed=3, **kwargs)
+
+
+def epoch(sampler, epoch_index: int) -> list:
+    sampler.set_epoch(epoch_index)
+    return list(sampler)
+
+
+def test_seed_epoch():
+    for create in (permutation_sampler, bucket_sampler):
+        first, second = create(), create()
+        assert epoch(first, 1) == epoch(second, 1)
+        assert epoch(first, 1) != epoch(first, 2)
+        assert epoch(first, 2) == epoch(second, 2)
+    assert sorted(epoch(permutation_sampler(), 1)) == list(range(23))
+    assert epoch(permutation_sampler(shuffle=False), 1) == list(range(23))
+
+
+def test_resume():
+    for create, position in ((permutation_sampler, 9), (bucket_sampler, 2)):
+        sampler = create()
+        order = epoch(sampler, 4)
+        # The position given is kept : not the number of indices given to the DataLoader (prefetched ones included)
+        state = sampler.state_dict(index=position)
+        assert state == {"seed": 3, "epoch": 4, "index": position}
+        resumed = create()
+        resumed.load_state_dict(state)
+        assert len(resumed) == len(order) - position
+        assert list(resumed) == order[position:]
+        assert resumed.offset == position
+        # The resumed position only applies to the first iteration
+        assert len(resumed) == len(order)
+        assert list(resumed) == order
+        assert resumed.offset == 0
+
+
+def test_processes():
+    for world_size in (2, 3, 4):
+        for epoch_index in (1, 2):
+            order = epoch(permutation_sampler(), epoch_index)
+            samplers = [permutation_sampler(rank=rank, world_size=world_size) for rank in range(world_size)]
+            indices = [epoch(sampler, epoch_index) for sampler in samplers]
+            # 23 instances : the permutation is padded with its first indices to give each process the same number
+            length = -(-23 // world_size)
+            assert all(len(sampler) == len(rank_indices) == length for sampler, rank_indices in zip(samplers, indices))
+            padded = order + order[:length * world_size - 23]
+            assert indices == [padded[rank::world_size] for rank in range(world_size)]
+            # The processes use distinct instances (but the padding) and all the instances together
+            assert sorted(sum(indices, [])) == sorted(list(range(23)) + order[:length * world_size - 23])
+            # The same seed and epoch give the same split
+            assert indices == [epoch(permutation_sampler(rank=rank, world_size=world_size), epoch_index)
+                               for rank in range(world_size)]
+            # Without padding, the processes use each instance exactly once
+            indices = [epoch(permutation_sampler(rank=rank, world_size=world_size, pad=False), epoch_index)
+                       for rank in range(world_size)]
+            assert sorted(sum(indices, [])) == list(range(23))
+
+
+def test_bucket_processes():
+    for world_size in (2, 3):
+        for epoch_index in (1, 2):
+            order = epoch(bucket_sampler(), epoch_index)
+            samplers = [bucket_sampler(rank=rank, world_size=world_size) for rank in range(world_size)]
+            batches = [epoch(sampler, epoch_index) for sampler in samplers]
+            # The mini-batches are padded with the first mini-batches of the epoch
+            length = -(-len(order) // world_size)
+            assert all(len(sampler) == len(rank_batches) == length for sampler, rank_batches in zip(samplers, batches))
+            padded = order + order[:length * world_size - len(order)]
+            assert batches == [padded[rank::world_size] for rank in range(world_size)]
+            indices = sorted(sum(sum(batches, []), []))
+            assert indices == sorted(list(range(len(buckets))) + sum(order[:length * world_size - len(order)], []))
+            assert batches == [epoch(bucket_sampler(rank=rank, world_size=world_size), epoch_index)
+                               for rank in range(world_size)]
+    # 7 mini-batches for 2 processes : the first mini-batch of the epoch is given again to the process 1
+    assert epoch(bucket_sampler(), 1) == [[7, 1], [4, 0], [11, 2], [5, 8], [12, 9], [6], [10, 3]]
+    assert epoch(bucket_sampler(rank=0, world_size=2), 1) == [[7, 1], [11, 2], [12, 9], [10, 3]]
+    assert epoch(bucket_sampler(rank=1, world_size=2), 1) == [[4, 0], [5, 8], [6], [7, 1]]
+
+
+def test_buckets():
+    for length in (len(buckets), 20):
+        for drop_last in (False, True):
+            sampler = BucketBatchSampler(buckets=buckets, length=length, batch_size=4, seed=3, drop_last=drop_last)
+            batches = epoch(sampler, 1)
+            assert len(sampler) == len(sampler.get_batches()) == len(batches)
+            # Every mini-batch holds the instances of a single bucket
+            assert all(len(set(buckets[np.array(batch) % len(buckets)])) == 1 for batch in batches)
+            indices = sorted(sum(batches, []))
+            assert len(indices) == len(set(indices))
+            counts = np.bincount(buckets[np.arange(length) % len(buckets)])
+            if drop_last:
+                # Only the last incomplete mini-batch of each bucket is dropped
+                assert all(len(batch) == 4 for batch in batches)
+                assert len(indices) == np.sum(counts // 4 * 4)
+            else:
+                assert indices == list(range(length))
+            # The processes have the same number of mini-batches
+            for world_size in (2, 3):
+                samplers = [BucketBatchSampler(buckets=buckets, length=length, batch_size=4, seed=3,
+                                               drop_last=drop_last, rank=rank, world_size=world_size)
+                            for rank in range(world_size)]
+                for rank_sampler in samplers:
+                    assert len(rank_sampler) == len(rank_sampler.get_batches()) == -(-len(batches) // world_size)
+
+
+if __name__ == "__main__":
+    test_seed_epoch()
+    test_resume()
+    test_processes()
+    test_bucket_processes()
+    test_buckets()
@@ -0,0 +1,63 @@
+"""
+Check that the instances packed into shards by the ShardWriter are each read exactly once per epoch
+by the ShardedDataset, across the DataLoader workers and the processes
+"""
+import types
+
+import pytest
+
+import deeplodocus.data.sharded_dataset as sharded_dataset
+from deeplodocus.data.dataset import Dataset
+from deeplodocus.data.shard_writer import ShardWriter
+from deeplodocus.data.sharded_dataset import ShardedDataset
+from deeplodocus.utils.flags import *
+
+NUM_INSTANCES = 24
+
+
+@pytest.fixture
+def dataset(tmp_path) -> Dataset:
+    with open("%s/inputs.txt" % tmp_path, "w") as f:
+        f.write("\n".join(str(i) for i in range(NUM_INSTANCES)))
+    with open("%s/labels.txt" % tmp_path, "w") as f:
+        f.write("\n".join(str(10 * i) for i in range(NUM_INSTANCES)))
+    dataset = Dataset(list_inputs=["%s/inputs.txt" % tmp_path],
+                      list_labels=["%s/labels.txt" % tmp_path],
+                      list_additional_data=[None],
+                      cache_dir=None)
+    dataset.load()
+    return dataset
+
+
+def read_epoch(shards: str, world_size: int, num_workers: int, epoch: int, monkeypatch) -> list:
+    """
+    Read an epoch from every worker of every process
+    """
+    instances = []
+    for rank in range(world_size):
+        dataset = ShardedDataset(shards, shuffle_buffer=5, rank=rank, world_size=world_size, seed=3)
+        dataset.load()
+        for _ in range(epoch + 1):
+            dataset.shuffle(DEEP_SHUFFLE_ALL)
+        for worker_id in range(num_workers):
+            worker = types.SimpleNamespace(id=worker_id, num_workers=num_workers)
+            monkeypatch.setattr(sharded_dataset, "get_worker_info", lambda: worker)
+            instances.extend(dataset)
+    return instances
+
+
+@pytest.mark.parametrize("samples_per_shard", [4, 12])
+def test_once_per_epoch(dataset, tmp_path, monkeypatch, samples_per_shard):
+    shards = "%s/shards" % tmp_path
+    ShardWriter(directory=shards, samples_per_shard=samples_per_shard).write(dataset)
+    for world_size in (1, 2):
+        for num_workers in (1, 3):
+            orders = []
+            for epoch in range(2):
+                instances = read_epoch(shards, world_size, num_workers, epoch, monkeypatch)
+                assert sorted(inputs[0] for inputs, _, _ in instances) == list(range(NUM_INSTANCES))
+                assert all(labels == [10 * inputs[0]] and additional_data == []
+                           for inputs, labels, additional_data in instances)
+                orders.append([inputs[0] for inputs, _, _ in instances])
+            assert orders[0] != orders[1]
+
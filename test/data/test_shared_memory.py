@@ -0,0 +1,47 @@
+"""
+Check that the mini-batches read from the shared memory ring stay valid once the ring moved on to other mini-batches
+(the mini-batches are kept until the end of the epoch, as the metrics computed once per epoch or the sinks do)
+"""
+import numpy as np
+import torch
+
+from deeplodocus.core.inference.generic_inferer import GenericInferer
+from deeplodocus.utils.flags import *
+
+from dummies import ArrayDataset
+
+
+def index_dataset(length: int) -> ArrayDataset:
+    # uint8 images and arrays filled with the index of the instance
+    indices = np.arange(length)
+    images = np.tile(indices.astype(np.uint8)[:, None, None, None], (1, 3, 8, 8))
+    arrays = np.tile(indices.astype(np.float32)[:, None], (1, 4))
+    return ArrayDataset(inputs=[images, arrays], labels=[indices[:, None]],
+                        data_types={DEEP_ENTRY_INPUT: [DEEP_TYPE_IMAGE, DEEP_TYPE_NP_ARRAY]}, name="Index")
+
+
+def held_batches(dtype: str, num_workers: int, shared_memory: bool) -> list:
+    inferer = GenericInferer(model=None, dataset=index_dataset(50), batch_size=2, num_workers=num_workers,
+                             dtype=dtype, shared_memory=shared_memory)
+    return [inferer.collate.convert(minibatch) for minibatch in inferer.dataloader]
+
+
+def check_batches(batches: list) -> None:
+    assert len(batches) == 25
+    for batch_index, (inputs, labels, additional_data) in enumerate(batches):
+        indices = torch.tensor([2 * batch_index, 2 * batch_index + 1])
+        assert torch.equal(inputs[0].to(torch.int64), indices.reshape(2, 1, 1, 1).expand(2, 3, 8, 8))
+        assert torch.equal(inputs[1], indices.reshape(2, 1).expand(2, 4).float())
+        assert torch.equal(labels[0], indices.reshape(2, 1))
+
+
+def test_ring_batches_held():
+    # The ring has fewer slots than mini-batches : its slots are reused during the epoch
+    for dtype in (DEEP_DTYPE_UINT8, DEEP_DTYPE_FLOAT32):
+        for num_workers in (1, 2):
+            check_batches(held_batches(dtype, num_workers, shared_memory=True))
+    check_batches(held_batches(DEEP_DTYPE_UINT8, 2, shared_memory=False))
+
+
+if __name__ == "__main__":
+    test_ring_batches_held()
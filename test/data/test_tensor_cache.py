@@ -0,0 +1,81 @@
+"""
+Check that the samples written into a TensorCache are read back from a reopened cache as read-only views,
+that the key of the cache changes when a source file is replaced
+and that a materialized Dataset reads its images from the cache instead of decoding them
+"""
+import os
+import pickle
+import tempfile
+
+import cv2
+import numpy as np
+
+from deeplodocus.data.dataset import Dataset
+from deeplodocus.data.tensor_cache import TensorCache
+
+
+def test_write_reopen_read():
+    samples = [[np.arange(row * 12, row * 12 + 12, dtype=np.uint8).reshape(2, 3, 2), np.full(row + 1, row, dtype=np.float32)]
+               for row in range(4)]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TensorCache(directory=directory, name="test", key="key")
+        assert not cache.exists()
+        cache.write(num_rows=4, num_columns=2, get_sample=lambda row, column: samples[row][column])
+        assert cache.exists()
+        # Reopen the cache as a DataLoader worker does
+        cache = pickle.loads(pickle.dumps(TensorCache(directory=directory, name="test", key="key")))
+        cache.open()
+        for row in range(4):
+            for column in range(2):
+                sample = cache.get(row, column)
+                assert sample.dtype == samples[row][column].dtype
+                assert np.array_equal(sample, samples[row][column])
+                assert not sample.flags.writeable
+        # A writable sample is copy-on-write : modifying it does not alter the next reads
+        sample = cache.get(1, 0, writable=True)
+        sample += 1
+        assert np.array_equal(sample, samples[1][0] + 1)
+        assert np.array_equal(cache.get(1, 0), samples[1][0])
+        assert np.array_equal(cache.get(1, 0, writable=True), samples[1][0])
+
+
+def test_key_source_files():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "image.png")
+        with open(path, "wb") as f:
+            f.write(b"first")
+        column = np.array([path.encode()])
+        key = TensorCache.compute_key([column], ["config"])
+        assert TensorCache.compute_key([column], ["config"]) == key
+        assert TensorCache.compute_key([column], ["other config"]) != key
+        # Replace the file under the same path
+        with open(path, "wb") as f:
+            f.write(b"second file")
+        assert TensorCache.compute_key([column], ["config"]) != key
+
+
+def test_materialized_dataset(tmp_path, monkeypatch):
+    images = [np.random.default_rng(i).integers(0, 256, (4, 5, 3), dtype=np.uint8) for i in range(3)]
+    paths = []
+    for i, image in enumerate(images):
+        paths.append("%s/image%i.png" % (tmp_path, i))
+        cv2.imwrite(paths[-1], image)
+    with open("%s/inputs.txt" % tmp_path, "w") as f:
+        f.write("\n".join(paths))
+    dataset = Dataset(list_inputs=["%s/inputs.txt" % tmp_path], list_labels=[None], list_additional_data=[None],
+                      materialize=True, cache_dir="%s/cache" % tmp_path, name="images")
+    dataset.load()
+    # Every raw image is read from the cache : no image file is decoded after the materialization
+    decode = Dataset._Dataset__decode_image_file
+    decoded = []
+    monkeypatch.setattr(Dataset, "_Dataset__decode_image_file", lambda self, path: decoded.append(path) or decode(self, path))
+    for i, image in enumerate(images):
+        inputs, _, _ = dataset[i]
+        # Converted from BGR to RGB, channels first
+        assert np.array_equal(inputs[0], np.swapaxes(image[:, :, ::-1], 0, 2))
+    assert decoded == []
+
+
+if __name__ == "__main__":
+    test_write_reopen_read()
+    test_key_source_files()
@@ -0,0 +1,82 @@
+"""
+Check that a TextColumn gives the lines of its list files as readlines() does (missing final line feed, blank lines,
+empty files, CRLF line endings) and that the lines of a ColumnarIndex stay aligned after a permutation
+"""
+import pickle
+
+import numpy as np
+import pytest
+
+from deeplodocus.data.columnar_index import ColumnarIndex
+from deeplodocus.data.text_column import TextColumn
+from deeplodocus.utils.flags import *
+
+CONTENTS = {"final_line_feed": b"first\nsecond\n",
+            "no_final_line_feed": b"first\nsecond",
+            "blank_lines": b"first\n\n  \nfourth\n\n",
+            "empty": b"",
+            "only_line_feed": b"\n",
+            "crlf": b"first\r\nsecond\r\n\r\nfourth",
+            "spaces": b"an image.png\n1 2 3\n"}
+
+
+def write(directory, name: str, content: bytes) -> str:
+    path = str(directory / ("%s.txt" % name))
+    with open(path, "wb") as file:
+        file.write(content)
+    return path
+
+
+def read_lines(paths: list) -> list:
+    # The lines read by the Dataset without lazy_text
+    lines = []
+    for path in paths:
+        with open(path) as file:
+            lines.extend(line.strip().encode(DEEP_ENCODE_UTF8) for line in file.readlines())
+    return lines
+
+
+@pytest.mark.parametrize("name", sorted(CONTENTS))
+def test_lines(tmp_path, name):
+    path = write(tmp_path, name, CONTENTS[name])
+    column = TextColumn([path])
+    expected = read_lines([path])
+    assert len(column) == len(expected)
+    assert [column[index] for index in range(len(column))] == expected
+    assert list(column) == expected
+    with pytest.raises(IndexError):
+        column[len(column)]
+
+
+def test_files(tmp_path):
+    # The lines of several files follow each other, whatever the end of the previous file
+    paths = [write(tmp_path, name, CONTENTS[name]) for name in sorted(CONTENTS)]
+    column = TextColumn(paths)
+    expected = read_lines(paths)
+    assert [column[index] for index in range(len(column))] == expected
+    # Backwards : each line is read from its offset, not sequentially
+    assert [column[index] for index in reversed(range(len(column)))] == expected[::-1]
+    # The file handles are not pickled, the copy opens its own
+    column = pickle.loads(pickle.dumps(column))
+    assert column.handles == {}
+    assert [column[index] for index in range(len(column))] == expected
+
+
+def test_permute(tmp_path):
+    names = write(tmp_path, "names", b"zero\r\none\n\nthree\nfour")
+    numbers = write(tmp_path, "numbers", b"0\n1\n2\n3\n4\n")
+    index = ColumnarIndex(inputs=[TextColumn([names]), TextColumn([numbers])],
+                          labels=[["0", "10", "20", "30", "40"]],
+                          additional_data=[])
+    permutation = np.array([3, 0, 4, 2, 1])
+    index.permute(permutation)
+    expected = ["zero", "one", "", "three", "four"]
+    for row, original in enumerate(permutation):
+        inputs = index.get_entries(DEEP_ENTRY_INPUT, row)
+        assert inputs == [expected[original], str(original)]
+        assert index.get_entries(DEEP_ENTRY_LABEL, row) == [str(10 * original)]
+    # A column converted after the permutation follows the current order of the rows
+    index.convert_column(DEEP_ENTRY_INPUT, 1, np.int64)
+    assert index.get_column(DEEP_ENTRY_INPUT, 1).tolist() == permutation.tolist()
+    index.permute(np.argsort(permutation))
+    assert [index.get_entries(DEEP_ENTRY_INPUT, row) for row in range(5)] == [[name, row] for row, name in enumerate(expected)]
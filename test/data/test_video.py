@@ -0,0 +1,61 @@
+"""
+Check that the Dataset loads the frames of a video selected by start, stop, stride and clip_length
+(seeking over the large gaps, stopping at the end of the file) in RGB order
+"""
+import cv2
+import numpy as np
+import pytest
+
+from deeplodocus.data.dataset import Dataset
+
+NUM_FRAMES = 80
+
+
+@pytest.fixture
+def video_path(tmp_path) -> str:
+    # A lossless video whose frame i is (B, G, R) = (3 * i, 128, 255 - 3 * i)
+    path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"FFV1"), 10, (32, 24))
+    if not writer.isOpened():
+        pytest.skip("The FFV1 codec is not available")
+    for i in range(NUM_FRAMES):
+        frame = np.empty((24, 32, 3), dtype=np.uint8)
+        frame[..., 0] = 3 * i
+        frame[..., 1] = 128
+        frame[..., 2] = 255 - 3 * i
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def load_video(path: str, **video) -> np.ndarray:
+    list_path = path.replace(".avi", ".txt")
+    with open(list_path, "w") as file:
+        file.write(path)
+    dataset = Dataset(list_inputs=[list_path], list_labels=[None], list_additional_data=[None], video=video,
+                      cache_dir=None)
+    return dataset._Dataset__load_video(path)
+
+
+@pytest.mark.parametrize("video, frames", [({}, range(NUM_FRAMES)),
+                                           ({"start": 5, "stop": 20, "stride": 3}, range(5, 20, 3)),
+                                           ({"clip_length": 4}, range(4)),
+                                           # Seek over the gaps larger than DEEP_VIDEO_SEEK_THRESHOLD
+                                           ({"start": 40, "stride": 10, "clip_length": 3}, [40, 50, 60]),
+                                           ({"start": 2, "stride": 35}, [2, 37, 72]),
+                                           # Past the end of the file
+                                           ({"start": 70, "stop": 200, "stride": 4}, [70, 74, 78]),
+                                           ({"start": 78, "clip_length": 5}, [78, 79]),
+                                           ({"start": 100}, [])])
+def test_frames(video_path, video, frames):
+    clip = load_video(video_path, **video)
+    frames = np.array(list(frames), dtype=np.int64)
+    if len(frames) == 0:
+        assert clip.size == 0
+        return
+    assert clip.shape == (len(frames), 24, 32, 3)
+    assert clip.dtype == np.uint8
+    # RGB order : the red channel is first
+    assert (clip[:, :, :, 0] == (255 - 3 * frames)[:, None, None]).all()
+    assert (clip[:, :, :, 1] == 128).all()
+    assert (clip[:, :, :, 2] == (3 * frames)[:, None, None]).all()
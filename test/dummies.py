@@ -0,0 +1,62 @@
+"""
+The dataset and the model shared by the tests of the inference classes
+(imported through the test directory added to sys.path by conftest.py, run the scripts with PYTHONPATH=.:test)
+"""
+import numpy as np
+import torch
+import torch.nn as nn
+
+from deeplodocus.utils.flags import *
+
+
+class ArrayDataset(object):
+    """
+    A dataset of in-memory entries, in the Dataset format (inputs, labels, additional_data)
+    Each entry is an array whose first axis is the instance : the instances of an entry of one dimension are numbers,
+    the others are numpy arrays (or the data types given)
+    """
+
+    def __init__(self, inputs: list, labels: list = (), additional_data: list = (), data_types: dict = None,
+                 buckets: np.ndarray = None, name: str = "Arrays"):
+        self.name = name
+        self.entries = {DEEP_ENTRY_INPUT: [np.asarray(entry) for entry in inputs],
+                        DEEP_ENTRY_LABEL: [np.asarray(entry) for entry in labels],
+                        DEEP_ENTRY_ADDITIONAL_DATA: [np.asarray(entry) for entry in additional_data]}
+        self.length = len(self.entries[DEEP_ENTRY_INPUT][0])
+        self.data_types = {entry_type: [self.__data_type(entry) for entry in entries]
+                           for entry_type, entries in self.entries.items()}
+        if data_types is not None:
+            self.data_types.update(data_types)
+        self.sequence_types = {entry_type: [None] * len(entries) for entry_type, entries in self.entries.items()}
+        # The bucket of each instance (see BucketBatchSampler)
+        self.buckets = buckets
+
+    @staticmethod
+    def __data_type(entry: np.ndarray) -> int:
+        if entry.ndim > 1:
+            return DEEP_TYPE_NP_ARRAY
+        return DEEP_TYPE_INTEGER if np.issubdtype(entry.dtype, np.integer) else DEEP_TYPE_FLOAT
+
+    def __getitem__(self, index: int):
+        return tuple([entry[index] for entry in self.entries[entry_type]]
+                     for entry_type in (DEEP_ENTRY_INPUT, DEEP_ENTRY_LABEL, DEEP_ENTRY_ADDITIONAL_DATA))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def reset(self):
+        pass
+
+
+class PairModel(nn.Module):
+    """
+    A model of two inputs : the layers (none by default) are applied to the sum or to the concatenation of the inputs
+    """
+
+    def __init__(self, layers: nn.Module = None, concatenate: bool = False):
+        super().__init__()
+        self.layers = nn.Identity() if layers is None else layers
+        self.concatenate = concatenate
+
+    def forward(self, first, second):
+        return self.layers(torch.cat((first, second), dim=1) if self.concatenate else first + second)